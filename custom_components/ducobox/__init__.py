@@ -2,50 +2,218 @@
 
 from __future__ import annotations
 
-from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.hass_dict import HassKey
 
-from custom_components.ducobox.const import PLATFORMS
+from custom_components.ducobox.const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_ARCHIVE,
+    CONF_BLOCKING_BUDGET,
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_EXECUTOR_DECODE_THRESHOLD,
+    CONF_LONG_TERM_STATISTICS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ARCHIVE,
+    DEFAULT_BLOCKING_BUDGET,
+    DEFAULT_EXECUTOR_DECODE_THRESHOLD,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_OPTIONS,
+    DOMAIN,
+)
 
-from .api import DucoConnectivityBoardApi
+from .archive import DucoBoxArchive, archive_directory
 from .coordinator import (
+    UPDATE_INTERVAL,
     DucoBoxConfigEntry,
     DucoBoxCoordinator,
     DucoBoxOptionsCoordinator,
     DucoBoxRuntimeData,
+    DucoBoxSnapshot,
 )
+from .entity_index import DucoBoxEntityIndex
+from .services import async_setup_services, async_stop_profile
+from .transport import async_create_api
+from .watchdog import DucoBoxBlockingWatchdog
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Options that are applied to the loaded entry, without reloading it.
+IN_PLACE_OPTIONS = {
+    CONF_ADAPTIVE_POLLING,
+    CONF_BLOCKING_BUDGET,
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_EXECUTOR_DECODE_THRESHOLD,
+}
+
+_DATA_RELOAD_SNAPSHOTS: HassKey[dict[str, DucoBoxSnapshot]] = HassKey(
+    f"{DOMAIN}_reload_snapshots"
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the DucoBox integration."""
+    async_setup_services(hass)
+    if "http" in hass.config.components:
+        # Imported here, as the HTTP server is an optional dependency.
+        from .view import DucoBoxNodesView  # noqa: PLC0415
+
+        hass.http.register_view(DucoBoxNodesView())
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: DucoBoxConfigEntry) -> bool:
     """Set up DucoBox from a config entry."""
-    session = async_get_clientsession(hass)
-    api = DucoConnectivityBoardApi(entry.data[CONF_HOST], session)
+    blocking_budget = entry.options.get(CONF_BLOCKING_BUDGET, DEFAULT_BLOCKING_BUDGET)
+    executor_decode_threshold = entry.options.get(
+        CONF_EXECUTOR_DECODE_THRESHOLD, DEFAULT_EXECUTOR_DECODE_THRESHOLD
+    )
+    api = async_create_api(
+        hass,
+        entry.data,
+        watchdog=DucoBoxBlockingWatchdog(blocking_budget / 1000),
+        executor_decode_threshold=executor_decode_threshold * 1024,
+    )
+
+    entry.async_on_unload(api.async_close)
 
     coordinator = DucoBoxCoordinator(hass, entry, api)
+    coordinator.scheduler.set_adaptive(
+        entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+    )
+    options_coordinator = DucoBoxOptionsCoordinator(hass, entry, api)
 
-    try:
-        await coordinator.async_setup()
-    except UpdateFailed as err:
-        raise ConfigEntryNotReady(err) from err
+    # A reload restores the data of the entry it unloaded moments ago, instead
+    # of fetching the box info, nodes and options from the board again.
+    snapshot = hass.data.get(_DATA_RELOAD_SNAPSHOTS, {}).pop(entry.entry_id, None)
+    if snapshot is not None and snapshot.is_valid_for(entry):
+        coordinator.async_restore(snapshot)
+        options_coordinator.async_set_updated_data(snapshot.options)
+    else:
+        try:
+            await coordinator.async_setup()
+        except UpdateFailed as err:
+            raise ConfigEntryNotReady(err) from err
 
-    await coordinator.async_config_entry_first_refresh()
+        await coordinator.async_config_entry_first_refresh()
+        await options_coordinator.async_config_entry_first_refresh()
 
-    options_coordinator = DucoBoxOptionsCoordinator(hass, entry, api)
-    await options_coordinator.async_config_entry_first_refresh()
+    # The statistics buffer of the unloaded entry keeps the hour in progress.
+    statistics = snapshot.statistics if snapshot is not None else None
+    if (
+        entry.options.get(CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS)
+        and "recorder" in hass.config.components
+    ):
+        if (
+            statistics is not None
+            and statistics.serial_number != coordinator.box_info.serial_number
+        ):
+            statistics.async_flush(partial=True)
+            statistics = None
+        if statistics is None:
+            # Imported here, as the recorder is an optional dependency.
+            from .long_term_statistics import DucoBoxStatisticsBuffer  # noqa: PLC0415
+
+            statistics = DucoBoxStatisticsBuffer(
+                hass, coordinator.box_info.serial_number
+            )
+        coordinator.statistics = statistics
+    elif statistics is not None:
+        statistics.async_flush(partial=True)
+
+    if entry.options.get(CONF_ARCHIVE, DEFAULT_ARCHIVE):
+        archive = DucoBoxArchive(
+            hass, archive_directory(hass, coordinator.box_info.serial_number)
+        )
+        coordinator.archive = archive
+        entry.async_on_unload(archive.async_flush)
 
     entry.runtime_data = DucoBoxRuntimeData(
         coordinator=coordinator,
         options_coordinator=options_coordinator,
+        entity_index=DucoBoxEntityIndex.from_nodes(coordinator.data.values()),
+        applied_options=dict(entry.options),
+    )
+
+    await hass.config_entries.async_forward_entry_setups(
+        entry, entry.runtime_data.entity_index.platforms
     )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    entry.async_on_unload(lambda: async_stop_profile(hass, entry))
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: DucoBoxConfigEntry) -> None:
+    """Apply changed options in place, or reload the config entry if needed."""
+    runtime_data = entry.runtime_data
+    applied_options = runtime_data.applied_options
+    changed = {
+        key
+        for key in entry.options.keys() | applied_options.keys()
+        if entry.options.get(key, DEFAULT_OPTIONS.get(key))
+        != applied_options.get(key, DEFAULT_OPTIONS.get(key))
+    }
+
+    if changed - IN_PLACE_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # Running countdowns follow the countdown interval with their own listener.
+    api = runtime_data.coordinator.api
+    api.watchdog.budget = (
+        entry.options.get(CONF_BLOCKING_BUDGET, DEFAULT_BLOCKING_BUDGET) / 1000
+    )
+    api.set_executor_decode_threshold(
+        entry.options.get(
+            CONF_EXECUTOR_DECODE_THRESHOLD, DEFAULT_EXECUTOR_DECODE_THRESHOLD
+        )
+        * 1024
+    )
+    coordinator = runtime_data.coordinator
+    coordinator.scheduler.set_adaptive(
+        entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+    )
+    if not coordinator.scheduler.adaptive:
+        coordinator.update_interval = UPDATE_INTERVAL
+    runtime_data.applied_options = dict(entry.options)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: DucoBoxConfigEntry) -> bool:
-    """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    """Unload a config entry, keeping its data for a reload."""
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, entry.runtime_data.entity_index.platforms
+    )
+
+    if unload_ok:
+        snapshot = DucoBoxSnapshot.from_runtime_data(entry, entry.runtime_data)
+        snapshots = hass.data.setdefault(_DATA_RELOAD_SNAPSHOTS, {})
+        snapshots[entry.entry_id] = snapshot
+
+        # A snapshot that is not restored within an update interval is stale,
+        # so it is discarded, importing the hour in progress of its statistics.
+        @callback
+        def _async_expire(_now: datetime) -> None:
+            if snapshots.get(entry.entry_id) is not snapshot:
+                return
+            del snapshots[entry.entry_id]
+            if snapshot.statistics is not None:
+                snapshot.statistics.async_flush(partial=True)
+
+        async_call_later(hass, UPDATE_INTERVAL, _async_expire)
+
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: DucoBoxConfigEntry) -> None:
+    """Discard the data kept for a reload of a removed config entry."""
+    snapshot = hass.data.get(_DATA_RELOAD_SNAPSHOTS, {}).pop(entry.entry_id, None)
+    if snapshot is not None and snapshot.statistics is not None:
+        snapshot.statistics.async_flush(partial=True)
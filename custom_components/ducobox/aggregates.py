@@ -0,0 +1,140 @@
+"""Whole-house aggregates for the DucoBox integration."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+
+from .const import DUCOBOX_NODE_TYPE_BOX
+from .models import DucoBoxNode
+
+MAXIMUM_FIELDS = ("co2", "flow_lvl_tgt")
+MEAN_FIELDS = ("rh",)
+
+
+class DucoBoxAggregates:
+    """
+    Maintain whole-house aggregates of node fields incrementally.
+
+    Every field is stored as a column with a row per node, so an update only
+    touches the cells whose value changed. Maximums are kept with a count per
+    distinct value and means with a running sum and count, so a changed cell
+    updates the aggregates without scanning the other nodes. The box itself is
+    not part of the aggregates.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregates."""
+        self._rows: dict[int, int] = {}
+        self._free_rows: list[int] = []
+        self._columns: dict[str, list[int | None]] = {
+            field: [] for field in (*MAXIMUM_FIELDS, *MEAN_FIELDS)
+        }
+        self._value_counts: dict[str, Counter[int]] = {
+            field: Counter() for field in MAXIMUM_FIELDS
+        }
+        self._maximums: dict[str, int | None] = dict.fromkeys(MAXIMUM_FIELDS)
+        self._sums: dict[str, int] = dict.fromkeys(MEAN_FIELDS, 0)
+        self._counts: dict[str, int] = dict.fromkeys(MEAN_FIELDS, 0)
+
+    def update(self, changed: list[DucoBoxNode], removed: Iterable[int] = ()) -> None:
+        """
+        Update the aggregates from the changed and removed nodes.
+
+        Args:
+            changed: The nodes that are new or changed since the last update.
+            removed: The IDs of the nodes that are no longer present.
+
+        """
+        for node in changed:
+            if node.node_type == DUCOBOX_NODE_TYPE_BOX:
+                continue
+
+            row = self._rows.get(node.node_id)
+            if row is None:
+                row = self._add_row(node.node_id)
+
+            for field, column in self._columns.items():
+                value = getattr(node, field)
+                if column[row] != value:
+                    self._set_cell(field, row, value)
+
+        for node_id in removed:
+            row = self._rows.pop(node_id, None)
+            if row is None:
+                continue
+            for field in self._columns:
+                self._set_cell(field, row, None)
+            self._free_rows.append(row)
+
+    def maximum(self, field: str) -> int | None:
+        """Return the maximum of a field over all nodes reporting it."""
+        return self._maximums[field]
+
+    def mean(self, field: str) -> float | None:
+        """Return the mean of a field over all nodes reporting it."""
+        count = self._counts[field]
+        return self._sums[field] / count if count else None
+
+    def count(self, field: str) -> int:
+        """Return the number of nodes reporting a field."""
+        if field in self._counts:
+            return self._counts[field]
+        return self._value_counts[field].total()
+
+    def as_dict(self) -> dict[str, int | float | None]:
+        """Return all aggregates."""
+        return {
+            **{f"max_{field}": self.maximum(field) for field in MAXIMUM_FIELDS},
+            **{f"mean_{field}": self.mean(field) for field in MEAN_FIELDS},
+        }
+
+    def _add_row(self, node_id: int) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = len(self._rows)
+            for column in self._columns.values():
+                column.append(None)
+        self._rows[node_id] = row
+        return row
+
+    def _set_cell(self, field: str, row: int, value: int | None) -> None:
+        column = self._columns[field]
+        old_value, column[row] = column[row], value
+
+        if field in self._value_counts:
+            self._update_maximum(field, old_value, value)
+        else:
+            if old_value is not None:
+                self._sums[field] -= old_value
+                self._counts[field] -= 1
+            if value is not None:
+                self._sums[field] += value
+                self._counts[field] += 1
+
+    def _update_maximum(
+        self, field: str, old_value: int | None, value: int | None
+    ) -> None:
+        value_counts = self._value_counts[field]
+        maximum = self._maximums[field]
+
+        if old_value is not None:
+            value_counts[old_value] -= 1
+            if not value_counts[old_value]:
+                del value_counts[old_value]
+
+        if value is not None:
+            value_counts[value] += 1
+            if maximum is None or value > maximum:
+                self._maximums[field] = value
+                return
+
+        # Only dropping the last occurrence of the maximum needs a scan, and
+        # then only of the distinct values.
+        if (
+            old_value is not None
+            and old_value == maximum
+            and not value_counts[old_value]
+        ):
+            self._maximums[field] = max(value_counts, default=None)
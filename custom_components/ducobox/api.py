@@ -2,18 +2,93 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import Any
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientError, ClientResponseError, ClientSession, ClientTimeout
 
-from .models import DucoBoxInfo, DucoBoxNode
+from .models import DucoBoxCapabilities, DucoBoxInfo, DucoBoxNode
+from .streaming import DucoBoxNodeStreamParser
 from .utils import format_box_model_name
+from .watchdog import DucoBoxBlockingWatchdog
+
+if TYPE_CHECKING:
+    from .recording import DucoBoxRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
 _TIMEOUT = ClientTimeout(total=10)
 
+# The largest chunk of a streamed response that is parsed at once.
+_STREAM_CHUNK_SIZE = 16384
+
+_BOX_NODE_TYPE = "BOX"
+
+
+@dataclass(frozen=True, slots=True)
+class DucoBoxParameter:
+    """A box-level parameter of the /info endpoint and the box node field it sets."""
+
+    keys: tuple[str, str, str]
+    field: str
+    scale: float = 1
+    # Whether the raw value is signed, for transports reading unsigned registers.
+    signed: bool = False
+
+
+# Box-level parameters polled with the nodes. They are merged into a single
+# /info request, so adding a parameter here does not add a request per update.
+BOX_PARAMETERS: tuple[DucoBoxParameter, ...] = (
+    DucoBoxParameter(
+        ("HeatRecovery", "General", "TimeFilterRemain"), "time_filter_remain"
+    ),
+    DucoBoxParameter(
+        ("Ventilation", "Sensor", "TempOda"), "temp_oda", 0.1, signed=True
+    ),
+    DucoBoxParameter(
+        ("Ventilation", "Sensor", "TempSup"), "temp_sup", 0.1, signed=True
+    ),
+    DucoBoxParameter(
+        ("Ventilation", "Sensor", "TempEta"), "temp_eta", 0.1, signed=True
+    ),
+    DucoBoxParameter(
+        ("Ventilation", "Sensor", "TempEha"), "temp_eha", 0.1, signed=True
+    ),
+    DucoBoxParameter(("Ventilation", "Fan", "SpeedSup"), "speed_sup"),
+    DucoBoxParameter(("Ventilation", "Fan", "SpeedEha"), "speed_eha"),
+)
+
+_BOX_PARAMETERS_QUERY = {
+    "parameter": ",".join(dict.fromkeys(param.keys[-1] for param in BOX_PARAMETERS))
+}
+
+# Node parameters read by the integration, requested by name if the board
+# supports filtering /info/nodes.
+NODE_PARAMETERS = (
+    "Type",
+    "Parent",
+    "Name",
+    "NetworkType",
+    "State",
+    "TimeStateRemain",
+    "TimeStateEnd",
+    "Mode",
+    "FlowLvlTgt",
+    "Rh",
+    "IaqRh",
+    "Co2",
+    "IaqCo2",
+)
+
+_NODE_PARAMETERS_QUERY = {"parameter": ",".join(NODE_PARAMETERS)}
+
 
 def _get(data: Any, *keys: str) -> Any:
     """Traverse nested dict keys, returning None if any key is missing."""
@@ -35,24 +110,340 @@ def _get_required(data: Any, *keys: str) -> Any:
     return val
 
 
+def _parse_nodes(data: Any) -> list[DucoBoxNode]:
+    """Build the Duco nodes from a decoded /info/nodes response."""
+    return [_parse_node(node) for node in data.get("Nodes", [])]
+
+
+def _parse_node(node: Any) -> DucoBoxNode:
+    """Build a Duco node from a decoded node object of an /info/nodes response."""
+    node_id = _get_required(node, "Node")
+
+    general = node.get("General", {})
+    node_type = _get_required(general, "Type", "Val")
+    parent_node_id = _get_required(general, "Parent", "Val")
+    name = _get(general, "Name", "Val")
+    network_type = _get(general, "NetworkType", "Val")
+
+    ventilation = node.get("Ventilation", {})
+    state = _get(ventilation, "State", "Val")
+    time_state_remain = _get(ventilation, "TimeStateRemain", "Val")
+    time_state_end = _get(ventilation, "TimeStateEnd", "Val")
+    mode = _get(ventilation, "Mode", "Val")
+    flow_lvl_tgt = _get(ventilation, "FlowLvlTgt", "Val")
+
+    sensor = node.get("Sensor", {})
+    rh = _get(sensor, "Rh", "Val")
+    iaq_rh = _get(sensor, "IaqRh", "Val")
+    co2 = _get(sensor, "Co2", "Val")
+    iaq_co2 = _get(sensor, "IaqCo2", "Val")
+
+    return DucoBoxNode(
+        node_id=node_id,
+        node_type=node_type,
+        parent_node_id=parent_node_id,
+        name=name,
+        network_type=network_type,
+        state=state,
+        time_state_remain=time_state_remain,
+        time_state_end=time_state_end,
+        mode=mode,
+        flow_lvl_tgt=flow_lvl_tgt,
+        rh=rh,
+        iaq_rh=iaq_rh,
+        co2=co2,
+        iaq_co2=iaq_co2,
+    )
+
+
+def _apply_box_parameters(nodes: list[DucoBoxNode], data: Any) -> None:
+    """Set the box-level parameters of a decoded /info response on the box node."""
+    for node in nodes:
+        if node.node_type == _BOX_NODE_TYPE:
+            for param in BOX_PARAMETERS:
+                value = _get(data, *param.keys, "Val")
+                if value is not None and param.scale != 1:
+                    value = round(value * param.scale, 1)
+                setattr(node, param.field, value)
+
+
+def _decode_nodes(body: bytes) -> list[DucoBoxNode]:
+    """
+    Decode and parse an /info/nodes response body.
+
+    Raises:
+        DucoConnectivityBoardApiError: If the body is not valid JSON.
+
+    """
+    try:
+        data = json.loads(body)
+    except ValueError as err:
+        msg = f"Invalid nodes response: {err}"
+        raise DucoConnectivityBoardApiError(msg) from err
+    return _parse_nodes(data)
+
+
+async def _async_single_chunk(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+def _reported_node_parameters(data: Any) -> set[str]:
+    """Return the names of the parameters in a decoded /info/nodes response."""
+    return {
+        parameter
+        for node in data.get("Nodes", [])
+        for module in node.values()
+        if isinstance(module, dict)
+        for parameter in module
+    }
+
+
 class DucoConnectivityBoardApiError(Exception):
     """Raised when the API returns unexpected data."""
 
 
-class DucoConnectivityBoardApi:
-    """API client for Duco Connectivity Board 2.0."""
+class DucoConnectivityBoardConnectionError(DucoConnectivityBoardApiError):
+    """Raised when a transport fails to communicate with the board."""
+
+
+class DucoBoxTransport(Protocol):
+    """
+    A transport to communicate with a Duco Connectivity Board 2.0.
+
+    Transports subclass the protocol explicitly to inherit the defaults of the
+    optional capabilities: streaming the nodes, shaping the requests for the
+    capabilities of the board, decoding in an executor and recording.
+    """
 
-    def __init__(self, host: str, session: ClientSession) -> None:
+    watchdog: DucoBoxBlockingWatchdog
+    # The capabilities of the board the requests are shaped for.
+    capabilities: DucoBoxCapabilities | None = None
+    # Whether the exchanges with the board can be recorded, into the recorder.
+    supports_recording: ClassVar[bool] = False
+    recorder: DucoBoxRecorder | None = None
+
+    async def async_get_box_info(self) -> DucoBoxInfo:
+        """Get information about the DucoBox."""
+        ...
+
+    async def async_get_nodes(self) -> list[DucoBoxNode]:
+        """Fetch all Duco nodes."""
+        ...
+
+    async def async_get_ventilation_state_options(self) -> dict[int, list[str]]:
+        """Get ventilation state options for all Duco nodes."""
+        ...
+
+    async def async_set_ventilation_state(self, node_id: int, state: str) -> bool:
+        """Set the ventilation state of a Duco node."""
+        ...
+
+    async def async_set_identify(self, node_id: int) -> bool:
+        """Set identify on a Duco node."""
+        ...
+
+    async def async_close(self) -> None:
+        """Close the connection to the board."""
+        ...
+
+    async def async_iter_nodes(self) -> AsyncIterator[DucoBoxNode]:
         """
-        Initialize the Duco Connectivity Board 2.0 API client.
+        Fetch all Duco nodes, yielding every node as soon as it is received.
+
+        Transports that do not stream the nodes yield them once all nodes are
+        received.
+        """
+        for node in await self.async_get_nodes():
+            yield node
+
+    def set_capabilities(self, capabilities: DucoBoxCapabilities | None) -> None:
+        """
+        Shape the requests for the capabilities of the board.
+
+        Transports with a fixed request shape ignore the capabilities.
+        """
+
+    async def async_probe_capabilities(self) -> DucoBoxCapabilities | None:
+        """
+        Probe the request shapes and box-level parameters the board supports.
+
+        Transports with a fixed request shape return None.
+        """
+        return None
+
+    def set_executor_decode_threshold(self, threshold: int | None) -> None:
+        """
+        Set the response size above which nodes are decoded in an executor.
+
+        Transports that do not decode JSON responses ignore the threshold.
+        """
+
+
+class DucoBoxJsonApiTransport(DucoBoxTransport, ABC):
+    """
+    Base transport for the JSON API of the Duco Connectivity Board 2.0.
+
+    Subclasses provide the exchange of a single request for its response body,
+    so the decoding and parsing is shared by every JSON API transport.
+    """
+
+    supports_recording = True
+
+    def __init__(
+        self,
+        *,
+        watchdog: DucoBoxBlockingWatchdog | None = None,
+        executor_decode_threshold: int | None = None,
+    ) -> None:
+        """
+        Initialize the JSON API transport.
 
         Args:
-            host: The hostname or IP address of the Duco Connectivity Board 2.0.
-            session: The ClientSession to use for HTTP requests.
+            watchdog: The watchdog measuring the synchronous decoding and parsing.
+            executor_decode_threshold: The size in bytes above which node
+                responses are decoded and parsed in an executor instead of on
+                the event loop, or None to always decode on the event loop.
 
         """
-        self._base_url = f"http://{host}"
-        self._session = session
+        self.executor_decode_threshold = executor_decode_threshold
+        self.watchdog = watchdog or DucoBoxBlockingWatchdog()
+        self.recorder: DucoBoxRecorder | None = None
+        self.capabilities: DucoBoxCapabilities | None = None
+        self._nodes_query: dict[str, str] | None = None
+        self._box_query: dict[str, str] | None = _BOX_PARAMETERS_QUERY
+
+    def set_executor_decode_threshold(self, threshold: int | None) -> None:
+        """Set the response size above which nodes are decoded in an executor."""
+        self.executor_decode_threshold = threshold
+
+    def set_capabilities(self, capabilities: DucoBoxCapabilities | None) -> None:
+        """Use the cheapest request shapes the board supports, if known."""
+        self.capabilities = capabilities
+        if capabilities is None:
+            self._nodes_query = None
+            self._box_query = _BOX_PARAMETERS_QUERY
+            return
+
+        self._nodes_query = (
+            _NODE_PARAMETERS_QUERY if capabilities.node_parameter_filter else None
+        )
+        self._box_query = (
+            {"parameter": ",".join(capabilities.box_parameters)}
+            if capabilities.box_parameters
+            else None
+        )
+
+    @abstractmethod
+    async def _async_exchange(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None,
+        payload: dict[str, Any] | None,
+    ) -> tuple[int, bytes]:
+        """Send a request and return the status and body of its response."""
+
+    async def _async_request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, str] | None = None,
+        payload: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Send a request, recording the exchange if a recorder is attached."""
+        start = monotonic()
+        status, body = await self._async_exchange(method, path, params, payload)
+
+        if self.recorder is not None:
+            self.recorder.record(
+                method,
+                path,
+                params=params,
+                payload=payload,
+                status=status,
+                elapsed=monotonic() - start,
+                body=body,
+            )
+
+        return body
+
+    @asynccontextmanager
+    async def _async_open(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None,
+        payload: dict[str, Any] | None,
+    ) -> AsyncIterator[tuple[int, int | None, AsyncIterator[bytes]]]:
+        """
+        Send a request and open its response.
+
+        Transports that cannot stream a response body return it as one chunk.
+
+        Yields:
+            The status, the size if known and the chunks of the response body.
+
+        """
+        status, body = await self._async_exchange(method, path, params, payload)
+        yield status, len(body), _async_single_chunk(body)
+
+    @asynccontextmanager
+    async def _async_request_stream(
+        self, method: str, path: str, *, params: dict[str, str] | None = None
+    ) -> AsyncIterator[tuple[int | None, AsyncIterator[bytes]]]:
+        """
+        Send a request and stream its response body.
+
+        The exchange is recorded once the body is complete, if a recorder is
+        attached.
+
+        Yields:
+            The size if known and the chunks of the response body.
+
+        """
+        start = monotonic()
+        recorder = self.recorder
+        async with self._async_open(method, path, params, None) as (
+            status,
+            size,
+            chunks,
+        ):
+            if recorder is None:
+                yield size, chunks
+                return
+
+            async def _async_recorded_chunks() -> AsyncIterator[bytes]:
+                body = bytearray()
+                async for chunk in chunks:
+                    body.extend(chunk)
+                    yield chunk
+                recorder.record(
+                    method,
+                    path,
+                    params=params,
+                    payload=None,
+                    status=status,
+                    elapsed=monotonic() - start,
+                    body=bytes(body),
+                )
+
+            yield size, _async_recorded_chunks()
+
+    def _decode(self, body: bytes) -> Any:
+        """
+        Decode a JSON response body.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the body is not valid JSON.
+
+        """
+        with self.watchdog.measure("decode"):
+            try:
+                return json.loads(body)
+            except ValueError as err:
+                msg = f"Invalid JSON response: {err}"
+                raise DucoConnectivityBoardApiError(msg) from err
 
     async def async_get_box_info(self) -> DucoBoxInfo:
         """
@@ -66,88 +457,177 @@ class DucoConnectivityBoardApi:
             ClientResponseError: If the HTTP request fails.
 
         """
-        url = f"{self._base_url}/info"
-        params = {"parameter": "BoxName,SerialDucoBox,Mac"}
-
-        response = await self._session.get(url, params=params, timeout=_TIMEOUT)
-        response.raise_for_status()
-        data = await response.json()
+        params = {"parameter": "BoxName,SerialDucoBox,Mac,SwVersionComm"}
+        data = self._decode(await self._async_request("GET", "/info", params=params))
 
-        general = data.get("General", {})
-        board = general.get("Board", {})
-        lan = general.get("Lan", {})
+        board = _get(data, "General", "Board")
+        lan = _get(data, "General", "Lan")
 
         model_name = _get_required(board, "BoxName", "Val")
         serial_number = _get_required(board, "SerialDucoBox", "Val")
         mac_address = _get_required(lan, "Mac", "Val")
+        firmware_version = _get(board, "SwVersionComm", "Val")
 
         return DucoBoxInfo(
             model=format_box_model_name(model_name),
             serial_number=serial_number,
             mac_address=mac_address,
+            firmware_version=firmware_version,
+        )
+
+    async def async_probe_capabilities(self) -> DucoBoxCapabilities:
+        """
+        Probe the request shapes and box-level parameters the board supports.
+
+        A board that does not answer the box-level parameters as expected is
+        treated as supporting none of them, so they are not requested again.
+
+        Returns:
+            DucoBoxCapabilities: The capabilities of the board.
+
+        Raises:
+            ClientError: If the HTTP request fails.
+
+        """
+        try:
+            box_data = self._decode(
+                await self._async_request("GET", "/info", params=_BOX_PARAMETERS_QUERY)
+            )
+        except (ClientResponseError, DucoConnectivityBoardApiError) as err:
+            _LOGGER.warning("Failed to probe the box parameters: %r", err)
+            box_parameters: tuple[str, ...] = ()
+        else:
+            box_parameters = tuple(
+                dict.fromkeys(
+                    param.keys[-1]
+                    for param in BOX_PARAMETERS
+                    if _get(box_data, *param.keys, "Val") is not None
+                )
+            )
+
+        # Firmware that does not support the filter answers with all parameters.
+        try:
+            data = self._decode(
+                await self._async_request(
+                    "GET", "/info/nodes", params=_NODE_PARAMETERS_QUERY
+                )
+            )
+        except (ClientResponseError, DucoConnectivityBoardApiError):
+            node_parameter_filter = False
+        else:
+            reported = _reported_node_parameters(data)
+            node_parameter_filter = bool(reported) and reported <= set(NODE_PARAMETERS)
+
+        return DucoBoxCapabilities(
+            node_parameter_filter=node_parameter_filter,
+            box_parameters=box_parameters,
         )
 
     async def async_get_nodes(self) -> list[DucoBoxNode]:
         """
-        Fetch all Duco nodes.
+        Fetch all Duco nodes, including the box-level parameters of the box node.
 
         Returns:
             list[DucoBoxNode]: List of Duco nodes.
 
         Raises:
+            DucoConnectivityBoardApiError: If the API returns unexpected data.
             ClientResponseError: If the HTTP request fails.
 
         """
-        url = f"{self._base_url}/info/nodes"
+        async with aclosing(self.async_iter_nodes()) as nodes:
+            return [node async for node in nodes]
 
-        response = await self._session.get(url, timeout=_TIMEOUT)
-        response.raise_for_status()
-        data = await response.json()
+    async def async_iter_nodes(self) -> AsyncIterator[DucoBoxNode]:
+        """
+        Fetch all Duco nodes, yielding every node as soon as it is received.
 
-        nodes: list[DucoBoxNode] = []
+        The nodes and all box-level parameters are requested concurrently, in
+        one request each. If the capabilities of the board are known, only the
+        parameters the integration reads and the board supports are requested.
+        If the box-level parameters cannot be fetched, the box node is yielded
+        without them.
 
-        for node in data.get("Nodes", []):
-            node_id = _get_required(node, "Node")
-
-            general = node.get("General", {})
-            node_type = _get_required(general, "Type", "Val")
-            parent_node_id = _get_required(general, "Parent", "Val")
-            name = _get(general, "Name", "Val")
-            network_type = _get(general, "NetworkType", "Val")
-
-            ventilation = node.get("Ventilation", {})
-            state = _get(ventilation, "State", "Val")
-            time_state_remain = _get(ventilation, "TimeStateRemain", "Val")
-            time_state_end = _get(ventilation, "TimeStateEnd", "Val")
-            mode = _get(ventilation, "Mode", "Val")
-            flow_lvl_tgt = _get(ventilation, "FlowLvlTgt", "Val")
-
-            sensor = node.get("Sensor", {})
-            rh = _get(sensor, "Rh", "Val")
-            iaq_rh = _get(sensor, "IaqRh", "Val")
-            co2 = _get(sensor, "Co2", "Val")
-            iaq_co2 = _get(sensor, "IaqCo2", "Val")
-
-            duco_node = DucoBoxNode(
-                node_id=node_id,
-                node_type=node_type,
-                parent_node_id=parent_node_id,
-                name=name,
-                network_type=network_type,
-                state=state,
-                time_state_remain=time_state_remain,
-                time_state_end=time_state_end,
-                mode=mode,
-                flow_lvl_tgt=flow_lvl_tgt,
-                rh=rh,
-                iaq_rh=iaq_rh,
-                co2=co2,
-                iaq_co2=iaq_co2,
+        Yields:
+            DucoBoxNode: The Duco nodes, in the order of the response.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the API returns unexpected data.
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        box_request = (
+            asyncio.ensure_future(
+                self._async_request("GET", "/info", params=self._box_query)
             )
+            if self._box_query is not None
+            else None
+        )
+        try:
+            async with aclosing(self._async_iter_info_nodes()) as nodes:
+                async for node in nodes:
+                    if node.node_type == _BOX_NODE_TYPE and box_request is not None:
+                        try:
+                            box_data = self._decode(await box_request)
+                        except (
+                            ClientError,
+                            TimeoutError,
+                            DucoConnectivityBoardApiError,
+                        ) as err:
+                            _LOGGER.warning(
+                                "Failed to fetch the box parameters: %r", err
+                            )
+                        else:
+                            with self.watchdog.measure("parse"):
+                                _apply_box_parameters([node], box_data)
+                    yield node
+        finally:
+            if box_request is not None:
+                if box_request.done() and not box_request.cancelled():
+                    box_request.exception()
+                box_request.cancel()
+
+    async def _async_iter_info_nodes(self) -> AsyncIterator[DucoBoxNode]:
+        """
+        Yield the nodes of an /info/nodes response.
+
+        The response is parsed while it is received, so every node is yielded
+        as soon as its object is complete. A response larger than the executor
+        decoding threshold is received completely and decoded in an executor
+        instead.
 
-            nodes.append(duco_node)
+        Raises:
+            DucoConnectivityBoardApiError: If the API returns unexpected data.
 
-        return nodes
+        """
+        async with self._async_request_stream(
+            "GET", "/info/nodes", params=self._nodes_query
+        ) as (size, chunks):
+            if (
+                self.executor_decode_threshold is not None
+                and size is not None
+                and size > self.executor_decode_threshold
+            ):
+                body = b"".join([chunk async for chunk in chunks])
+                loop = asyncio.get_running_loop()
+                for node in await loop.run_in_executor(None, _decode_nodes, body):
+                    yield node
+                return
+
+            parser = DucoBoxNodeStreamParser()
+            try:
+                async for chunk in chunks:
+                    with self.watchdog.measure("decode"):
+                        node_objects = parser.feed(chunk)
+                    for node_object in node_objects:
+                        with self.watchdog.measure("parse"):
+                            node = _parse_node(node_object)
+                        yield node
+
+                parser.close()
+            except ValueError as err:
+                msg = f"Invalid nodes response: {err}"
+                raise DucoConnectivityBoardApiError(msg) from err
 
     async def async_get_ventilation_state_options(self) -> dict[int, list[str]]:
         """
@@ -161,12 +641,10 @@ class DucoConnectivityBoardApi:
             ClientResponseError: If the HTTP request fails.
 
         """
-        url = f"{self._base_url}/action/nodes"
         params = {"action": "SetVentilationState"}
-
-        response = await self._session.get(url, params=params, timeout=_TIMEOUT)
-        response.raise_for_status()
-        data = await response.json()
+        data = self._decode(
+            await self._async_request("GET", "/action/nodes", params=params)
+        )
 
         ventilation_state_options: dict[int, list[str]] = {}
 
@@ -206,14 +684,225 @@ class DucoConnectivityBoardApi:
             ClientResponseError: If the HTTP request fails.
 
         """
-        url = f"{self._base_url}/action/nodes/{node_id}"
         payload = {"Action": "SetVentilationState", "Val": state}
+        result = self._decode(
+            await self._async_request(
+                "POST", f"/action/nodes/{node_id}", payload=payload
+            )
+        )
+
+        return result.get("Result") == "SUCCESS"
+
+    async def async_set_identify(self, node_id: int) -> bool:
+        """
+        Set identify on the DucoBox device.
+
+        Args:
+            node_id: The Duco node ID.
+
+        Returns:
+            bool: True if the identify action was set successfully, false otherwise.
+
+        Raises:
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        payload = {"Action": "SetIdentify", "Val": True}
+        result = self._decode(
+            await self._async_request(
+                "POST", f"/action/nodes/{node_id}", payload=payload
+            )
+        )
+
+        return result.get("Result") == "SUCCESS"
 
-        response = await self._session.post(url, json=payload, timeout=_TIMEOUT)
+    async def async_close(self) -> None:
+        """Close the transport."""
+
+
+class DucoBoxHttpTransport(DucoBoxJsonApiTransport):
+    """Transport using the HTTP API of the Duco Connectivity Board 2.0."""
+
+    def __init__(
+        self,
+        host: str,
+        session: ClientSession,
+        *,
+        timeout: ClientTimeout = _TIMEOUT,
+        watchdog: DucoBoxBlockingWatchdog | None = None,
+        executor_decode_threshold: int | None = None,
+    ) -> None:
+        """
+        Initialize the HTTP transport.
+
+        Args:
+            host: The hostname or IP address of the Duco Connectivity Board 2.0.
+            session: The ClientSession to use for HTTP requests.
+            timeout: The timeout of HTTP requests.
+            watchdog: The watchdog measuring the synchronous decoding and parsing.
+            executor_decode_threshold: The size in bytes above which node
+                responses are decoded and parsed in an executor instead of on
+                the event loop, or None to always decode on the event loop.
+
+        """
+        super().__init__(
+            watchdog=watchdog, executor_decode_threshold=executor_decode_threshold
+        )
+        self._base_url = f"http://{host}"
+        self._session = session
+        self._timeout = timeout
+
+    async def _async_exchange(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None,
+        payload: dict[str, Any] | None,
+    ) -> tuple[int, bytes]:
+        """
+        Send an HTTP request and return the status and body of its response.
+
+        Raises:
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        response = await self._session.request(
+            method,
+            f"{self._base_url}{path}",
+            params=params,
+            json=payload,
+            timeout=self._timeout,
+        )
         response.raise_for_status()
-        result = await response.json()
+        return response.status, await response.read()
+
+    @asynccontextmanager
+    async def _async_open(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None,
+        payload: dict[str, Any] | None,
+    ) -> AsyncIterator[tuple[int, int | None, AsyncIterator[bytes]]]:
+        """
+        Send an HTTP request and stream its response body.
+
+        Raises:
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        async with self._session.request(
+            method,
+            f"{self._base_url}{path}",
+            params=params,
+            json=payload,
+            timeout=self._timeout,
+        ) as response:
+            response.raise_for_status()
+            yield (
+                response.status,
+                response.content_length,
+                response.content.iter_chunked(_STREAM_CHUNK_SIZE),
+            )
+
+
+class DucoConnectivityBoardApi:
+    """API client for Duco Connectivity Board 2.0."""
+
+    def __init__(self, transport: DucoBoxTransport) -> None:
+        """
+        Initialize the Duco Connectivity Board 2.0 API client.
+
+        Args:
+            transport: The transport to communicate with the board.
+
+        """
+        self.transport = transport
+
+    @property
+    def watchdog(self) -> DucoBoxBlockingWatchdog:
+        """Return the watchdog measuring the synchronous decoding and parsing."""
+        return self.transport.watchdog
+
+    async def async_get_box_info(self) -> DucoBoxInfo:
+        """
+        Get information about the DucoBox.
+
+        Returns:
+            DucoBoxInfo: Object containing DucoBox information.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        return await self.transport.async_get_box_info()
+
+    async def async_get_nodes(self) -> list[DucoBoxNode]:
+        """
+        Fetch all Duco nodes.
+
+        Returns:
+            list[DucoBoxNode]: List of Duco nodes.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        return await self.transport.async_get_nodes()
+
+    async def async_iter_nodes(self) -> AsyncIterator[DucoBoxNode]:
+        """
+        Fetch all Duco nodes, yielding every node as soon as it is received.
 
-        success = result.get("Result") == "SUCCESS"
+        Transports that do not stream the nodes yield them once all nodes are
+        received.
+
+        Yields:
+            DucoBoxNode: The Duco nodes.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        async with aclosing(self.transport.async_iter_nodes()) as nodes:
+            async for node in nodes:
+                yield node
+
+    async def async_get_ventilation_state_options(self) -> dict[int, list[str]]:
+        """
+        Get ventilation state options for all Duco nodes.
+
+        Returns:
+            dict[int, list[str]]: Mapping of node ID to list of ventilation
+            state options.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        return await self.transport.async_get_ventilation_state_options()
+
+    async def async_set_ventilation_state(self, node_id: int, state: str) -> bool:
+        """
+        Set the ventilation state on the DucoBox device.
+
+        Args:
+            node_id: The Duco node ID.
+            state: The ventilation state.
+
+        Returns:
+            bool: True if the ventilation state was set successfully, false otherwise.
+
+        Raises:
+            DucoConnectivityBoardConnectionError: If the transport fails.
+            ClientResponseError: If the HTTP request fails.
+
+        """
+        success = await self.transport.async_set_ventilation_state(node_id, state)
 
         if not success:
             _LOGGER.warning("Action SetVentilationState for node %s failed", node_id)
@@ -231,19 +920,76 @@ class DucoConnectivityBoardApi:
             bool: True if the identify action was set successfully, false otherwise.
 
         Raises:
+            DucoConnectivityBoardConnectionError: If the transport fails.
             ClientResponseError: If the HTTP request fails.
 
         """
-        url = f"{self._base_url}/action/nodes/{node_id}"
-        payload = {"Action": "SetIdentify", "Val": True}
-
-        response = await self._session.post(url, json=payload, timeout=_TIMEOUT)
-        response.raise_for_status()
-        result = await response.json()
-
-        success = result.get("Result") == "SUCCESS"
+        success = await self.transport.async_set_identify(node_id)
 
         if not success:
             _LOGGER.warning("Action SetIdentify for node %s failed", node_id)
 
         return success
+
+    @property
+    def capabilities(self) -> DucoBoxCapabilities | None:
+        """Return the capabilities of the board the requests are shaped for."""
+        return self.transport.capabilities
+
+    def set_capabilities(self, capabilities: DucoBoxCapabilities | None) -> None:
+        """
+        Shape the requests for the capabilities of the board.
+
+        Transports with a fixed request shape ignore the capabilities.
+        """
+        self.transport.set_capabilities(capabilities)
+
+    async def async_probe_capabilities(self) -> DucoBoxCapabilities | None:
+        """
+        Probe the request shapes and box-level parameters the board supports.
+
+        Returns:
+            DucoBoxCapabilities | None: The capabilities of the board, or None if
+            the transport has a fixed request shape.
+
+        Raises:
+            ClientError: If the HTTP request fails.
+
+        """
+        return await self.transport.async_probe_capabilities()
+
+    def set_executor_decode_threshold(self, threshold: int | None) -> None:
+        """
+        Set the response size above which nodes are decoded in an executor.
+
+        Transports that do not decode JSON responses ignore the threshold.
+        """
+        self.transport.set_executor_decode_threshold(threshold)
+
+    def start_recording(self, recorder: DucoBoxRecorder) -> None:
+        """
+        Start recording the exchanges with the board.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the transport does not support
+                recording or is already recording.
+
+        """
+        if not self.transport.supports_recording:
+            msg = "Recording is only supported by the HTTP API transport"
+            raise DucoConnectivityBoardApiError(msg)
+        if self.transport.recorder is not None:
+            msg = "The exchanges with the board are already being recorded"
+            raise DucoConnectivityBoardApiError(msg)
+        self.transport.recorder = recorder
+
+    def stop_recording(self) -> DucoBoxRecorder | None:
+        """Stop recording the exchanges with the board, returning the recorder."""
+        if not self.transport.supports_recording:
+            return None
+        recorder, self.transport.recorder = self.transport.recorder, None
+        return recorder
+
+    async def async_close(self) -> None:
+        """Close the connection to the board."""
+        await self.transport.async_close()
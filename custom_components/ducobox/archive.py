@@ -0,0 +1,318 @@
+"""Append-only time-series archive of DucoBox node telemetry."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import UTC, date, datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import BinaryIO
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .models import DucoBoxNode
+
+_LOGGER = logging.getLogger(__name__)
+
+# The node fields that are archived, besides the time and the node ID.
+ARCHIVE_FIELDS = ("co2", "rh", "flow_lvl_tgt", "state")
+ARCHIVE_SUFFIX = ".dca"
+
+# The rows that are buffered before they are written, and the longest time
+# they are buffered.
+FLUSH_ROWS = 4096
+FLUSH_INTERVAL = timedelta(minutes=5)
+
+_MAGIC = b"DCA1"
+_MISSING = -1
+# The state names of a block, besides no state, indexed by a byte.
+_MAX_STATES = 255
+
+# The array type code of every column. The time is stored in milliseconds as
+# the difference with the previous row, the states as indices into the
+# newline-separated state names of the block.
+_COLUMNS = {
+    "time": "q",
+    "node_id": "H",
+    "co2": "h",
+    "rh": "h",
+    "flow_lvl_tgt": "h",
+    "state": "B",
+    "state_names": "B",
+}
+# The magic, the row count and the compressed size of every column.
+_BLOCK_HEADER = struct.Struct(f"<4sI{len(_COLUMNS)}I")
+
+type ArchiveRow = tuple[datetime, int, int | None, int | None, int | None, str | None]
+
+
+def archive_directory(hass: HomeAssistant, serial_number: str) -> Path:
+    """Return the archive directory of a box in the configuration directory."""
+    return Path(hass.config.path("ducobox_archive", slugify(serial_number)))
+
+
+def archive_path(directory: Path, day: date) -> Path:
+    """Return the path of the archive file of a day (in UTC)."""
+    return directory / f"{day.isoformat()}{ARCHIVE_SUFFIX}"
+
+
+def encode_block(rows: list[ArchiveRow]) -> bytes:
+    """
+    Encode rows into a block of compressed columns.
+
+    Raises:
+        ValueError: If the rows have more distinct states than a block holds.
+
+    """
+    columns = {column: array(type_code) for column, type_code in _COLUMNS.items()}
+    state_names: dict[str | None, int] = {None: 0}
+    previous = 0
+
+    for when, node_id, co2, rh, flow_lvl_tgt, state in rows:
+        timestamp = round(when.timestamp() * 1000)
+        columns["time"].append(timestamp - previous)
+        previous = timestamp
+        columns["node_id"].append(node_id)
+        columns["co2"].append(_MISSING if co2 is None else co2)
+        columns["rh"].append(_MISSING if rh is None else rh)
+        columns["flow_lvl_tgt"].append(
+            _MISSING if flow_lvl_tgt is None else flow_lvl_tgt
+        )
+        if (index := state_names.setdefault(state, len(state_names))) > _MAX_STATES:
+            msg = f"A block holds at most {_MAX_STATES} distinct states"
+            raise ValueError(msg)
+        columns["state"].append(index)
+
+    columns["state_names"].frombytes(
+        "\n".join(name or "" for name in state_names).encode()
+    )
+
+    compressed = [zlib.compress(values.tobytes()) for values in columns.values()]
+    return _BLOCK_HEADER.pack(
+        _MAGIC, len(rows), *(len(data) for data in compressed)
+    ) + b"".join(compressed)
+
+
+def _split_blocks(rows: list[ArchiveRow]) -> Iterator[list[ArchiveRow]]:
+    """Split rows into the fewest blocks that hold their distinct states."""
+    states: set[str] = set()
+    start = 0
+    for index, row in enumerate(rows):
+        if (state := row[5]) is None or state in states:
+            continue
+        if len(states) == _MAX_STATES:
+            yield rows[start:index]
+            states.clear()
+            start = index
+        states.add(state)
+    yield rows[start:]
+
+
+def _complete_length(file: BinaryIO) -> int:
+    """Return the length of the complete blocks at the start of a file."""
+    length = 0
+    while len(header := file.read(_BLOCK_HEADER.size)) == _BLOCK_HEADER.size:
+        magic, _rows, *sizes = _BLOCK_HEADER.unpack(header)
+        end = length + _BLOCK_HEADER.size + sum(sizes)
+        if magic != _MAGIC or file.seek(0, os.SEEK_END) < end:
+            break
+        length = file.seek(end)
+    return length
+
+
+def append_rows(
+    directory: Path, rows: list[ArchiveRow], lengths: dict[Path, int] | None = None
+) -> None:
+    """
+    Append rows to the archive files of their days, one block per day.
+
+    A block that was not completely written before, e.g. because Home
+    Assistant stopped while writing it, is overwritten.
+
+    Args:
+        directory: The archive directory.
+        rows: The rows to append.
+        lengths: The length of the complete blocks of every file written
+            before, so only the first write to a file scans its blocks.
+
+    """
+    if lengths is None:
+        lengths = {}
+    days: dict[date, list[ArchiveRow]] = {}
+    for row in rows:
+        days.setdefault(row[0].astimezone(UTC).date(), []).append(row)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for day, day_rows in days.items():
+        path = archive_path(directory, day)
+        with path.open("a+b") as file:
+            length = lengths.get(path)
+            # A file that is shorter than written was replaced since.
+            if length is None or length > os.fstat(file.fileno()).st_size:
+                file.seek(0)
+                length = _complete_length(file)
+            file.truncate(length)
+            for block_rows in _split_blocks(day_rows):
+                length += file.write(encode_block(block_rows))
+        lengths[path] = length
+
+
+def _decode_column(view: memoryview, start: int, size: int, column: str) -> array:
+    values = array(_COLUMNS[column])
+    values.frombytes(zlib.decompress(view[start : start + size]))
+    return values
+
+
+def _decode_block(
+    view: memoryview, offset: int, sizes: list[int], columns: list[str]
+) -> dict[str, list]:
+    starts = accumulate(sizes, initial=offset + _BLOCK_HEADER.size)
+    locations = dict(zip(_COLUMNS, zip(starts, sizes, strict=False), strict=True))
+
+    block: dict[str, list] = {}
+    for column in columns:
+        values = _decode_column(view, *locations[column], column)
+        if column == "time":
+            block[column] = [
+                datetime.fromtimestamp(timestamp / 1000, UTC)
+                for timestamp in accumulate(values)
+            ]
+        elif column == "state":
+            names = _decode_column(view, *locations["state_names"], "state_names")
+            states = [name or None for name in names.tobytes().decode().split("\n")]
+            block[column] = [states[index] for index in values]
+        elif column == "node_id":
+            block[column] = values.tolist()
+        else:
+            block[column] = [None if value == _MISSING else value for value in values]
+    return block
+
+
+def iter_blocks(
+    path: Path, columns: Iterable[str] = ("time", "node_id", *ARCHIVE_FIELDS)
+) -> Iterator[dict[str, list]]:
+    """
+    Scan the blocks of an archive file, decoding only the requested columns.
+
+    The file is memory-mapped, so the columns that are not requested are
+    skipped without being read. An incomplete block ends the scan.
+
+    Yields:
+        The requested columns of every block, with the times as datetimes, the
+        states as names and missing values as None.
+
+    """
+    columns = list(columns)
+    with path.open("rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return
+        with (
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as view,
+        ):
+            offset = 0
+            while offset + _BLOCK_HEADER.size <= len(view):
+                magic, _rows, *sizes = _BLOCK_HEADER.unpack_from(view, offset)
+                end = offset + _BLOCK_HEADER.size + sum(sizes)
+                if magic != _MAGIC or end > len(view):
+                    _LOGGER.warning("Ignoring incomplete block at the end of %s", path)
+                    return
+                yield _decode_block(view, offset, sizes, columns)
+                offset = end
+
+
+def iter_rows(directory: Path, start: date, end: date) -> Iterator[ArchiveRow]:
+    """Iterate over the archived rows of the days from start to end, inclusive."""
+    day = start
+    while day <= end:
+        if (path := archive_path(directory, day)).exists():
+            for block in iter_blocks(path):
+                yield from zip(
+                    block["time"],
+                    block["node_id"],
+                    *(block[field] for field in ARCHIVE_FIELDS),
+                    strict=True,
+                )
+        day += timedelta(days=1)
+
+
+def export_csv(directory: Path, start: date, end: date, path: Path) -> int:
+    """Export the archived rows of the days from start to end to a CSV file."""
+    count = 0
+    with path.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(("time", "node_id", *ARCHIVE_FIELDS))
+        for row in iter_rows(directory, start, end):
+            writer.writerow((row[0].isoformat(), *row[1:]))
+            count += 1
+    return count
+
+
+class DucoBoxArchive:
+    """
+    Buffer the node telemetry of every update and append it to the archive.
+
+    The rows are written in an executor, at most one write at a time, once
+    enough rows are buffered or they are buffered for long enough.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path) -> None:
+        """Initialize the archive."""
+        self._hass = hass
+        self.directory = directory
+        self._rows: list[ArchiveRow] = []
+        self._buffered_since: datetime | None = None
+        self._write: asyncio.Future[None] | None = None
+        # The length of the complete blocks of every written file.
+        self._lengths: dict[Path, int] = {}
+
+    @callback
+    def async_add(self, nodes: Iterable[DucoBoxNode], now: datetime) -> None:
+        """Buffer the telemetry of the nodes, writing the buffer if it is due."""
+        self._rows.extend(
+            (now, node.node_id, node.co2, node.rh, node.flow_lvl_tgt, node.state)
+            for node in nodes
+        )
+        if self._buffered_since is None:
+            self._buffered_since = now
+
+        if self._write is None and (
+            len(self._rows) >= FLUSH_ROWS
+            or now - self._buffered_since >= FLUSH_INTERVAL
+        ):
+            self._async_write()
+
+    async def async_flush(self) -> None:
+        """Write all buffered rows, after a running write."""
+        if self._write is not None:
+            await asyncio.wait([self._write])
+        if self._rows:
+            await asyncio.wait([self._async_write()])
+
+    @callback
+    def _async_write(self) -> asyncio.Future[None]:
+        rows, self._rows, self._buffered_since = self._rows, [], None
+        write = self._hass.async_add_executor_job(
+            append_rows, self.directory, rows, self._lengths
+        )
+        write.add_done_callback(self._async_write_done)
+        self._write = write
+        return write
+
+    @callback
+    def _async_write_done(self, write: asyncio.Future[None]) -> None:
+        if self._write is write:
+            self._write = None
+        if (err := write.exception()) is not None:
+            _LOGGER.error(
+                "Failed to write to the archive in %s: %s", self.directory, err
+            )
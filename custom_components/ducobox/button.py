@@ -2,45 +2,16 @@
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
-
-from homeassistant.components.button import (
-    ButtonDeviceClass,
-    ButtonEntity,
-    ButtonEntityDescription,
-)
-from homeassistant.const import EntityCategory
+from homeassistant.components.button import ButtonEntity
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import DucoBoxConfigEntry
-from .const import DUCOBOX_NODE_TYPE_BOX
-from .coordinator import DucoBoxCoordinator
+from .coordinator import DucoBoxConfigEntry, DucoBoxCoordinator
+from .descriptions import DucoBoxButtonEntityDescription
 from .entity import DucoBoxEntity
 from .models import DucoBoxNode
 
 
-@dataclass(frozen=True, kw_only=True)
-class DucoBoxButtonEntityDescription(ButtonEntityDescription):
-    """Describes a DucoBox button entity."""
-
-    press_fn: Callable[[DucoBoxCoordinator, int], Awaitable[None]]
-
-
-IDENTIFY_BUTTON = DucoBoxButtonEntityDescription(
-    key="identify",
-    translation_key="identify",
-    entity_category=EntityCategory.DIAGNOSTIC,
-    device_class=ButtonDeviceClass.IDENTIFY,
-    press_fn=lambda coordinator, node_id: coordinator.async_set_identify(node_id),
-)
-
-BUTTONS_BY_NODE_TYPE: dict[str, list[DucoBoxButtonEntityDescription]] = {
-    DUCOBOX_NODE_TYPE_BOX: [IDENTIFY_BUTTON],
-}
-
-
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001
     entry: DucoBoxConfigEntry,
@@ -51,8 +22,7 @@ async def async_setup_entry(
 
     async_add_entities(
         DucoBoxButtonEntity(coordinator, node, button_description)
-        for node in coordinator.data.values()
-        for button_description in BUTTONS_BY_NODE_TYPE.get(node.node_type, [])
+        for node, button_description in entry.runtime_data.entity_index.buttons
     )
 
 
@@ -0,0 +1,99 @@
+"""Persisted capabilities of Duco Connectivity Boards."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .api import BOX_PARAMETERS, NODE_PARAMETERS, DucoConnectivityBoardApi
+from .const import DOMAIN
+from .models import DucoBoxCapabilities, DucoBoxInfo
+
+STORAGE_KEY = f"{DOMAIN}.capabilities"
+STORAGE_VERSION = 1
+
+# The probed capabilities depend on the requested parameters, so a change of
+# the parameter sets probes every board again.
+_PARAMETERS_HASH = hashlib.sha256(
+    repr(
+        (
+            sorted("/".join(param.keys) for param in BOX_PARAMETERS),
+            sorted(NODE_PARAMETERS),
+        )
+    ).encode()
+).hexdigest()[:12]
+
+_DATA_CAPABILITY_STORE: HassKey[DucoBoxCapabilityStore] = HassKey(
+    f"{DOMAIN}_capability_store"
+)
+
+
+class DucoBoxCapabilityStore:
+    """
+    Store the capabilities probed from every board per serial and firmware.
+
+    A board is only probed once per firmware version, so later setups shape
+    their requests without probing, and a firmware update or a change of the
+    polled parameters probes it again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the capability store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._data: dict[str, dict[str, Any]] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_get(
+        self, api: DucoConnectivityBoardApi, box_info: DucoBoxInfo
+    ) -> DucoBoxCapabilities | None:
+        """
+        Get the stored capabilities of a board, probing it if they are unknown.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            ClientError: If the HTTP request fails.
+
+        """
+        async with self._lock:
+            if self._data is None:
+                self._data = await self._store.async_load() or {}
+
+            key = (
+                f"{box_info.serial_number}/"
+                f"{box_info.firmware_version or 'unknown'}/{_PARAMETERS_HASH}"
+            )
+            if (stored := self._data.get(key)) is not None:
+                return DucoBoxCapabilities(
+                    node_parameter_filter=stored["node_parameter_filter"],
+                    box_parameters=tuple(stored["box_parameters"]),
+                )
+
+            capabilities = await api.async_probe_capabilities()
+            if capabilities is None:
+                return None
+
+            # The capabilities of earlier firmware or parameters are obsolete.
+            self._data = {
+                stored_key: stored
+                for stored_key, stored in self._data.items()
+                if not stored_key.startswith(f"{box_info.serial_number}/")
+            }
+            self._data[key] = asdict(capabilities)
+            await self._store.async_save(self._data)
+            return capabilities
+
+
+@callback
+def async_get_capability_store(hass: HomeAssistant) -> DucoBoxCapabilityStore:
+    """Get the shared capability store."""
+    if (store := hass.data.get(_DATA_CAPABILITY_STORE)) is None:
+        store = hass.data[_DATA_CAPABILITY_STORE] = DucoBoxCapabilityStore(hass)
+    return store
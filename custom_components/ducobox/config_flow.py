@@ -2,28 +2,79 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import suppress
+from ipaddress import IPv4Network
 from typing import Any
 
 import voluptuous as vol
 from aiohttp import ClientError
 from homeassistant.components import zeroconf
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import UnknownFlow
 
-from .api import DucoConnectivityBoardApi
-from .const import DOMAIN
+from .api import DucoConnectivityBoardConnectionError
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AIR_QUALITY_DEADBAND,
+    CONF_ARCHIVE,
+    CONF_BLOCKING_BUDGET,
+    CONF_CO2_DEADBAND,
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_DEADBAND_FILTERING,
+    CONF_EXECUTOR_DECODE_THRESHOLD,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MEMORY_ACCOUNTING,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_TEMPERATURE_DEADBAND,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_AIR_QUALITY_DEADBAND,
+    DEFAULT_ARCHIVE,
+    DEFAULT_BLOCKING_BUDGET,
+    DEFAULT_CO2_DEADBAND,
+    DEFAULT_COUNTDOWN_INTERVAL,
+    DEFAULT_DEADBAND_FILTERING,
+    DEFAULT_EXECUTOR_DECODE_THRESHOLD,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_MEMORY_ACCOUNTING,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DOMAIN,
+)
+from .discovery import async_get_probe_cache, async_scan_network
 from .models import DucoBoxInfo
+from .transport import async_create_api
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema(
+CONF_NETWORK = "network"
+
+MAX_SCAN_HOSTS = 1024
+
+STEP_MANUAL_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
     }
 )
 
+STEP_SCAN_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NETWORK): str,
+    }
+)
+
 
 class DucoBoxConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for DucoBox."""
@@ -34,14 +85,32 @@ class DucoBoxConfigFlow(ConfigFlow, domain=DOMAIN):
     _zeroconf_discovered_host: str
     _zeroconf_discovered_model: str
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._scan_network: IPv4Network | None = None
+        self._scan_task: asyncio.Task[None] | None = None
+        self._scanned_boards: dict[str, DucoBoxInfo] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> DucoBoxOptionsFlow:  # noqa: ARG004
+        """Get the options flow for this handler."""
+        return DucoBoxOptionsFlow()
+
     async def async_step_zeroconf(
         self, info: zeroconf.ZeroconfServiceInfo
     ) -> ConfigFlowResult:
         """Handle the config flow initiated by Zeroconf."""
         host = info.host
 
+        # Boards re-announce themselves often, so skip probing known hosts and
+        # reuse recent probes of the same announcement.
+        self._async_abort_entries_match({CONF_HOST: host})
+
         try:
-            device_info = await self._async_get_device_info(host)
+            device_info = await async_get_probe_cache(self.hass).async_probe(
+                host, info.properties
+            )
         except ClientError:
             _LOGGER.exception(
                 "Failed to connect to Duco Connectivity Board at %s", host
@@ -75,17 +144,25 @@ class DucoBoxConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
     async def async_step_user(
-        self, info: dict[str, Any] | None = None
+        self,
+        info: dict[str, Any] | None = None,  # noqa: ARG002
     ) -> ConfigFlowResult:
         """Handle the config flow initiated by the user."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
+        self, info: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the config flow step to enter the host manually."""
         errors: dict[str, str] = {}
 
         if info is not None:
             host = info[CONF_HOST]
+            data = {CONF_HOST: host}
 
             try:
-                device_info = await self._async_get_device_info(host)
-            except ClientError:
+                device_info = await self._async_get_device_info(data)
+            except (ClientError, DucoConnectivityBoardConnectionError):
                 _LOGGER.exception(
                     "Failed to connect to Duco Connectivity Board at %s", host
                 )
@@ -96,18 +173,228 @@ class DucoBoxConfigFlow(ConfigFlow, domain=DOMAIN):
                 )
                 errors["base"] = "unknown"
             else:
-                await self.async_set_unique_id(device_info.serial_number)
-                self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+                return await self._async_create_board_entry(data, device_info)
 
-                return self.async_create_entry(
-                    title=f"DucoBox {device_info.model}", data={CONF_HOST: host}
-                )
+        return self.async_show_form(
+            step_id="manual",
+            data_schema=STEP_MANUAL_DATA_SCHEMA,
+            errors=errors,
+        )
+
+    async def async_step_scan(
+        self, info: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the config flow step to choose the network to scan."""
+        errors: dict[str, str] = {}
+
+        if info is not None:
+            try:
+                network = IPv4Network(info[CONF_NETWORK], strict=False)
+            except ValueError:
+                errors["base"] = "invalid_network"
+            else:
+                if network.num_addresses > MAX_SCAN_HOSTS:
+                    errors["base"] = "network_too_large"
+                else:
+                    self._scan_network = network
+                    return await self.async_step_scan_progress()
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="scan", data_schema=STEP_SCAN_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_scan_progress(
+        self,
+        info: dict[str, Any] | None = None,  # noqa: ARG002
+    ) -> ConfigFlowResult:
+        """Handle the config flow step that scans the network."""
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_task(
+                self._async_scan(), f"{DOMAIN} scan {self._scan_network}"
+            )
+
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan_progress",
+                progress_action="scan",
+                progress_task=self._scan_task,
+                description_placeholders={
+                    "network": str(self._scan_network),
+                    "boards": ", ".join(self._scanned_boards) or "-",
+                },
+            )
+
+        self._scan_task = None
+        return self.async_show_progress_done(next_step_id="scan_results")
+
+    async def async_step_scan_results(
+        self, info: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the config flow step to choose a board found by the scan."""
+        if info is not None:
+            host = info[CONF_HOST]
+            return await self._async_create_board_entry(
+                {CONF_HOST: host}, self._scanned_boards[host]
+            )
+
+        configured_serial_numbers = self._async_current_ids(include_ignore=False)
+        boards = {
+            host: f"DucoBox {device_info.model} ({host})"
+            for host, device_info in self._scanned_boards.items()
+            if device_info.serial_number not in configured_serial_numbers
+        }
+        if not boards:
+            return self.async_abort(reason="no_devices_found")
+
+        return self.async_show_form(
+            step_id="scan_results",
+            data_schema=vol.Schema({vol.Required(CONF_HOST): vol.In(boards)}),
+        )
+
+    @callback
+    def async_remove(self) -> None:
+        """Cancel the network scan when the flow is removed."""
+        if self._scan_task is not None:
+            self._scan_task.cancel()
+
+    async def _async_scan(self) -> None:
+        if self._scan_network is None:
+            return
+
+        hosts = sum(1 for _ in self._scan_network.hosts())
+        scanned = 0
+        async for host, device_info in async_scan_network(
+            self.hass, self._scan_network
+        ):
+            scanned += 1
+            # Only report whole percents, so scanning a large network does not
+            # fire an event for every probed host.
+            if scanned * 100 // hosts != (scanned - 1) * 100 // hosts:
+                self.async_update_progress(scanned / hosts)
+            if device_info is not None:
+                _LOGGER.debug(
+                    "Found Duco Connectivity Board %s at %s",
+                    device_info.serial_number,
+                    host,
+                )
+                self._scanned_boards[host] = device_info
+                # Show the boards found so far while the scan continues, once the
+                # progress is shown.
+                if self.cur_step and self.cur_step["step_id"] == "scan_progress":
+                    with suppress(UnknownFlow):
+                        await self.hass.config_entries.flow.async_configure(
+                            self.flow_id
+                        )
+
+    async def _async_create_board_entry(
+        self, data: dict[str, Any], device_info: DucoBoxInfo
+    ) -> ConfigFlowResult:
+        await self.async_set_unique_id(device_info.serial_number)
+        self._abort_if_unique_id_configured(updates=data)
+
+        return self.async_create_entry(title=f"DucoBox {device_info.model}", data=data)
+
+    async def _async_get_device_info(self, data: dict[str, Any]) -> DucoBoxInfo:
+        api = async_create_api(self.hass, data)
+        try:
+            return await api.async_get_box_info()
+        finally:
+            await api.async_close()
+
+
+class DucoBoxOptionsFlow(OptionsFlow):
+    """Handle an options flow for DucoBox."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the DucoBox options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_COUNTDOWN_INTERVAL,
+                    default=options.get(
+                        CONF_COUNTDOWN_INTERVAL, DEFAULT_COUNTDOWN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                vol.Required(
+                    CONF_BLOCKING_BUDGET,
+                    default=options.get(CONF_BLOCKING_BUDGET, DEFAULT_BLOCKING_BUDGET),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_EXECUTOR_DECODE_THRESHOLD,
+                    default=options.get(
+                        CONF_EXECUTOR_DECODE_THRESHOLD,
+                        DEFAULT_EXECUTOR_DECODE_THRESHOLD,
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_MEMORY_ACCOUNTING,
+                    default=options.get(
+                        CONF_MEMORY_ACCOUNTING, DEFAULT_MEMORY_ACCOUNTING
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_DEADBAND_FILTERING,
+                    default=options.get(
+                        CONF_DEADBAND_FILTERING, DEFAULT_DEADBAND_FILTERING
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_CO2_DEADBAND,
+                    default=options.get(CONF_CO2_DEADBAND, DEFAULT_CO2_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_HUMIDITY_DEADBAND,
+                    default=options.get(
+                        CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Required(
+                    CONF_AIR_QUALITY_DEADBAND,
+                    default=options.get(
+                        CONF_AIR_QUALITY_DEADBAND, DEFAULT_AIR_QUALITY_DEADBAND
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Required(
+                    CONF_TEMPERATURE_DEADBAND,
+                    default=options.get(
+                        CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_MIN_PUBLISH_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Required(
+                    CONF_HEARTBEAT_INTERVAL,
+                    default=options.get(
+                        CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Required(
+                    CONF_LONG_TERM_STATISTICS,
+                    default=options.get(
+                        CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_ARCHIVE,
+                    default=options.get(CONF_ARCHIVE, DEFAULT_ARCHIVE),
+                ): bool,
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(
+                        CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                    ),
+                ): bool,
+            }
         )
 
-    async def _async_get_device_info(self, host: str) -> DucoBoxInfo:
-        session = async_get_clientsession(self.hass)
-        api = DucoConnectivityBoardApi(host, session)
-        return await api.async_get_box_info()
+        return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -10,6 +10,59 @@ PLATFORMS: list[Platform] = [
     Platform.SENSOR,
 ]
 
+CONF_TRANSPORT = "transport"
+TRANSPORT_HTTP = "http"
+TRANSPORT_REPLAY = "replay"
+CONF_FIXTURE = "fixture"
+CONF_REPLAY_SPEED = "replay_speed"
+
+CONF_COUNTDOWN_INTERVAL = "countdown_interval"
+DEFAULT_COUNTDOWN_INTERVAL = 1  # seconds
+CONF_BLOCKING_BUDGET = "blocking_budget"
+DEFAULT_BLOCKING_BUDGET = 50  # milliseconds
+CONF_EXECUTOR_DECODE_THRESHOLD = "executor_decode_threshold"
+DEFAULT_EXECUTOR_DECODE_THRESHOLD = 512  # kibibytes
+CONF_MEMORY_ACCOUNTING = "memory_accounting"
+DEFAULT_MEMORY_ACCOUNTING = False
+CONF_DEADBAND_FILTERING = "deadband_filtering"
+DEFAULT_DEADBAND_FILTERING = False
+CONF_CO2_DEADBAND = "co2_deadband"
+DEFAULT_CO2_DEADBAND = 10  # ppm
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+DEFAULT_HUMIDITY_DEADBAND = 1  # percent
+CONF_AIR_QUALITY_DEADBAND = "air_quality_deadband"
+DEFAULT_AIR_QUALITY_DEADBAND = 1  # percent
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+DEFAULT_TEMPERATURE_DEADBAND = 0.2  # degrees Celsius
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+DEFAULT_MIN_PUBLISH_INTERVAL = 0  # seconds
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+DEFAULT_HEARTBEAT_INTERVAL = 900  # seconds
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+DEFAULT_LONG_TERM_STATISTICS = False
+CONF_ARCHIVE = "archive"
+DEFAULT_ARCHIVE = False
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = False
+
+# The defaults of the options, so options are compared by their effective value.
+DEFAULT_OPTIONS = {
+    CONF_COUNTDOWN_INTERVAL: DEFAULT_COUNTDOWN_INTERVAL,
+    CONF_BLOCKING_BUDGET: DEFAULT_BLOCKING_BUDGET,
+    CONF_EXECUTOR_DECODE_THRESHOLD: DEFAULT_EXECUTOR_DECODE_THRESHOLD,
+    CONF_MEMORY_ACCOUNTING: DEFAULT_MEMORY_ACCOUNTING,
+    CONF_DEADBAND_FILTERING: DEFAULT_DEADBAND_FILTERING,
+    CONF_CO2_DEADBAND: DEFAULT_CO2_DEADBAND,
+    CONF_HUMIDITY_DEADBAND: DEFAULT_HUMIDITY_DEADBAND,
+    CONF_AIR_QUALITY_DEADBAND: DEFAULT_AIR_QUALITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND: DEFAULT_TEMPERATURE_DEADBAND,
+    CONF_MIN_PUBLISH_INTERVAL: DEFAULT_MIN_PUBLISH_INTERVAL,
+    CONF_HEARTBEAT_INTERVAL: DEFAULT_HEARTBEAT_INTERVAL,
+    CONF_LONG_TERM_STATISTICS: DEFAULT_LONG_TERM_STATISTICS,
+    CONF_ARCHIVE: DEFAULT_ARCHIVE,
+    CONF_ADAPTIVE_POLLING: DEFAULT_ADAPTIVE_POLLING,
+}
+
 DUCOBOX_VENTILATION_MODES = [
     "AUTO",
     "MANU",
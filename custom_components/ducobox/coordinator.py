@@ -3,17 +3,31 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable, Mapping
+from contextlib import aclosing
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta
+from statistics import median
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 from aiohttp import ClientError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .aggregates import DucoBoxAggregates
 from .api import DucoConnectivityBoardApi, DucoConnectivityBoardApiError
-from .models import DucoBoxInfo, DucoBoxNode
+from .capabilities import async_get_capability_store
+from .models import DucoBoxCapabilities, DucoBoxInfo, DucoBoxNode
+from .scheduling import DucoBoxPollScheduler
+
+if TYPE_CHECKING:
+    from .archive import DucoBoxArchive
+    from .entity_index import DucoBoxEntityIndex
+    from .long_term_statistics import DucoBoxStatisticsBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,16 +41,85 @@ class DucoBoxRuntimeData:
 
     coordinator: DucoBoxCoordinator
     options_coordinator: DucoBoxOptionsCoordinator
+    entity_index: DucoBoxEntityIndex
+    applied_options: dict[str, Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxSnapshot:
+    """The data of an unloaded config entry, kept to set it up again quickly."""
+
+    data: Mapping[str, Any]
+    box_info: DucoBoxInfo
+    capabilities: DucoBoxCapabilities | None
+    nodes: dict[int, DucoBoxNode]
+    board_clock_offset: float | None
+    last_updated: datetime | None
+    options: dict[int, list[str]]
+    last_update_success: bool
+    # The statistics buffer, with the hour in progress, for the reloaded entry.
+    statistics: DucoBoxStatisticsBuffer | None
+    taken_at: float
+
+    @classmethod
+    def from_runtime_data(
+        cls, entry: ConfigEntry, runtime_data: DucoBoxRuntimeData
+    ) -> DucoBoxSnapshot:
+        """Take a snapshot of the coordinators of a config entry."""
+        coordinator = runtime_data.coordinator
+        return cls(
+            data=dict(entry.data),
+            box_info=coordinator.box_info,
+            capabilities=coordinator.api.capabilities,
+            nodes=coordinator.data,
+            board_clock_offset=coordinator.board_clock_offset,
+            last_updated=coordinator.last_updated,
+            options=runtime_data.options_coordinator.data,
+            last_update_success=coordinator.last_update_success,
+            statistics=coordinator.statistics,
+            taken_at=monotonic(),
+        )
+
+    def is_valid_for(self, entry: ConfigEntry) -> bool:
+        """Return True if the snapshot is recent enough to set up the entry."""
+        return (
+            self.last_update_success
+            and self.data == entry.data
+            and monotonic() - self.taken_at < UPDATE_INTERVAL.total_seconds()
+        )
 
 
 type DucoBoxConfigEntry = ConfigEntry[DucoBoxRuntimeData]
 
 
+def _estimate_board_clock_offset(
+    nodes: list[DucoBoxNode], received: float
+) -> float | None:
+    """
+    Estimate the offset between the board clock and the local clock.
+
+    The board reports both the end timestamp and the remaining time of a
+    ventilation state, so their difference is the board time at which the
+    response was rendered.
+    """
+    offsets = [
+        node.time_state_end - node.time_state_remain - received
+        for node in nodes
+        if node.time_state_end is not None
+        and node.time_state_end > 0
+        and node.time_state_remain is not None
+        and node.time_state_remain > 0
+    ]
+    return median(offsets) if offsets else None
+
+
 class DucoBoxCoordinator(DataUpdateCoordinator[dict[int, DucoBoxNode]]):
     """Class to manage fetching DucoBox data."""
 
     config_entry: ConfigEntry
     box_info: DucoBoxInfo
+    board_clock_offset: float | None = None
+    suppressed_writes: int = 0
 
     def __init__(
         self,
@@ -55,24 +138,127 @@ class DucoBoxCoordinator(DataUpdateCoordinator[dict[int, DucoBoxNode]]):
         )
         self.api = api
         self.config_entry = config_entry
+        self.aggregates = DucoBoxAggregates()
+        self.statistics: DucoBoxStatisticsBuffer | None = None
+        self.archive: DucoBoxArchive | None = None
+        self.scheduler = DucoBoxPollScheduler(
+            UPDATE_INTERVAL.total_seconds(), 2 * UPDATE_INTERVAL.total_seconds()
+        )
+        self.changed_nodes = 0
+        self.last_updated: datetime | None = None
+        # The values computed from every node, by value function, with the node
+        # they were computed from.
+        self._node_values: dict[
+            int, tuple[DucoBoxNode, dict[Callable[[DucoBoxNode], Any], Any]]
+        ] = {}
 
     async def async_setup(self) -> None:
-        """Set up the coordinator."""
+        """Set up the coordinator, shaping the requests for the board."""
         try:
             self.box_info = await self.api.async_get_box_info()
+            self.api.set_capabilities(
+                await async_get_capability_store(self.hass).async_get(
+                    self.api, self.box_info
+                )
+            )
         except (ClientError, DucoConnectivityBoardApiError) as err:
             msg = f"Failed to setup coordinator: {err}"
             raise UpdateFailed(msg) from err
 
+    @callback
+    def async_restore(self, snapshot: DucoBoxSnapshot) -> None:
+        """Set up the coordinator from a snapshot instead of the board."""
+        self.box_info = snapshot.box_info
+        self.api.set_capabilities(snapshot.capabilities)
+        self.board_clock_offset = snapshot.board_clock_offset
+        self.last_updated = snapshot.last_updated
+        self.aggregates.update(list(snapshot.nodes.values()))
+        self.async_set_updated_data(snapshot.nodes)
+
     async def _async_update_data(self) -> dict[int, DucoBoxNode]:
-        """Update the data."""
+        """
+        Update the data.
+
+        Every node is compared with its previous data as soon as it is received,
+        while the other nodes are still being transferred. An unchanged node
+        keeps its previous data, so only the data of changed nodes is replaced.
+        With adaptive polling, the next update is scheduled just after the
+        board is expected to update its values.
+        """
+        polled_at = monotonic()
+        previous = self.data or {}
+        data: dict[int, DucoBoxNode] = {}
+        changed: list[DucoBoxNode] = []
         try:
-            nodes = await self.api.async_get_nodes()
+            async with aclosing(self.api.async_iter_nodes()) as received:
+                async for node in received:
+                    with self.api.watchdog.measure("update"):
+                        previous_node = previous.get(node.node_id)
+                        if previous_node == node:
+                            data[node.node_id] = previous_node
+                        else:
+                            data[node.node_id] = node
+                            changed.append(node)
         except (ClientError, DucoConnectivityBoardApiError) as err:
             msg = f"Failed to update coordinator data: {err}"
             raise UpdateFailed(msg) from err
 
-        return {node.node_id: node for node in nodes}
+        self.changed_nodes = len(changed)
+        nodes = list(data.values())
+
+        with self.api.watchdog.measure("update"):
+            now = self.last_updated = dt_util.utcnow()
+            offset = _estimate_board_clock_offset(nodes, now.timestamp())
+            if offset is not None:
+                self.board_clock_offset = offset
+
+            removed = previous.keys() - data.keys()
+            self.aggregates.update(changed, removed)
+            if self.statistics is not None:
+                self.statistics.async_add(nodes, now)
+            if self.archive is not None:
+                self.archive.async_add(nodes, now)
+
+            self.scheduler.record(polled_at, previous, changed, removed)
+            if self.scheduler.adaptive:
+                self.update_interval = timedelta(
+                    seconds=self.scheduler.next_interval(monotonic())
+                )
+
+            return data
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data and check the event loop blocking budget."""
+        with self.api.watchdog.cycle(self.name):
+            await super()._async_refresh(*args, **kwargs)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, measuring the entity fan-out."""
+        if self.data is not None:
+            for node_id in self._node_values.keys() - self.data.keys():
+                del self._node_values[node_id]
+        with self.api.watchdog.measure("entities"):
+            super().async_update_listeners()
+
+    @callback
+    def async_get_node_value[T](
+        self, node: DucoBoxNode, value_fn: Callable[[DucoBoxNode], T]
+    ) -> T:
+        """
+        Return a value of a node, computed once per update of the node.
+
+        The entities of a node share the values of the value functions they
+        have in common, such as the ventilation state of its fan, select and
+        sensor, so every value is computed once for all of them.
+        """
+        cached = self._node_values.get(node.node_id)
+        if cached is None or cached[0] is not node:
+            cached = self._node_values[node.node_id] = (node, {})
+        values = cached[1]
+        if value_fn not in values:
+            values[value_fn] = value_fn(node)
+        return values[value_fn]
 
     async def async_set_ventilation_state(self, node_id: int, state: str) -> None:
         """Set the ventilation state."""
@@ -83,7 +269,7 @@ class DucoBoxCoordinator(DataUpdateCoordinator[dict[int, DucoBoxNode]]):
                 raise HomeAssistantError(msg)
 
             await self.async_request_refresh()
-        except ClientError as err:
+        except (ClientError, DucoConnectivityBoardApiError) as err:
             msg = f"Failed to set ventilation state on node {node_id} to {state}: {err}"
             raise HomeAssistantError(msg) from err
 
@@ -94,7 +280,7 @@ class DucoBoxCoordinator(DataUpdateCoordinator[dict[int, DucoBoxNode]]):
             if not success:
                 msg = f"Failed to set identify on node {node_id}"
                 raise HomeAssistantError(msg)
-        except ClientError as err:
+        except (ClientError, DucoConnectivityBoardApiError) as err:
             msg = f"Failed to set identify on node {node_id}: {err}"
             raise HomeAssistantError(msg) from err
 
@@ -122,7 +308,30 @@ class DucoBoxOptionsCoordinator(DataUpdateCoordinator[dict[int, list[str]]]):
     async def _async_update_data(self) -> dict[int, list[str]]:
         """Update the data."""
         try:
-            return await self.api.async_get_ventilation_state_options()
+            options = await self.api.async_get_ventilation_state_options()
         except (ClientError, DucoConnectivityBoardApiError) as err:
             msg = f"Failed to get ventilation state options: {err}"
             raise UpdateFailed(msg) from err
+
+        # Most nodes support the same ventilation states, so the nodes and
+        # their entities share one list per distinct set of options. The lists
+        # are assigned to the options of the entities, and never modified.
+        shared: dict[tuple[str, ...], list[str]] = {}
+        data: dict[int, list[str]] = {}
+        for node_id, node_options in options.items():
+            key = tuple(node_options)
+            if key not in shared:
+                shared[key] = list(key)
+            data[node_id] = shared[key]
+        return data
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data and check the event loop blocking budget."""
+        with self.api.watchdog.cycle(self.name):
+            await super()._async_refresh(*args, **kwargs)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, measuring the entity fan-out."""
+        with self.api.watchdog.measure("entities"):
+            super().async_update_listeners()
@@ -0,0 +1,409 @@
+"""
+Entity descriptions of the DucoBox integration.
+
+The descriptions are kept apart from the platforms, so the entity index can
+pair the nodes with them without importing the entity platforms.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.components.button import ButtonDeviceClass, ButtonEntityDescription
+from homeassistant.components.fan import FanEntityDescription
+from homeassistant.components.select import SelectEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    CONCENTRATION_PARTS_PER_MILLION,
+    PERCENTAGE,
+    REVOLUTIONS_PER_MINUTE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.helpers.typing import StateType
+from homeassistant.util.dt import UTC
+
+from .const import (
+    CONF_AIR_QUALITY_DEADBAND,
+    CONF_CO2_DEADBAND,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    DEFAULT_AIR_QUALITY_DEADBAND,
+    DEFAULT_CO2_DEADBAND,
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DUCOBOX_NODE_TYPE_BOX,
+    DUCOBOX_NODE_TYPE_BSRH,
+    DUCOBOX_NODE_TYPE_UCBAT,
+    DUCOBOX_NODE_TYPE_UCCO2,
+    DUCOBOX_NODE_TYPE_VLV,
+    DUCOBOX_NODE_TYPE_VLVCO2,
+    DUCOBOX_NODE_TYPE_VLVCO2RH,
+    DUCOBOX_NODE_TYPE_VLVRH,
+    DUCOBOX_VENTILATION_MODES,
+)
+
+if TYPE_CHECKING:
+    from .aggregates import DucoBoxAggregates
+    from .coordinator import DucoBoxCoordinator, DucoBoxOptionsCoordinator
+    from .models import DucoBoxNode
+
+
+def ventilation_state(node: DucoBoxNode) -> str | None:
+    """Return the ventilation state of a node, shown by several of its entities."""
+    return node.state
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxButtonEntityDescription(ButtonEntityDescription):
+    """Describes a DucoBox button entity."""
+
+    press_fn: Callable[[DucoBoxCoordinator, int], Awaitable[None]]
+
+
+IDENTIFY_BUTTON = DucoBoxButtonEntityDescription(
+    key="identify",
+    translation_key="identify",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    device_class=ButtonDeviceClass.IDENTIFY,
+    press_fn=lambda coordinator, node_id: coordinator.async_set_identify(node_id),
+)
+
+BUTTONS_BY_NODE_TYPE: dict[str, list[DucoBoxButtonEntityDescription]] = {
+    DUCOBOX_NODE_TYPE_BOX: [IDENTIFY_BUTTON],
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxFanEntityDescription(FanEntityDescription):
+    """Describes a DucoBox fan entity."""
+
+    value_fn: Callable[[DucoBoxNode], str | None]
+    options_fn: Callable[[DucoBoxOptionsCoordinator, int], list[str]]
+    set_fn: Callable[[DucoBoxCoordinator, int, str], Awaitable[None]]
+
+
+VENTILATION_FAN = DucoBoxFanEntityDescription(
+    key="ventilation",
+    translation_key="ventilation",
+    value_fn=ventilation_state,
+    options_fn=lambda coordinator, node_id: coordinator.data.get(node_id, []),
+    set_fn=lambda coordinator, node_id, state: coordinator.async_set_ventilation_state(
+        node_id, state
+    ),
+)
+
+FANS_BY_NODE_TYPE: dict[str, list[DucoBoxFanEntityDescription]] = {
+    DUCOBOX_NODE_TYPE_BOX: [VENTILATION_FAN],
+    DUCOBOX_NODE_TYPE_VLV: [VENTILATION_FAN],
+    DUCOBOX_NODE_TYPE_VLVCO2: [VENTILATION_FAN],
+    DUCOBOX_NODE_TYPE_VLVCO2RH: [VENTILATION_FAN],
+    DUCOBOX_NODE_TYPE_VLVRH: [VENTILATION_FAN],
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxSelectEntityDescription(SelectEntityDescription):
+    """Describes a DucoBox select entity."""
+
+    value_fn: Callable[[DucoBoxNode], str | None]
+    options_fn: Callable[[DucoBoxOptionsCoordinator, int], list[str]]
+    select_fn: Callable[[DucoBoxCoordinator, int, str], Awaitable[None]]
+
+
+VENTILATION_STATE = DucoBoxSelectEntityDescription(
+    key="ventilation_state",
+    translation_key="ventilation_state",
+    value_fn=ventilation_state,
+    options_fn=lambda coordinator, node_id: coordinator.data.get(node_id, []),
+    select_fn=lambda coordinator, node_id, option: (
+        coordinator.async_set_ventilation_state(node_id, option)
+    ),
+)
+
+SELECTS_BY_NODE_TYPE: dict[str, list[DucoBoxSelectEntityDescription]] = {
+    DUCOBOX_NODE_TYPE_BOX: [VENTILATION_STATE],
+    DUCOBOX_NODE_TYPE_VLV: [VENTILATION_STATE],
+    DUCOBOX_NODE_TYPE_VLVCO2: [VENTILATION_STATE],
+    DUCOBOX_NODE_TYPE_VLVCO2RH: [VENTILATION_STATE],
+    DUCOBOX_NODE_TYPE_VLVRH: [VENTILATION_STATE],
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxFilteredSensorEntityDescription(SensorEntityDescription):
+    """Describes a DucoBox sensor entity whose state writes can be filtered."""
+
+    # The option with the deadband of the measurement, and its default.
+    deadband: tuple[str, float] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxSensorEntityDescription(DucoBoxFilteredSensorEntityDescription):
+    """Describes a DucoBox sensor entity."""
+
+    value_fn: Callable[[DucoBoxNode], StateType | datetime]
+    options_fn: Callable[[DucoBoxOptionsCoordinator, int], list[str]] | None = None
+    countdown_end_fn: Callable[[DucoBoxNode], int | None] | None = None
+    exists_fn: Callable[[DucoBoxNode], bool] = lambda _: True
+
+
+VENTILATION_SENSORS: list[DucoBoxSensorEntityDescription] = [
+    DucoBoxSensorEntityDescription(
+        key="time_state_remain",
+        translation_key="time_state_remain",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        suggested_display_precision=0,
+        value_fn=lambda data: (
+            value
+            if (value := data.time_state_remain) is not None and value > 0
+            else None
+        ),
+        countdown_end_fn=lambda data: (
+            value if (value := data.time_state_end) is not None and value > 0 else None
+        ),
+    ),
+    DucoBoxSensorEntityDescription(
+        key="time_state_end",
+        translation_key="time_state_end",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda data: (
+            datetime.fromtimestamp(value, tz=UTC)
+            if (value := data.time_state_end) is not None and value > 0
+            else None
+        ),
+    ),
+    DucoBoxSensorEntityDescription(
+        key="mode",
+        translation_key="mode",
+        device_class=SensorDeviceClass.ENUM,
+        options=DUCOBOX_VENTILATION_MODES,
+        value_fn=lambda data: data.mode,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="state",
+        translation_key="state",
+        device_class=SensorDeviceClass.ENUM,
+        options_fn=lambda coordinator, node_id: coordinator.data.get(node_id, []),
+        value_fn=ventilation_state,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="flow_lvl_tgt",
+        translation_key="flow_lvl_tgt",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.flow_lvl_tgt,
+    ),
+]
+
+CO2_SENSORS: list[DucoBoxSensorEntityDescription] = [
+    DucoBoxSensorEntityDescription(
+        key="co2",
+        translation_key="co2",
+        native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
+        device_class=SensorDeviceClass.CO2,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_CO2_DEADBAND, DEFAULT_CO2_DEADBAND),
+        value_fn=lambda data: data.co2,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="iaq_co2",
+        translation_key="iaq_co2",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_AIR_QUALITY_DEADBAND, DEFAULT_AIR_QUALITY_DEADBAND),
+        value_fn=lambda data: data.iaq_co2,
+    ),
+]
+
+RH_SENSORS: list[DucoBoxSensorEntityDescription] = [
+    DucoBoxSensorEntityDescription(
+        key="rh",
+        translation_key="rh",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND),
+        value_fn=lambda data: data.rh,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="iaq_rh",
+        translation_key="iaq_rh",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_AIR_QUALITY_DEADBAND, DEFAULT_AIR_QUALITY_DEADBAND),
+        value_fn=lambda data: data.iaq_rh,
+    ),
+]
+
+BOX_SENSORS: list[DucoBoxSensorEntityDescription] = [
+    DucoBoxSensorEntityDescription(
+        key="time_filter_remain",
+        translation_key="time_filter_remain",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        device_class=SensorDeviceClass.DURATION,
+        exists_fn=lambda data: data.time_filter_remain is not None,
+        value_fn=lambda data: data.time_filter_remain,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="temp_oda",
+        translation_key="temp_oda",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+        exists_fn=lambda data: data.temp_oda is not None,
+        value_fn=lambda data: data.temp_oda,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="temp_sup",
+        translation_key="temp_sup",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+        exists_fn=lambda data: data.temp_sup is not None,
+        value_fn=lambda data: data.temp_sup,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="temp_eta",
+        translation_key="temp_eta",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+        exists_fn=lambda data: data.temp_eta is not None,
+        value_fn=lambda data: data.temp_eta,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="temp_eha",
+        translation_key="temp_eha",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+        exists_fn=lambda data: data.temp_eha is not None,
+        value_fn=lambda data: data.temp_eha,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="speed_sup",
+        translation_key="speed_sup",
+        native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
+        state_class=SensorStateClass.MEASUREMENT,
+        exists_fn=lambda data: data.speed_sup is not None,
+        value_fn=lambda data: data.speed_sup,
+    ),
+    DucoBoxSensorEntityDescription(
+        key="speed_eha",
+        translation_key="speed_eha",
+        native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
+        state_class=SensorStateClass.MEASUREMENT,
+        exists_fn=lambda data: data.speed_eha is not None,
+        value_fn=lambda data: data.speed_eha,
+    ),
+]
+
+NETWORKTYPE_SENSORS: list[DucoBoxSensorEntityDescription] = [
+    DucoBoxSensorEntityDescription(
+        key="network_type",
+        translation_key="network_type",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.network_type,
+    )
+]
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxAggregateSensorEntityDescription(DucoBoxFilteredSensorEntityDescription):
+    """Describes a DucoBox whole-house aggregate sensor entity."""
+
+    field: str
+    value_fn: Callable[[DucoBoxAggregates], StateType]
+
+
+AGGREGATE_SENSORS: list[DucoBoxAggregateSensorEntityDescription] = [
+    DucoBoxAggregateSensorEntityDescription(
+        key="max_co2",
+        translation_key="max_co2",
+        native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
+        device_class=SensorDeviceClass.CO2,
+        state_class=SensorStateClass.MEASUREMENT,
+        deadband=(CONF_CO2_DEADBAND, DEFAULT_CO2_DEADBAND),
+        field="co2",
+        value_fn=lambda aggregates: aggregates.maximum("co2"),
+    ),
+    DucoBoxAggregateSensorEntityDescription(
+        key="mean_rh",
+        translation_key="mean_rh",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        deadband=(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND),
+        field="rh",
+        value_fn=lambda aggregates: aggregates.mean("rh"),
+    ),
+    DucoBoxAggregateSensorEntityDescription(
+        key="max_flow_lvl_tgt",
+        translation_key="max_flow_lvl_tgt",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        field="flow_lvl_tgt",
+        value_fn=lambda aggregates: aggregates.maximum("flow_lvl_tgt"),
+    ),
+]
+
+MEMORY_USAGE_SENSOR = SensorEntityDescription(
+    key="memory_usage",
+    translation_key="memory_usage",
+    native_unit_of_measurement=UnitOfInformation.BYTES,
+    suggested_unit_of_measurement=UnitOfInformation.KIBIBYTES,
+    device_class=SensorDeviceClass.DATA_SIZE,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+SUPPRESSED_WRITES_SENSOR = SensorEntityDescription(
+    key="suppressed_writes",
+    translation_key="suppressed_writes",
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+SENSORS_BY_NODE_TYPE: dict[str, list[DucoBoxSensorEntityDescription]] = {
+    DUCOBOX_NODE_TYPE_BOX: [
+        *VENTILATION_SENSORS,
+        *BOX_SENSORS,
+        *NETWORKTYPE_SENSORS,
+    ],
+    DUCOBOX_NODE_TYPE_BSRH: [*RH_SENSORS, *NETWORKTYPE_SENSORS],
+    DUCOBOX_NODE_TYPE_UCBAT: [*NETWORKTYPE_SENSORS],
+    DUCOBOX_NODE_TYPE_UCCO2: [*CO2_SENSORS, *NETWORKTYPE_SENSORS],
+    DUCOBOX_NODE_TYPE_VLV: [*VENTILATION_SENSORS, *NETWORKTYPE_SENSORS],
+    DUCOBOX_NODE_TYPE_VLVCO2: [
+        *VENTILATION_SENSORS,
+        *CO2_SENSORS,
+        *NETWORKTYPE_SENSORS,
+    ],
+    DUCOBOX_NODE_TYPE_VLVCO2RH: [
+        *VENTILATION_SENSORS,
+        *CO2_SENSORS,
+        *RH_SENSORS,
+        *NETWORKTYPE_SENSORS,
+    ],
+    DUCOBOX_NODE_TYPE_VLVRH: [
+        *VENTILATION_SENSORS,
+        *RH_SENSORS,
+        *NETWORKTYPE_SENSORS,
+    ],
+}
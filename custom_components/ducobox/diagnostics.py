@@ -0,0 +1,61 @@
+"""Diagnostics support for the DucoBox integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_MEMORY_ACCOUNTING, DEFAULT_MEMORY_ACCOUNTING
+from .coordinator import DucoBoxConfigEntry
+from .memory import async_get_memory_report
+
+TO_REDACT = {CONF_HOST, "serial_number", "mac_address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: DucoBoxConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    options_coordinator = entry.runtime_data.options_coordinator
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "box_info": async_redact_data(asdict(coordinator.box_info), TO_REDACT),
+        "capabilities": (
+            asdict(capabilities)
+            if (capabilities := coordinator.api.capabilities) is not None
+            else None
+        ),
+        "nodes": [asdict(node) for node in coordinator.data.values()],
+        "ventilation_state_options": options_coordinator.data,
+        "aggregates": coordinator.aggregates.as_dict(),
+        "suppressed_writes": coordinator.suppressed_writes,
+        "changed_nodes": coordinator.changed_nodes,
+        "polling": {
+            **coordinator.scheduler.as_dict(),
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval is not None
+                else None
+            ),
+        },
+        "last_cycle_blocking_ms": {
+            stage: elapsed * 1000
+            for stage, elapsed in coordinator.api.watchdog.last_cycles.get(
+                coordinator.name, {}
+            ).items()
+        },
+    }
+
+    if entry.options.get(CONF_MEMORY_ACCOUNTING, DEFAULT_MEMORY_ACCOUNTING):
+        diagnostics["memory_bytes"] = await async_get_memory_report(hass, entry)
+
+    return diagnostics
@@ -0,0 +1,129 @@
+"""Discovery helpers for the DucoBox integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from ipaddress import IPv4Network
+from time import monotonic
+from typing import Any
+
+from aiohttp import ClientError, ClientTimeout
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.hass_dict import HassKey
+
+from .api import (
+    DucoBoxHttpTransport,
+    DucoConnectivityBoardApi,
+    DucoConnectivityBoardApiError,
+)
+from .const import DOMAIN
+from .models import DucoBoxInfo
+
+PROBE_CACHE_TTL = 300  # seconds
+
+SCAN_CONCURRENCY = 64
+SCAN_TIMEOUT = ClientTimeout(total=2, sock_connect=1)
+
+_DATA_PROBE_CACHE: HassKey[DucoBoxProbeCache] = HassKey(f"{DOMAIN}_probe_cache")
+
+type _ProbeKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+class DucoBoxProbeCache:
+    """
+    Cache the box information probed from discovered boards.
+
+    Results are keyed by host and the announced properties, so a board that
+    re-announces itself is not probed again while a changed announcement is.
+    Concurrent probes of the same host share a single request.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the probe cache."""
+        self._hass = hass
+        self._results: dict[_ProbeKey, tuple[float, DucoBoxInfo]] = {}
+        self._pending: dict[str, asyncio.Task[DucoBoxInfo]] = {}
+
+    async def async_probe(self, host: str, properties: dict[str, Any]) -> DucoBoxInfo:
+        """
+        Get the box information of a discovered board.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the API returns unexpected data.
+            ClientError: If the HTTP request fails.
+
+        """
+        key = (host, tuple(sorted(properties.items())))
+        now = monotonic()
+
+        self._results = {
+            cached_key: result
+            for cached_key, result in self._results.items()
+            if now - result[0] < PROBE_CACHE_TTL
+        }
+        if (result := self._results.get(key)) is not None:
+            return result[1]
+
+        if (task := self._pending.get(host)) is None:
+            task = self._hass.async_create_task(
+                self._async_get_box_info(host), f"{DOMAIN} probe {host}"
+            )
+            self._pending[host] = task
+            task.add_done_callback(lambda _: self._pending.pop(host, None))
+
+        box_info = await asyncio.shield(task)
+        self._results[key] = (monotonic(), box_info)
+        return box_info
+
+    async def _async_get_box_info(self, host: str) -> DucoBoxInfo:
+        session = async_get_clientsession(self._hass)
+        api = DucoConnectivityBoardApi(DucoBoxHttpTransport(host, session))
+        return await api.async_get_box_info()
+
+
+@callback
+def async_get_probe_cache(hass: HomeAssistant) -> DucoBoxProbeCache:
+    """Get the shared probe cache."""
+    if (cache := hass.data.get(_DATA_PROBE_CACHE)) is None:
+        cache = hass.data[_DATA_PROBE_CACHE] = DucoBoxProbeCache(hass)
+    return cache
+
+
+async def async_scan_network(
+    hass: HomeAssistant, network: IPv4Network
+) -> AsyncIterator[tuple[str, DucoBoxInfo | None]]:
+    """
+    Probe every host of a network for a Duco Connectivity Board.
+
+    Hosts are probed with bounded concurrency and short timeouts, and the
+    results are yielded as soon as each probe completes, with None for hosts
+    that are not a Connectivity Board.
+    """
+    session = async_get_clientsession(hass)
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+    async def _async_probe(host: str) -> tuple[str, DucoBoxInfo | None]:
+        api = DucoConnectivityBoardApi(
+            DucoBoxHttpTransport(host, session, timeout=SCAN_TIMEOUT)
+        )
+        async with semaphore:
+            try:
+                return host, await api.async_get_box_info()
+            except (
+                ClientError,
+                TimeoutError,
+                ValueError,
+                DucoConnectivityBoardApiError,
+            ):
+                return host, None
+
+    probes = [asyncio.create_task(_async_probe(str(host))) for host in network.hosts()]
+    try:
+        for probe in asyncio.as_completed(probes):
+            yield await probe
+    finally:
+        # Stop probing when the scan is cancelled or not consumed to the end.
+        for probe in probes:
+            probe.cancel()
@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 from homeassistant.const import CONF_HOST
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, DUCOBOX_NODE_TYPE_BOX
-from .coordinator import DucoBoxCoordinator
+from .coordinator import DucoBoxCoordinator, DucoBoxOptionsCoordinator
 from .models import DucoBoxNode
 
 
@@ -20,6 +21,7 @@ class DucoBoxEntity(CoordinatorEntity[DucoBoxCoordinator]):
         """Initialize DucoBox entity."""
         super().__init__(coordinator)
         self._node_id = node.node_id
+        self._node: DucoBoxNode | None = node
 
         box_info = coordinator.box_info
 
@@ -53,7 +55,80 @@ class DucoBoxEntity(CoordinatorEntity[DucoBoxCoordinator]):
             self._attr_device_info["serial_number"] = serial_number
             self._attr_device_info["connections"] = connections
 
+            if box_info.firmware_version is not None:
+                self._attr_device_info["sw_version"] = box_info.firmware_version
+
     @property
     def available(self) -> bool:
         """Return True if the node is still present in coordinator data."""
-        return super().available and self._node_id in self.coordinator.data
+        return super().available and self._node is not None
+
+    @callback
+    def _async_update_attrs(self, node: DucoBoxNode) -> None:
+        """
+        Compute the state attributes from the node.
+
+        Home Assistant reads the state properties several times per state
+        write, so they are computed once per update and read from the
+        attributes instead. Values are read with the node values of the
+        coordinator, so the entities of a node share them.
+        """
+
+    @callback
+    def _async_skip_write(self) -> bool:
+        """Return True if the updated state is not significant enough to write."""
+        return False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Compute the state attributes from the latest coordinator data."""
+        self._node = self.coordinator.data.get(self._node_id)
+        if self._node is not None:
+            self._async_update_attrs(self._node)
+        if self._async_skip_write():
+            self.coordinator.suppressed_writes += 1
+            return
+        super()._handle_coordinator_update()
+
+
+class DucoBoxOptionsEntity(DucoBoxEntity):
+    """Base class for DucoBox entities with options from the options coordinator."""
+
+    def __init__(
+        self,
+        coordinator: DucoBoxCoordinator,
+        options_coordinator: DucoBoxOptionsCoordinator | None,
+        node: DucoBoxNode,
+    ) -> None:
+        """
+        Initialize DucoBox options entity.
+
+        Args:
+            coordinator: The coordinator of the node data.
+            options_coordinator: The coordinator of the options, or None if
+                the options of the entity do not depend on it.
+            node: The node of the entity.
+
+        """
+        super().__init__(coordinator, node)
+        self._options_coordinator = options_coordinator
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to the options coordinator when the entity is added."""
+        await super().async_added_to_hass()
+        if self._options_coordinator is not None:
+            self.async_on_remove(
+                self._options_coordinator.async_add_listener(
+                    self._handle_options_coordinator_update
+                )
+            )
+
+    @callback
+    def _async_update_options(self) -> None:
+        """Compute the options from the options coordinator data."""
+
+    @callback
+    def _handle_options_coordinator_update(self) -> None:
+        """Compute the options from the latest options coordinator data."""
+        self._async_update_options()
+        self.async_write_ha_state()
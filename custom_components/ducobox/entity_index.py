@@ -0,0 +1,74 @@
+"""Index of the entities of the DucoBox integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+
+from homeassistant.const import Platform
+
+from .const import PLATFORMS
+from .descriptions import (
+    BUTTONS_BY_NODE_TYPE,
+    FANS_BY_NODE_TYPE,
+    SELECTS_BY_NODE_TYPE,
+    SENSORS_BY_NODE_TYPE,
+    DucoBoxButtonEntityDescription,
+    DucoBoxFanEntityDescription,
+    DucoBoxSelectEntityDescription,
+    DucoBoxSensorEntityDescription,
+)
+from .models import DucoBoxNode
+
+
+def _index_nodes[DescriptionT](
+    nodes: Sequence[DucoBoxNode],
+    descriptions_by_node_type: Mapping[str, Sequence[DescriptionT]],
+) -> list[tuple[DucoBoxNode, DescriptionT]]:
+    """Pair every node with the entity descriptions of its node type."""
+    return [
+        (node, description)
+        for node in nodes
+        for description in descriptions_by_node_type.get(node.node_type, ())
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class DucoBoxEntityIndex:
+    """
+    The nodes and entity descriptions of a config entry, per platform.
+
+    The index is built once from the first node snapshot, so only the platforms
+    with entities are set up, and every platform gets its entities ready-made.
+    """
+
+    buttons: list[tuple[DucoBoxNode, DucoBoxButtonEntityDescription]]
+    fans: list[tuple[DucoBoxNode, DucoBoxFanEntityDescription]]
+    selects: list[tuple[DucoBoxNode, DucoBoxSelectEntityDescription]]
+    sensors: list[tuple[DucoBoxNode, DucoBoxSensorEntityDescription]]
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[DucoBoxNode]) -> DucoBoxEntityIndex:
+        """Build the index from a node snapshot."""
+        nodes = list(nodes)
+        return cls(
+            buttons=_index_nodes(nodes, BUTTONS_BY_NODE_TYPE),
+            fans=_index_nodes(nodes, FANS_BY_NODE_TYPE),
+            selects=_index_nodes(nodes, SELECTS_BY_NODE_TYPE),
+            sensors=[
+                (node, description)
+                for node, description in _index_nodes(nodes, SENSORS_BY_NODE_TYPE)
+                if description.exists_fn(node)
+            ],
+        )
+
+    @property
+    def platforms(self) -> list[Platform]:
+        """Return the platforms with at least one entity."""
+        entities_by_platform = {
+            Platform.BUTTON: self.buttons,
+            Platform.FAN: self.fans,
+            Platform.SELECT: self.selects,
+            Platform.SENSOR: self.sensors,
+        }
+        return [platform for platform in PLATFORMS if entities_by_platform[platform]]
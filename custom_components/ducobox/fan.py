@@ -2,58 +2,20 @@
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
-
-from homeassistant.components.fan import (
-    FanEntity,
-    FanEntityDescription,
-    FanEntityFeature,
-)
-from homeassistant.core import HomeAssistant
+from homeassistant.components.fan import FanEntity, FanEntityFeature
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import DucoBoxConfigEntry
-from .const import (
-    DUCOBOX_NODE_TYPE_BOX,
-    DUCOBOX_NODE_TYPE_VLV,
-    DUCOBOX_NODE_TYPE_VLVCO2,
-    DUCOBOX_NODE_TYPE_VLVCO2RH,
-    DUCOBOX_NODE_TYPE_VLVRH,
+from .coordinator import (
+    DucoBoxConfigEntry,
+    DucoBoxCoordinator,
+    DucoBoxOptionsCoordinator,
 )
-from .coordinator import DucoBoxCoordinator, DucoBoxOptionsCoordinator
-from .entity import DucoBoxEntity
+from .descriptions import DucoBoxFanEntityDescription
+from .entity import DucoBoxOptionsEntity
 from .models import DucoBoxNode
 
 
-@dataclass(frozen=True, kw_only=True)
-class DucoBoxFanEntityDescription(FanEntityDescription):
-    """Describes a DucoBox fan entity."""
-
-    value_fn: Callable[[DucoBoxNode], str | None]
-    options_fn: Callable[[DucoBoxOptionsCoordinator, int], list[str]]
-    set_fn: Callable[[DucoBoxCoordinator, int, str], Awaitable[None]]
-
-
-VENTILATION_FAN = DucoBoxFanEntityDescription(
-    key="ventilation",
-    translation_key="ventilation",
-    value_fn=lambda data: data.state,
-    options_fn=lambda coordinator, node_id: coordinator.data.get(node_id, []),
-    set_fn=lambda coordinator, node_id, state: coordinator.async_set_ventilation_state(
-        node_id, state
-    ),
-)
-
-FANS_BY_NODE_TYPE: dict[str, list[DucoBoxFanEntityDescription]] = {
-    DUCOBOX_NODE_TYPE_BOX: [VENTILATION_FAN],
-    DUCOBOX_NODE_TYPE_VLV: [VENTILATION_FAN],
-    DUCOBOX_NODE_TYPE_VLVCO2: [VENTILATION_FAN],
-    DUCOBOX_NODE_TYPE_VLVCO2RH: [VENTILATION_FAN],
-    DUCOBOX_NODE_TYPE_VLVRH: [VENTILATION_FAN],
-}
-
-
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001
     entry: DucoBoxConfigEntry,
@@ -65,12 +27,11 @@ async def async_setup_entry(
 
     async_add_entities(
         DucoBoxFanEntity(coordinator, options_coordinator, node, fan_description)
-        for node in coordinator.data.values()
-        for fan_description in FANS_BY_NODE_TYPE.get(node.node_type, [])
+        for node, fan_description in entry.runtime_data.entity_index.fans
     )
 
 
-class DucoBoxFanEntity(DucoBoxEntity, FanEntity):
+class DucoBoxFanEntity(DucoBoxOptionsEntity, FanEntity):
     """DucoBox fan entity."""
 
     entity_description: DucoBoxFanEntityDescription
@@ -84,32 +45,35 @@ class DucoBoxFanEntity(DucoBoxEntity, FanEntity):
         fan_description: DucoBoxFanEntityDescription,
     ) -> None:
         """Initialize DucoBox fan entity."""
-        super().__init__(coordinator, node)
+        super().__init__(coordinator, options_coordinator, node)
 
-        self._node_id = node.node_id
-        self._options_coordinator = options_coordinator
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{node.node_id}_{fan_description.key}"
         )
         self.entity_description = fan_description
 
+        self._async_update_attrs(node)
+        self._async_update_options()
+
     @property
     def is_on(self) -> bool:
         """Return true if the fan is on."""
         return True
 
-    @property
-    def preset_modes(self) -> list[str]:
-        """Return the list of available preset modes."""
-        return self.entity_description.options_fn(
-            self._options_coordinator, self._node_id
+    @callback
+    def _async_update_attrs(self, node: DucoBoxNode) -> None:
+        """Compute the current preset mode from the node."""
+        self._attr_preset_mode = self.coordinator.async_get_node_value(
+            node, self.entity_description.value_fn
         )
 
-    @property
-    def preset_mode(self) -> str | None:
-        """Return the current preset mode."""
-        node = self.coordinator.data[self._node_id]
-        return self.entity_description.value_fn(node)
+    @callback
+    def _async_update_options(self) -> None:
+        """Compute the available preset modes."""
+        if self._options_coordinator is not None:
+            self._attr_preset_modes = self.entity_description.options_fn(
+                self._options_coordinator, self._node_id
+            )
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
@@ -0,0 +1,147 @@
+"""
+Long-term statistics of the DucoBox integration.
+
+The samples are imported as hourly buckets, as the external statistics API of
+Home Assistant only takes rows that start on the hour. The 5-minute resolution
+is kept by the short-term statistics the recorder compiles from the states of
+the CO2 and relative humidity sensors, which have the measurement state class,
+and at poll resolution by the telemetry archive.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import CONCENTRATION_PARTS_PER_MILLION, PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .models import DucoBoxNode
+
+# The sampled node fields, with their name and unit.
+STATISTIC_FIELDS: dict[str, tuple[str, str]] = {
+    "co2": ("CO2", CONCENTRATION_PARTS_PER_MILLION),
+    "rh": ("Relative Humidity", PERCENTAGE),
+}
+
+type _StatisticKey = tuple[int, str]
+
+
+@dataclass(slots=True)
+class _HourBucket:
+    """The running mean, minimum and maximum of the samples of an hour."""
+
+    start: datetime
+    count: int
+    total: float
+    minimum: float
+    maximum: float
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def as_statistic(self) -> StatisticData:
+        return StatisticData(
+            start=self.start,
+            mean=self.total / self.count,
+            min=self.minimum,
+            max=self.maximum,
+        )
+
+
+class DucoBoxStatisticsBuffer:
+    """
+    Buffer node samples and import them as hourly long-term statistics.
+
+    Every update adds the sample of every node to a running mean, minimum and
+    maximum of the current hour, so samples whose state is not written still
+    count. The completed hours of all nodes are imported together, once per
+    hour, as external statistics. A reload carries the buffer over to the new
+    config entry, so the hour in progress is imported once with all samples.
+    """
+
+    def __init__(self, hass: HomeAssistant, serial_number: str) -> None:
+        """Initialize the statistics buffer."""
+        self._hass = hass
+        self.serial_number = serial_number
+        self._hour: datetime | None = None
+        self._buckets: dict[_StatisticKey, _HourBucket] = {}
+        self._pending: dict[_StatisticKey, list[StatisticData]] = defaultdict(list)
+        self._names: dict[_StatisticKey, str] = {}
+
+    @callback
+    def async_add(self, nodes: Iterable[DucoBoxNode], now: datetime) -> None:
+        """Add the samples of the nodes, importing the previous hour if complete."""
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        if self._hour is not None and hour != self._hour:
+            self._async_close_buckets(hour)
+            self.async_flush()
+        self._hour = hour
+
+        for node in nodes:
+            for field in STATISTIC_FIELDS:
+                if (value := getattr(node, field)) is None:
+                    continue
+
+                key = (node.node_id, field)
+                if (bucket := self._buckets.get(key)) is not None:
+                    bucket.add(value)
+                    continue
+
+                self._buckets[key] = _HourBucket(hour, 1, value, value, value)
+                if key not in self._names:
+                    self._names[key] = (
+                        f"{node.node_type} {node.node_id} {STATISTIC_FIELDS[field][0]}"
+                    )
+
+    @callback
+    def async_flush(self, *, partial: bool = False) -> None:
+        """
+        Import the buffered statistics of the completed hours.
+
+        Args:
+            partial: Import the statistics of the current hour so far as well,
+                when the buffer is discarded. A later import replaces them.
+
+        """
+        if partial:
+            self._async_close_buckets(None)
+
+        for key, statistics in self._pending.items():
+            node_id, field = key
+            _name, unit = STATISTIC_FIELDS[field]
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.ARITHMETIC,
+                has_sum=False,
+                name=self._names[key],
+                source=DOMAIN,
+                statistic_id=(
+                    f"{DOMAIN}:{slugify(f'{self.serial_number}_{node_id}_{field}')}"
+                ),
+                unit_of_measurement=unit,
+            )
+            async_add_external_statistics(self._hass, metadata, statistics)
+        self._pending.clear()
+
+    @callback
+    def _async_close_buckets(self, hour: datetime | None) -> None:
+        """Move the buckets of hours before the given hour, or all, to pending."""
+        for key, bucket in list(self._buckets.items()):
+            if hour is None or bucket.start < hour:
+                self._pending[key].append(bucket.as_statistic())
+                del self._buckets[key]
@@ -0,0 +1,185 @@
+"""Memory accounting for the DucoBox integration."""
+
+from __future__ import annotations
+
+import re
+import sys
+import tracemalloc
+from dataclasses import dataclass, is_dataclass
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from .const import DOMAIN
+from .coordinator import DucoBoxConfigEntry
+
+_TOP_ALLOCATIONS = 50
+
+
+def deep_getsizeof(obj: Any, seen: set[int]) -> int:
+    """
+    Return the size in bytes of an object and the data it holds.
+
+    Containers and dataclasses are followed, other objects are only counted
+    shallowly so references to Home Assistant internals are not accounted to
+    the integration. Objects in seen are not counted again. The containers are
+    copied before they are followed, so they may change while they are walked
+    outside the event loop.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(
+            deep_getsizeof(key, seen) + deep_getsizeof(value, seen)
+            for key, value in list(obj.items())
+        )
+    elif isinstance(obj, list | tuple | set | frozenset):
+        size += sum(deep_getsizeof(item, seen) for item in tuple(obj))
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        if hasattr(obj, "__dict__"):
+            size += deep_getsizeof(vars(obj), seen)
+        else:
+            size += sum(
+                deep_getsizeof(getattr(obj, slot), seen)
+                for slot in getattr(obj, "__slots__", ())
+                if hasattr(obj, slot)
+            )
+
+    return size
+
+
+@dataclass(frozen=True, slots=True)
+class _MemoryReferences:
+    """The objects held by a config entry, taken on the event loop."""
+
+    coordinator_name: str
+    nodes: dict[int, Any]
+    box_info: Any
+    options_coordinator_name: str
+    options: Any
+    # The entity ID, the entity and a copy of its attributes of every entity.
+    entities: list[tuple[str, Any, dict[str, Any]]]
+
+
+@callback
+def _async_get_references(
+    hass: HomeAssistant, entry: DucoBoxConfigEntry
+) -> _MemoryReferences:
+    """Take the references to the objects held by a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    options_coordinator = entry.runtime_data.options_coordinator
+    return _MemoryReferences(
+        coordinator_name=coordinator.name,
+        nodes=dict(coordinator.data or {}),
+        box_info=coordinator.box_info,
+        options_coordinator_name=options_coordinator.name,
+        options=options_coordinator.data,
+        entities=[
+            (entity.entity_id, entity, dict(vars(entity)))
+            for platform in async_get_platforms(hass, DOMAIN)
+            if platform.config_entry is not None
+            and platform.config_entry.entry_id == entry.entry_id
+            for entity in platform.entities.values()
+        ],
+    )
+
+
+def _memory_report(references: _MemoryReferences) -> dict[str, Any]:
+    """Return the memory held by the referenced objects."""
+    seen: set[int] = set()
+
+    nodes = {
+        node_id: deep_getsizeof(node, seen)
+        for node_id, node in references.nodes.items()
+    }
+    coordinators = {
+        references.coordinator_name: sum(nodes.values())
+        + deep_getsizeof(references.nodes, seen)
+        + deep_getsizeof(references.box_info, seen),
+        references.options_coordinator_name: deep_getsizeof(references.options, seen),
+    }
+    entities = {
+        entity_id: sys.getsizeof(entity) + deep_getsizeof(attributes, seen)
+        for entity_id, entity, attributes in references.entities
+    }
+
+    return {
+        "total": sum(coordinators.values()) + sum(entities.values()),
+        "coordinators": coordinators,
+        "nodes": nodes,
+        "entities": entities,
+    }
+
+
+async def async_get_memory_report(
+    hass: HomeAssistant, entry: DucoBoxConfigEntry
+) -> dict[str, Any]:
+    """
+    Return the memory held by the coordinators, nodes and entities.
+
+    The references are taken on the event loop, and walked in an executor, so
+    a large installation does not block the event loop while it is accounted.
+    """
+    references = _async_get_references(hass, entry)
+    return await hass.async_add_executor_job(_memory_report, references)
+
+
+class DucoBoxAllocationSnapshots:
+    """Compare allocation snapshots taken at different points in time."""
+
+    def __init__(self) -> None:
+        """Initialize the allocation snapshots."""
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    def take_and_compare(self, path: Path, *, stop: bool) -> bool:
+        """
+        Take an allocation snapshot and compare it with the previous one.
+
+        The first snapshot starts tracing allocations. Every later snapshot
+        writes the allocations that grew the most since the previous snapshot
+        to the given path.
+
+        Returns:
+            bool: True if a comparison was written, false otherwise.
+
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._snapshot = None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__)]
+        )
+        previous, self._snapshot = self._snapshot, snapshot
+
+        if stop:
+            tracemalloc.stop()
+            self._snapshot = None
+
+        if previous is None:
+            return False
+
+        package = re.escape(str(Path(__file__).parent))
+        differences = snapshot.compare_to(previous, "lineno")
+        own_differences = [
+            difference
+            for difference in differences
+            if re.match(package, difference.traceback[0].filename)
+        ]
+        lines = [
+            "DucoBox allocation differences since the previous snapshot",
+            "",
+            "Top allocations of the DucoBox integration:",
+            *(str(difference) for difference in own_differences[:_TOP_ALLOCATIONS]),
+            "",
+            "Top allocations overall:",
+            *(str(difference) for difference in differences[:_TOP_ALLOCATIONS]),
+        ]
+        path.write_text("\n".join(lines) + "\n")
+        return True
@@ -0,0 +1,483 @@
+"""
+Modbus TCP transport for the Duco Connectivity Board 2.0.
+
+Experimental: the register map below is not taken from published Duco
+documentation, it mirrors the parameters of the HTTP API and has only been
+verified against the simulated board in tools/simulator.py. The transport is
+therefore not offered by the integration, it is only used by the soak harness
+in tools/soak.py until it can be built on the documented Duco Modbus map.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import struct
+import time
+
+from .api import (
+    BOX_PARAMETERS,
+    DucoBoxTransport,
+    DucoConnectivityBoardApiError,
+    DucoConnectivityBoardConnectionError,
+)
+from .models import DucoBoxInfo, DucoBoxNode
+from .utils import format_box_model_name
+from .watchdog import DucoBoxBlockingWatchdog
+
+READ_INPUT_REGISTERS = 0x04
+WRITE_SINGLE_REGISTER = 0x06
+
+# A single read may request at most 125 registers.
+MAX_READ_REGISTERS = 125
+
+NOT_AVAILABLE = 0xFFFF
+NOT_AVAILABLE_32 = 0xFFFFFFFF
+NOT_AVAILABLE_SIGNED = 0x8000
+
+# System input registers, holding the box information and the node map.
+BOX_NAME_REGISTER = 0
+BOX_NAME_REGISTER_COUNT = 16
+SERIAL_REGISTER = 16
+SERIAL_REGISTER_COUNT = 16
+MAC_REGISTER = 32
+MAC_REGISTER_COUNT = 3
+NODE_MAP_REGISTER = 40
+NODE_MAP_REGISTER_COUNT = 40
+
+# Box-level parameters directly follow the node map, so they are read with it.
+# There is one register for every box parameter of the HTTP API, in its order.
+BOX_PARAMETER_REGISTER = 80
+
+# Every node has a block of registers starting at node ID * 100.
+NODE_REGISTER_BLOCK = 100
+
+# Input registers relative to the start of a node block.
+NODE_TYPE = 0
+NODE_PARENT = 1
+NODE_NETWORK_TYPE = 2
+NODE_STATE = 3
+NODE_TIME_STATE_REMAIN = 4  # 32 bits, high word first
+NODE_MODE = 6
+NODE_FLOW_LVL_TGT = 7
+NODE_RH = 8
+NODE_IAQ_RH = 9
+NODE_CO2 = 10
+NODE_IAQ_CO2 = 11
+NODE_REGISTER_COUNT = 12
+
+# Holding registers relative to the start of a node block.
+NODE_VENTILATION_STATE_SETPOINT = 0
+NODE_IDENTIFY = 1
+
+NODE_TYPES = {
+    1: "BOX",
+    2: "UCBAT",
+    3: "UCCO2",
+    4: "BSRH",
+    5: "VLV",
+    6: "VLVRH",
+    7: "VLVCO2",
+    8: "VLVCO2RH",
+}
+NETWORK_TYPES = ["VIRT", "RF", "WIRED"]
+VENTILATION_MODES = ["AUTO", "MANU"]
+VENTILATION_STATES = [
+    "AUTO",
+    "AUT1",
+    "AUT2",
+    "AUT3",
+    "MAN1",
+    "MAN2",
+    "MAN3",
+    "EMPT",
+    "CNT1",
+    "CNT2",
+    "CNT3",
+    "MAN1x2",
+    "MAN2x2",
+    "MAN3x2",
+    "MAN1x3",
+    "MAN2x3",
+    "MAN3x3",
+]
+
+# The ventilation states a node accepts, by node type. The automatic states
+# AUT1 to AUT3 are reported by the board but cannot be set, and nodes without
+# a ventilation module do not accept a ventilation state at all.
+SETTABLE_VENTILATION_STATES = [
+    state for state in VENTILATION_STATES if state not in {"AUT1", "AUT2", "AUT3"}
+]
+VENTILATION_STATE_OPTIONS = dict.fromkeys(
+    ("BOX", "VLV", "VLVRH", "VLVCO2", "VLVCO2RH"), SETTABLE_VENTILATION_STATES
+)
+
+_HEADER = struct.Struct(">HHHB")
+_MIN_RESPONSE_LENGTH = 2
+_TIMEOUT = 10  # seconds
+
+
+def plan_reads(addresses: list[int], count: int) -> list[tuple[int, int]]:
+    """
+    Coalesce register blocks into as few contiguous reads as possible.
+
+    Args:
+        addresses: The start addresses of the register blocks.
+        count: The number of registers of every block.
+
+    Returns:
+        list[tuple[int, int]]: The start address and register count of every read.
+
+    """
+    reads: list[tuple[int, int]] = []
+
+    for address in sorted(addresses):
+        if reads and address + count - reads[-1][0] <= MAX_READ_REGISTERS:
+            reads[-1] = (reads[-1][0], address + count - reads[-1][0])
+        else:
+            reads.append((address, count))
+
+    return reads
+
+
+def _decode_string(registers: list[int]) -> str:
+    """Decode an ASCII string of two characters per register."""
+    data = b"".join(register.to_bytes(2) for register in registers)
+    return data.rstrip(b"\x00").decode("ascii")
+
+
+def _value(register: int) -> int | None:
+    return None if register == NOT_AVAILABLE else register
+
+
+def _enum(values: list[str], register: int) -> str | None:
+    return values[register] if register < len(values) else None
+
+
+def _decode_box_parameters(node: DucoBoxNode, registers: list[int]) -> None:
+    """Set the box-level parameters of the box parameter registers on the box node."""
+    for param, register in zip(BOX_PARAMETERS, registers, strict=True):
+        value: float | None
+        if param.signed:
+            value = (
+                None
+                if register == NOT_AVAILABLE_SIGNED
+                else register - 0x10000 * (register >> 15)
+            )
+        else:
+            value = _value(register)
+        if value is not None and param.scale != 1:
+            value = round(value * param.scale, 1)
+        setattr(node, param.field, value)
+
+
+def _decode_node(node_id: int, registers: list[int], now: int) -> DucoBoxNode:
+    """Decode the input registers of a node block."""
+    node_type = NODE_TYPES.get(registers[NODE_TYPE])
+    if node_type is None:
+        msg = f"Failed to get node type of node {node_id}"
+        raise DucoConnectivityBoardApiError(msg)
+
+    time_state_remain: int | None = (
+        registers[NODE_TIME_STATE_REMAIN] << 16 | registers[NODE_TIME_STATE_REMAIN + 1]
+    )
+    if time_state_remain == NOT_AVAILABLE_32:
+        time_state_remain = None
+
+    # The end of the ventilation state is not exposed over Modbus, so it is
+    # derived from the remaining time like the HTTP API does.
+    time_state_end = None
+    if time_state_remain is not None:
+        time_state_end = now + time_state_remain if time_state_remain > 0 else 0
+
+    return DucoBoxNode(
+        node_id=node_id,
+        node_type=node_type,
+        parent_node_id=registers[NODE_PARENT],
+        network_type=_enum(NETWORK_TYPES, registers[NODE_NETWORK_TYPE]),
+        state=_enum(VENTILATION_STATES, registers[NODE_STATE]),
+        time_state_remain=time_state_remain,
+        time_state_end=time_state_end,
+        mode=_enum(VENTILATION_MODES, registers[NODE_MODE]),
+        flow_lvl_tgt=_value(registers[NODE_FLOW_LVL_TGT]),
+        rh=_value(registers[NODE_RH]),
+        iaq_rh=_value(registers[NODE_IAQ_RH]),
+        co2=_value(registers[NODE_CO2]),
+        iaq_co2=_value(registers[NODE_IAQ_CO2]),
+    )
+
+
+class DucoBoxModbusTransport(DucoBoxTransport):
+    """Transport using the Modbus TCP interface of the Duco Connectivity Board 2.0."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        unit_id: int = 1,
+        timeout: float = _TIMEOUT,
+        watchdog: DucoBoxBlockingWatchdog | None = None,
+    ) -> None:
+        """
+        Initialize the Modbus TCP transport.
+
+        Args:
+            host: The hostname or IP address of the Duco Connectivity Board 2.0.
+            port: The Modbus TCP port.
+            unit_id: The Modbus unit identifier.
+            timeout: The timeout in seconds of a Modbus request.
+            watchdog: The watchdog measuring the synchronous decoding.
+
+        """
+        self._host = host
+        self._port = port
+        self._unit_id = unit_id
+        self._timeout = timeout
+        self.watchdog = watchdog or DucoBoxBlockingWatchdog()
+        self._lock = asyncio.Lock()
+        self._transaction_id = 0
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def _async_request(self, function: int, payload: bytes) -> bytes:
+        """
+        Send a request and wait for its response, reconnecting if needed.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns an exception.
+            DucoConnectivityBoardConnectionError: If the connection fails.
+
+        """
+        async with self._lock:
+            self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+            request = (
+                _HEADER.pack(self._transaction_id, 0, len(payload) + 2, self._unit_id)
+                + bytes([function])
+                + payload
+            )
+
+            try:
+                async with asyncio.timeout(self._timeout):
+                    if self._reader is None or self._writer is None:
+                        self._reader, self._writer = await asyncio.open_connection(
+                            self._host, self._port
+                        )
+                    reader, writer = self._reader, self._writer
+
+                    writer.write(request)
+                    await writer.drain()
+
+                    header = await reader.readexactly(_HEADER.size)
+                    transaction_id, _, length, _ = _HEADER.unpack(header)
+                    # The length includes the unit identifier of the header.
+                    response = await reader.readexactly(max(length - 1, 0))
+            except (OSError, TimeoutError, asyncio.IncompleteReadError) as err:
+                await self._async_disconnect()
+                msg = f"Failed to communicate with {self._host}:{self._port}: {err!r}"
+                raise DucoConnectivityBoardConnectionError(msg) from err
+
+            if transaction_id != self._transaction_id:
+                await self._async_disconnect()
+                msg = f"Unexpected Modbus transaction {transaction_id}"
+                raise DucoConnectivityBoardConnectionError(msg)
+
+        # Every response holds the function code and at least one byte of data.
+        if len(response) < _MIN_RESPONSE_LENGTH:
+            msg = f"Truncated Modbus response to function {function}"
+            raise DucoConnectivityBoardApiError(msg)
+        if response[0] == function | 0x80:
+            msg = f"Modbus function {function} failed with exception {response[1]}"
+            raise DucoConnectivityBoardApiError(msg)
+        if response[0] != function:
+            msg = f"Unexpected Modbus function {response[0]} in response to {function}"
+            raise DucoConnectivityBoardApiError(msg)
+
+        return response[1:]
+
+    async def _async_disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    async def _async_read_input_registers(self, address: int, count: int) -> list[int]:
+        """Read a contiguous range of input registers."""
+        response = await self._async_request(
+            READ_INPUT_REGISTERS, struct.pack(">HH", address, count)
+        )
+        if response[0] != count * 2 or len(response) != count * 2 + 1:
+            msg = f"Unexpected Modbus response length {len(response)}"
+            raise DucoConnectivityBoardApiError(msg)
+        return list(struct.unpack(f">{count}H", response[1:]))
+
+    async def _async_write_register(self, address: int, value: int) -> bool:
+        """Write a single holding register, returning whether it was echoed."""
+        payload = struct.pack(">HH", address, value)
+        return await self._async_request(WRITE_SINGLE_REGISTER, payload) == payload
+
+    async def _async_get_node_ids(self) -> tuple[list[int], list[int]]:
+        """Get the IDs of the nodes from the node map, and the box parameters."""
+        registers = await self._async_read_input_registers(
+            NODE_MAP_REGISTER,
+            BOX_PARAMETER_REGISTER + len(BOX_PARAMETERS) - NODE_MAP_REGISTER,
+        )
+        node_ids = [
+            index * 16 + bit
+            for index, register in enumerate(registers[:NODE_MAP_REGISTER_COUNT])
+            for bit in range(16)
+            if register & (1 << bit)
+        ]
+        return node_ids, registers[BOX_PARAMETER_REGISTER - NODE_MAP_REGISTER :]
+
+    async def async_get_box_info(self) -> DucoBoxInfo:
+        """
+        Get information about the DucoBox.
+
+        Returns:
+            DucoBoxInfo: Object containing DucoBox information.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            DucoConnectivityBoardConnectionError: If the connection fails.
+
+        """
+        registers = await self._async_read_input_registers(
+            BOX_NAME_REGISTER, MAC_REGISTER + MAC_REGISTER_COUNT
+        )
+
+        model_name = _decode_string(
+            registers[BOX_NAME_REGISTER : BOX_NAME_REGISTER + BOX_NAME_REGISTER_COUNT]
+        )
+        serial_number = _decode_string(
+            registers[SERIAL_REGISTER : SERIAL_REGISTER + SERIAL_REGISTER_COUNT]
+        )
+        mac_address = ":".join(
+            f"{byte:02x}"
+            for register in registers[MAC_REGISTER : MAC_REGISTER + MAC_REGISTER_COUNT]
+            for byte in register.to_bytes(2)
+        )
+
+        if not model_name or not serial_number:
+            msg = "Failed to get BoxName or SerialDucoBox"
+            raise DucoConnectivityBoardApiError(msg)
+
+        return DucoBoxInfo(
+            model=format_box_model_name(model_name),
+            serial_number=serial_number,
+            mac_address=mac_address,
+        )
+
+    async def async_get_nodes(self) -> list[DucoBoxNode]:
+        """
+        Fetch all Duco nodes, reading neighbouring node blocks together.
+
+        The box-level parameters are read together with the node map.
+
+        Returns:
+            list[DucoBoxNode]: List of Duco nodes.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            DucoConnectivityBoardConnectionError: If the connection fails.
+
+        """
+        node_ids, box_registers = await self._async_get_node_ids()
+        reads = plan_reads(
+            [node_id * NODE_REGISTER_BLOCK for node_id in node_ids],
+            NODE_REGISTER_COUNT,
+        )
+
+        registers: dict[int, int] = {}
+        for address, count in reads:
+            values = await self._async_read_input_registers(address, count)
+            registers.update(enumerate(values, address))
+
+        now = int(time.time())
+        with self.watchdog.measure("parse"):
+            nodes = [
+                _decode_node(
+                    node_id,
+                    [
+                        registers[node_id * NODE_REGISTER_BLOCK + offset]
+                        for offset in range(NODE_REGISTER_COUNT)
+                    ],
+                    now,
+                )
+                for node_id in node_ids
+            ]
+            for node in nodes:
+                if node.node_type == "BOX":
+                    _decode_box_parameters(node, box_registers)
+            return nodes
+
+    async def async_get_ventilation_state_options(self) -> dict[int, list[str]]:
+        """
+        Get ventilation state options for all Duco nodes.
+
+        The Modbus interface does not list the supported ventilation states, so
+        they are derived from the node type.
+
+        Returns:
+            dict[int, list[str]]: Mapping of node ID to list of ventilation
+            state options.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns unexpected data.
+            DucoConnectivityBoardConnectionError: If the connection fails.
+
+        """
+        return {
+            node.node_id: options
+            for node in await self.async_get_nodes()
+            if (options := VENTILATION_STATE_OPTIONS.get(node.node_type)) is not None
+        }
+
+    async def async_set_ventilation_state(self, node_id: int, state: str) -> bool:
+        """
+        Set the ventilation state of a Duco node.
+
+        Args:
+            node_id: The Duco node ID.
+            state: The ventilation state.
+
+        Returns:
+            bool: True if the ventilation state was set successfully, false otherwise.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns an exception.
+            DucoConnectivityBoardConnectionError: If the connection fails.
+
+        """
+        if state not in SETTABLE_VENTILATION_STATES:
+            return False
+
+        return await self._async_write_register(
+            node_id * NODE_REGISTER_BLOCK + NODE_VENTILATION_STATE_SETPOINT,
+            VENTILATION_STATES.index(state),
+        )
+
+    async def async_set_identify(self, node_id: int) -> bool:
+        """
+        Set identify on a Duco node.
+
+        Args:
+            node_id: The Duco node ID.
+
+        Returns:
+            bool: True if the identify action was set successfully, false otherwise.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the board returns an exception.
+            DucoConnectivityBoardConnectionError: If the connection fails.
+
+        """
+        return await self._async_write_register(
+            node_id * NODE_REGISTER_BLOCK + NODE_IDENTIFY, 1
+        )
+
+    async def async_close(self) -> None:
+        """Close the Modbus TCP connection."""
+        async with self._lock:
+            await self._async_disconnect()
@@ -12,6 +12,15 @@ class DucoBoxInfo:
     model: str
     serial_number: str
     mac_address: str
+    firmware_version: str | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class DucoBoxCapabilities:
+    """The request shapes and parameters a Connectivity Board supports."""
+
+    node_parameter_filter: bool
+    box_parameters: tuple[str, ...]
 
 
 @dataclass
@@ -36,3 +45,12 @@ class DucoBoxNode:
 
     co2: int | None = None
     iaq_co2: int | None = None
+
+    # Box-level parameters, only reported on the box node.
+    time_filter_remain: int | None = None
+    temp_oda: float | None = None
+    temp_sup: float | None = None
+    temp_eta: float | None = None
+    temp_eha: float | None = None
+    speed_sup: int | None = None
+    speed_eha: int | None = None
@@ -0,0 +1,102 @@
+"""Profiler for the update cycles of the DucoBox integration."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import re
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .coordinator import DucoBoxCoordinator
+from .watchdog import profile_stages
+
+_LOGGER = logging.getLogger(__name__)
+
+_TOP_FUNCTIONS = 50
+
+
+class DucoBoxProfiler:
+    """
+    Profile the next update cycles of a coordinator.
+
+    The profiler shadows the refresh method of the coordinator instance while
+    it is running and removes itself afterwards, so it adds no overhead at all
+    when no profile is requested. Only the synchronous stages of a cycle are
+    profiled: the decoding, the parsing, the update of the data and the state
+    writes of all entities listening to the coordinator. Whatever else the
+    event loop runs while the cycle awaits the board is left out.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DucoBoxCoordinator,
+        cycles: int,
+        path: Path,
+    ) -> None:
+        """Initialize the profiler."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._remaining = cycles
+        self._cycles = cycles
+        self._path = path
+        self._profile = cProfile.Profile()
+        self._refresh = coordinator._async_refresh  # noqa: SLF001
+
+    @property
+    def coordinator(self) -> DucoBoxCoordinator:
+        """Return the profiled coordinator."""
+        return self._coordinator
+
+    @property
+    def active(self) -> bool:
+        """Return True if the profiler is still waiting for update cycles."""
+        return "_async_refresh" in vars(self._coordinator)
+
+    @callback
+    def async_start(self) -> None:
+        """Start profiling the next update cycles."""
+        self._coordinator._async_refresh = self._async_profiled_refresh  # noqa: SLF001
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop profiling without writing the results."""
+        if self.active:
+            del self._coordinator._async_refresh  # noqa: SLF001
+
+    async def _async_profiled_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh the coordinator while profiling its synchronous stages."""
+        with profile_stages(self._profile):
+            await self._refresh(*args, **kwargs)
+
+        self._remaining -= 1
+        if self._remaining > 0:
+            return
+
+        self.async_stop()
+        await self._hass.async_add_executor_job(self._write_results)
+        _LOGGER.info(
+            "Profile of %s update cycles written to %s", self._cycles, self._path
+        )
+
+    def _write_results(self) -> None:
+        """Write the top functions by cumulative time to the results file."""
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+
+        stream.write(
+            f"DucoBox profile of the synchronous stages of {self._cycles} update "
+            "cycles\n\n"
+        )
+        stream.write("Top functions of the DucoBox integration:\n")
+        stats.print_stats(re.escape(str(Path(__file__).parent)), _TOP_FUNCTIONS)
+        stream.write("Top functions overall:\n")
+        stats.print_stats(_TOP_FUNCTIONS)
+
+        self._path.write_text(stream.getvalue())
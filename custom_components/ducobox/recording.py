@@ -0,0 +1,215 @@
+"""Recording and replay of Duco Connectivity Board 2.0 exchanges."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import Any
+
+from .api import DucoBoxJsonApiTransport, DucoConnectivityBoardApiError
+from .watchdog import DucoBoxBlockingWatchdog
+
+type _ExchangeKey = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class DucoBoxExchange:
+    """A request to the board and the response it returned."""
+
+    offset: float
+    method: str
+    path: str
+    params: dict[str, str] | None
+    payload: dict[str, Any] | None
+    status: int
+    elapsed: float
+    body: bytes
+
+
+def _exchange_key(
+    method: str,
+    path: str,
+    params: dict[str, str] | None,
+    payload: dict[str, Any] | None,
+) -> _ExchangeKey:
+    return (
+        method,
+        path,
+        json.dumps(params, sort_keys=True),
+        json.dumps(payload, sort_keys=True),
+    )
+
+
+def save_exchanges(path: Path, exchanges: list[DucoBoxExchange]) -> None:
+    """Write exchanges to a gzipped JSON lines fixture file."""
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for exchange in exchanges:
+            line = {
+                "t": round(exchange.offset, 4),
+                "m": exchange.method,
+                "p": exchange.path,
+                "q": exchange.params,
+                "d": exchange.payload,
+                "s": exchange.status,
+                "e": round(exchange.elapsed, 4),
+                "b": exchange.body.decode("utf-8", "surrogateescape"),
+            }
+            file.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+def load_exchanges(path: Path) -> list[DucoBoxExchange]:
+    """Read exchanges from a gzipped JSON lines fixture file."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [
+            DucoBoxExchange(
+                offset=line["t"],
+                method=line["m"],
+                path=line["p"],
+                params=line["q"],
+                payload=line["d"],
+                status=line["s"],
+                elapsed=line["e"],
+                body=line["b"].encode("utf-8", "surrogateescape"),
+            )
+            for line in map(json.loads, file)
+        ]
+
+
+class DucoBoxRecorder:
+    """Collect the exchanges of a JSON API transport."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.exchanges: list[DucoBoxExchange] = []
+        self._start = monotonic()
+
+    def record(  # noqa: PLR0913
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, str] | None,
+        payload: dict[str, Any] | None,
+        status: int,
+        elapsed: float,
+        body: bytes,
+    ) -> None:
+        """Record an exchange."""
+        self.exchanges.append(
+            DucoBoxExchange(
+                offset=monotonic() - self._start - elapsed,
+                method=method,
+                path=path,
+                params=params,
+                payload=payload,
+                status=status,
+                elapsed=elapsed,
+                body=body,
+            )
+        )
+
+
+class DucoBoxReplayTransport(DucoBoxJsonApiTransport):
+    """
+    Transport replaying recorded exchanges instead of contacting a board.
+
+    Every request is answered with the next recorded response to the same
+    request, starting over when they are exhausted. With a speed above 0 the
+    recording is replayed on its own timeline: a response is returned no
+    earlier than the recorded offset of its request from the start of the
+    recording, and then after the recorded response time, both divided by the
+    speed, so the gaps between the recorded requests are replayed too.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        speed: float = 1.0,
+        watchdog: DucoBoxBlockingWatchdog | None = None,
+        executor_decode_threshold: int | None = None,
+    ) -> None:
+        """
+        Initialize the replay transport.
+
+        Args:
+            path: The fixture file with the recorded exchanges.
+            speed: The factor to speed up the recorded response times by, or 0
+                to respond without delay.
+            watchdog: The watchdog measuring the synchronous decoding and parsing.
+            executor_decode_threshold: The size in bytes above which node
+                responses are decoded and parsed in an executor instead of on
+                the event loop, or None to always decode on the event loop.
+
+        """
+        super().__init__(
+            watchdog=watchdog, executor_decode_threshold=executor_decode_threshold
+        )
+        self._path = path
+        self._speed = speed
+        self._exchanges: dict[_ExchangeKey, list[DucoBoxExchange]] | None = None
+        self._positions: dict[_ExchangeKey, int] = defaultdict(int)
+        # The start and the duration of the recording, and when its replay started.
+        self._first_offset = 0.0
+        self._duration = 0.0
+        self._start: float | None = None
+
+    async def _async_load(self) -> dict[_ExchangeKey, list[DucoBoxExchange]]:
+        if self._exchanges is None:
+            loop = asyncio.get_running_loop()
+            recorded = await loop.run_in_executor(None, load_exchanges, self._path)
+            exchanges: dict[_ExchangeKey, list[DucoBoxExchange]] = defaultdict(list)
+            for exchange in recorded:
+                key = _exchange_key(
+                    exchange.method, exchange.path, exchange.params, exchange.payload
+                )
+                exchanges[key].append(exchange)
+            self._exchanges = exchanges
+            if recorded:
+                self._first_offset = min(exchange.offset for exchange in recorded)
+                self._duration = (
+                    max(exchange.offset + exchange.elapsed for exchange in recorded)
+                    - self._first_offset
+                )
+        return self._exchanges
+
+    async def _async_exchange(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None,
+        payload: dict[str, Any] | None,
+    ) -> tuple[int, bytes]:
+        """
+        Replay the next recorded response to a request.
+
+        Raises:
+            DucoConnectivityBoardApiError: If the request was never recorded.
+
+        """
+        key = _exchange_key(method, path, params, payload)
+        recorded = (await self._async_load()).get(key)
+        if not recorded:
+            msg = f"No recorded exchange for {method} {path}"
+            raise DucoConnectivityBoardApiError(msg)
+
+        lap, position = divmod(self._positions[key], len(recorded))
+        exchange = recorded[position]
+        self._positions[key] += 1
+
+        if self._speed > 0:
+            now = monotonic()
+            if self._start is None:
+                self._start = now
+            # Every time the recorded exchanges start over, the timeline of the
+            # recording is replayed again after the previous one.
+            offset = lap * self._duration + exchange.offset - self._first_offset
+            delay = self._start + offset / self._speed - now
+            await asyncio.sleep(max(delay, 0) + exchange.elapsed / self._speed)
+
+        return exchange.status, exchange.body
@@ -0,0 +1,461 @@
+"""Phase-aligned poll scheduling for the DucoBox integration."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from statistics import fmean
+
+from .models import DucoBoxNode
+
+# The fields whose changes are learned. The board refreshes them on its own
+# cadence, unlike e.g. the ventilation state, which changes on demand.
+SCHEDULED_FIELDS = (
+    "co2",
+    "iaq_co2",
+    "rh",
+    "iaq_rh",
+    "flow_lvl_tgt",
+    "temp_oda",
+    "temp_sup",
+    "temp_eta",
+    "temp_eha",
+    "speed_sup",
+    "speed_eha",
+)
+
+# The observed changes a field needs before its update times are predicted.
+MIN_CHANGES = 4
+# The range of update periods that are learned, in seconds. Faster changing
+# fields are polled at the shortest interval anyway.
+MIN_PERIOD = 5.0
+MAX_PERIOD = 600.0
+# The largest share of the period within which an update may be expected.
+MAX_UNCERTAINTY = 0.25
+# The share of the intervals with an expected update in which the field must
+# have changed.
+MIN_CHANGE_SHARE = 0.5
+# The time after an expected update at which it is polled, which covers the
+# rounding of the scheduled update to whole seconds.
+POLL_MARGIN = 1.0
+# The aligned polls after which the middle of the time within which an update
+# is expected is probed, so the learned cadence follows the board.
+PROBE_EVERY = 4
+
+_HISTORY = 32
+_FRESHNESS_HISTORY = 256
+_MAX_BRANCHES = 256
+_FIT_ITERATIONS = 25
+_DIVISOR_TOLERANCE = 0.05
+_AMBIGUOUS_SHARE = 0.9
+
+type _Interval = tuple[float, float]
+# A field of a node.
+type _FieldKey = tuple[int, str]
+# Intervals with the number of periods from the anchor interval to their
+# update, and the range of periods that leaves an update within all of them.
+type _Counted = list[tuple[_Interval, int]]
+type _Branch = tuple[float, float, _Counted]
+
+
+@dataclass(frozen=True, slots=True)
+class _Cadence:
+    """
+    The learned update cadence of a field.
+
+    The period is known to within the spread, and the update within the last
+    interval in which the field changed to between the earliest and latest
+    time, so the time within which a later update is expected grows with the
+    periods since.
+    """
+
+    period: float
+    spread: float
+    earliest: float
+    latest: float
+
+    def window(self, cycles: int) -> tuple[float, float]:
+        """Return the time within which the update a number of periods on is."""
+        spread = abs(cycles) * self.spread
+        return (
+            self.earliest + cycles * self.period - spread,
+            self.latest + cycles * self.period + spread,
+        )
+
+    def next_window(self, after: float) -> tuple[float, float]:
+        """Return the time within which the first update after a time is."""
+        cycles = math.floor((after - self.latest) / (self.period + self.spread)) + 1
+        return self.window(max(cycles, 0))
+
+
+@dataclass(slots=True)
+class _FieldHistory:
+    """The observed changes of a field and its learned update cadence."""
+
+    # The intervals between two polls in which the field changed, and in
+    # which it did not.
+    changes: deque[_Interval] = field(default_factory=lambda: deque(maxlen=_HISTORY))
+    quiet: deque[_Interval] = field(default_factory=lambda: deque(maxlen=_HISTORY))
+    cadence: _Cadence | None = None
+
+    def add_change(self, start: float, end: float) -> None:
+        """
+        Add an interval in which the field changed, and learn from it.
+
+        Once the cadence is learned, an interval of about a period between two
+        polls after expected updates says nothing new, so it is only added if
+        the expected update is not within it.
+        """
+        if (cadence := self.cadence) is not None and (
+            end - start >= cadence.period - POLL_MARGIN
+        ):
+            earliest, latest = cadence.next_window(start)
+            if start < earliest and latest <= end:
+                return
+        self.changes.append((start, end))
+        self.learn()
+
+    def add_quiet(self, start: float, end: float) -> None:
+        """Add an interval in which the field did not change."""
+        if self.changes:
+            self.quiet.append((start, end))
+
+    def learn(self) -> None:
+        """Learn the update cadence from the observed changes."""
+        self.cadence = None
+        if len(self.changes) < MIN_CHANGES:
+            return
+
+        changes = list(self.changes)
+        anchor = min(changes, key=lambda change: change[1] - change[0])
+        # A cadence that does not tell when the next update is can be any.
+        cadences = [
+            cadence
+            for cadence in _fit(changes, anchor)
+            if cadence.latest - cadence.earliest <= MAX_UNCERTAINTY * cadence.period
+        ]
+        if not cadences:
+            return
+
+        # An update does not always change the value, but a cadence with
+        # updates within many intervals in which the field did not change,
+        # like a divisor of the period, is less likely.
+        quiet = [(start, end) for start, end in self.quiet if end > changes[0][0]]
+        shares = {
+            cadence: len(changes) / (len(changes) + _updates(cadence, quiet))
+            for cadence in cadences
+        }
+        cadence = max(cadences, key=lambda cadence: (shares[cadence], cadence.period))
+        if shares[cadence] < MIN_CHANGE_SHARE:
+            return
+        # A multiple of the period has an update in every interval as well, but
+        # any other likely period means the changes do not tell the period yet.
+        for other in cadences:
+            ratio = other.period / cadence.period
+            if (
+                abs(ratio - round(ratio)) > _DIVISOR_TOLERANCE
+                and shares[other] >= _AMBIGUOUS_SHARE * shares[cadence]
+            ):
+                return
+        self.cadence = cadence
+
+
+def _updates(cadence: _Cadence, intervals: list[_Interval]) -> int:
+    """Return the intervals within which an update surely is."""
+    count = 0
+    for start, end in intervals:
+        cycles = math.ceil((start - cadence.earliest) / cadence.period)
+        for nearby in (cycles - 1, cycles, cycles + 1):
+            earliest, latest = cadence.window(nearby)
+            if start < earliest and latest <= end:
+                count += 1
+                break
+    return count
+
+
+def _fit(changes: list[_Interval], anchor: _Interval) -> list[_Cadence]:
+    """
+    Fit cadences to the intervals in which a field changed.
+
+    Every update is a whole number of periods away from the update within the
+    anchor interval. Counting the periods to the update within every interval,
+    nearest first, limits the period to a range: eliminating the phase, every
+    two counted intervals limit the period to their distance over the
+    difference of their counts.
+
+    Returns:
+        The cadence of every way to count the periods that leaves an update
+        within every counted interval, or none if there are too many.
+
+    """
+    # Most intervals must tell their count, so the period is not learned from
+    # a few short ones.
+    lengths = sorted(end - start for start, end in changes)
+    shortest = max(MIN_PERIOD, lengths[len(lengths) // 2])
+    branches: list[_Branch] = [(shortest, MAX_PERIOD, [(anchor, 0)])]
+    for interval in sorted(changes, key=lambda change: abs(change[0] - anchor[0]))[1:]:
+        branches = [
+            counted_branch
+            for branch in branches
+            for counted_branch in _count(branch, interval, anchor)
+        ]
+        if len(branches) > _MAX_BRANCHES:
+            return []
+
+    return [
+        _fit_counted(counted, low, high)
+        for low, high, counted in branches
+        if len(counted) >= MIN_CHANGES
+    ]
+
+
+def _count(branch: _Branch, interval: _Interval, anchor: _Interval) -> list[_Branch]:
+    """
+    Count the periods to the update within an interval in every possible way.
+
+    An interval does not tell its count for the periods it is longer than, so
+    it is left out of those.
+    """
+    low, high, counted = branch
+    start, end = interval
+    if end - start >= high:
+        return [branch]
+
+    branches: list[_Branch] = []
+    if end - start > low:
+        branches.append((low, end - start, counted))
+        low = end - start
+    nearest, farthest = start - anchor[1], end - anchor[0]
+    for cycles in range(
+        math.ceil(min(nearest / low, nearest / high)),
+        math.floor(max(farthest / low, farthest / high)) + 1,
+    ):
+        counted_interval = (interval, cycles)
+        if (limits := _limit(counted, counted_interval, low, high)) is not None:
+            branches.append((*limits, [*counted, counted_interval]))
+    return branches
+
+
+def _limit(
+    counted: _Counted, counted_interval: tuple[_Interval, int], low: float, high: float
+) -> tuple[float, float] | None:
+    """Return the range of periods left by counting an interval, if any."""
+    (start, end), cycles = counted_interval
+    for (other_start, other_end), other_cycles in counted:
+        if (difference := cycles - other_cycles) == 0:
+            if start >= other_end or other_start >= end:
+                return None
+            continue
+        shortest = (start - other_end) / difference
+        longest = (end - other_start) / difference
+        if difference < 0:
+            shortest, longest = longest, shortest
+        low, high = max(low, shortest), min(high, longest)
+        if low >= high:
+            return None
+    return low, high
+
+
+def _fit_counted(counted: _Counted, low: float, high: float) -> _Cadence:
+    """
+    Fit the periods within a range to counted intervals.
+
+    The update within the last interval is between the latest start and the
+    earliest end of the intervals shifted on by their periods before it,
+    which are convex and concave in the period respectively.
+    """
+    last = max(counted, key=lambda interval: interval[1])[1]
+    intervals = [(interval, cycles - last) for interval, cycles in counted]
+
+    def earliest(period: float) -> float:
+        return max(start - cycles * period for (start, _), cycles in intervals)
+
+    def latest(period: float) -> float:
+        return min(end - cycles * period for (_, end), cycles in intervals)
+
+    return _Cadence(
+        period=(low + high) / 2,
+        spread=(high - low) / 2,
+        earliest=earliest(_maximum(lambda period: -earliest(period), low, high)),
+        latest=latest(_maximum(latest, low, high)),
+    )
+
+
+def _maximum(function: Callable[[float], float], low: float, high: float) -> float:
+    """Return where a concave function is largest within a range."""
+    for _ in range(_FIT_ITERATIONS):
+        third = (high - low) / 3
+        if function(low + third) < function(high - third):
+            low += third
+        else:
+            high -= third
+    return (low + high) / 2
+
+
+class DucoBoxPollScheduler:
+    """
+    Learn when the board updates its values and schedule polls just after.
+
+    Every poll records the fields of every node that changed since the
+    previous poll. The period and phase of the updates of every field of every
+    node are learned from the intervals in which it changed, as the nodes
+    update independently, and the next poll is scheduled just after the next
+    expected update of any of them. The cadences are only learned while
+    the polls are scheduled, as polls at a fixed interval always see the
+    updates at the same phases. Until a field is learned, the polls are spread
+    around the default interval, so their phases relative to the updates vary.
+    Every few aligned polls, a poll in the middle of the time within which an
+    update is expected keeps the learned cadence narrow, alternated with a poll
+    at a random time before it, which tests the learned period.
+    """
+
+    def __init__(self, default_interval: float, max_interval: float) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            default_interval: The fixed poll interval, in seconds.
+            max_interval: The longest interval between polls, in seconds.
+
+        """
+        self.default_interval = default_interval
+        self.max_interval = max_interval
+        self.min_interval = MIN_PERIOD
+        self.adaptive = False
+        self._fields: dict[_FieldKey, _FieldHistory] = {}
+        self._last_poll: float | None = None
+        self._aligned_polls = 0
+        self._probes = 0
+        self._polls = 0
+        self._wasted_polls = 0
+        self._freshness: deque[float] = deque(maxlen=_FRESHNESS_HISTORY)
+
+    def set_adaptive(self, adaptive: bool) -> None:  # noqa: FBT001
+        """Start or stop scheduling the polls, forgetting the learned cadences."""
+        if adaptive != self.adaptive:
+            self.adaptive = adaptive
+            self._fields.clear()
+            self._aligned_polls = 0
+            self._probes = 0
+
+    def record(
+        self,
+        polled_at: float,
+        previous: dict[int, DucoBoxNode],
+        changed: list[DucoBoxNode],
+        removed: Iterable[int] = (),
+    ) -> None:
+        """
+        Record the changes a poll returned.
+
+        Args:
+            polled_at: The monotonic time of the poll.
+            previous: The nodes of the previous poll.
+            changed: The nodes that differ from the previous poll.
+            removed: The IDs of the nodes of the previous poll that are gone.
+
+        """
+        if removed_ids := set(removed):
+            for key in [key for key in self._fields if key[0] in removed_ids]:
+                del self._fields[key]
+
+        last_poll, self._last_poll = self._last_poll, polled_at
+        if last_poll is None:
+            return
+
+        changed_fields = {
+            (node.node_id, name)
+            for node in changed
+            if (previous_node := previous.get(node.node_id)) is not None
+            for name in SCHEDULED_FIELDS
+            if getattr(node, name) != getattr(previous_node, name)
+        }
+
+        self._polls += 1
+        if not changed_fields:
+            self._wasted_polls += 1
+
+        if self.adaptive:
+            for key, history in self._fields.items():
+                if key not in changed_fields:
+                    history.add_quiet(last_poll, polled_at)
+
+        for key in changed_fields:
+            history = self._fields.get(key)
+            # The change happened around the expected update within the
+            # interval, or at an unknown time within it.
+            update = (last_poll + polled_at) / 2
+            if history is not None and history.cadence is not None:
+                earliest, latest = history.cadence.next_window(last_poll)
+                if earliest < polled_at:
+                    update = min(max((earliest + latest) / 2, last_poll), polled_at)
+            self._freshness.append(polled_at - update)
+
+            if self.adaptive:
+                if history is None:
+                    history = self._fields[key] = _FieldHistory()
+                history.add_change(last_poll, polled_at)
+
+    def next_interval(self, now: float) -> float:
+        """Return the time until the next poll, in seconds."""
+        expected = [
+            (latest, earliest)
+            for history in self._fields.values()
+            if (cadence := history.cadence) is not None
+            for earliest, latest in (cadence.next_window(now),)
+            if latest - earliest <= MAX_UNCERTAINTY * cadence.period
+        ]
+        if not expected:
+            self._aligned_polls = 0
+            return random.uniform(  # noqa: S311
+                self.default_interval / 2, 3 * self.default_interval / 2
+            )
+
+        latest, earliest = min(expected)
+        poll = latest + POLL_MARGIN
+        self._aligned_polls += 1
+        if self._aligned_polls > PROBE_EVERY:
+            # Whether the probe finds the update or not, it halves the time
+            # within which the update is expected. Every other probe is at a
+            # random time before the update instead, which tests the learned
+            # period, as aligned polls see a change with a too long period too,
+            # and varies the phases at which the fields not learned yet are seen.
+            self._probes += 1
+            if self._probes % 2:
+                probe = (earliest + latest) / 2
+            else:
+                probe = random.uniform(now + self.min_interval, latest)  # noqa: S311
+            if probe - now >= self.min_interval:
+                self._aligned_polls = 0
+                poll = probe
+
+        return min(max(poll - now, self.min_interval), self.max_interval)
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the learned cadences, the freshness and the wasted polls."""
+        freshness = sorted(self._freshness)
+        return {
+            "fields": {
+                f"{node_id} {name}": {
+                    "period": cadence.period,
+                    "period_spread": cadence.spread,
+                    "uncertainty": cadence.latest - cadence.earliest,
+                }
+                for (node_id, name), history in sorted(self._fields.items())
+                if (cadence := history.cadence) is not None
+            },
+            "polls": self._polls,
+            "wasted_poll_ratio": (
+                self._wasted_polls / self._polls if self._polls else None
+            ),
+            "freshness_seconds": {
+                "mean": fmean(freshness),
+                "p95": freshness[max(math.ceil(0.95 * len(freshness)) - 1, 0)],
+                "max": freshness[-1],
+            }
+            if freshness
+            else None,
+        }
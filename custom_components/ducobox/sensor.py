@@ -2,166 +2,47 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass
-from datetime import datetime
-
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorEntity,
-    SensorEntityDescription,
-    SensorStateClass,
-)
-from homeassistant.const import (
-    CONCENTRATION_PARTS_PER_MILLION,
-    PERCENTAGE,
-    EntityCategory,
-    UnitOfTime,
-)
-from homeassistant.core import HomeAssistant
+from datetime import datetime, timedelta
+from time import monotonic
+
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.typing import StateType
-from homeassistant.util.dt import UTC
+from homeassistant.util import dt as dt_util
 
-from . import DucoBoxConfigEntry
 from .const import (
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_DEADBAND_FILTERING,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_MEMORY_ACCOUNTING,
+    CONF_MIN_PUBLISH_INTERVAL,
+    DEFAULT_COUNTDOWN_INTERVAL,
+    DEFAULT_DEADBAND_FILTERING,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MEMORY_ACCOUNTING,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
     DUCOBOX_NODE_TYPE_BOX,
-    DUCOBOX_NODE_TYPE_BSRH,
-    DUCOBOX_NODE_TYPE_UCBAT,
-    DUCOBOX_NODE_TYPE_UCCO2,
-    DUCOBOX_NODE_TYPE_VLV,
-    DUCOBOX_NODE_TYPE_VLVCO2,
-    DUCOBOX_NODE_TYPE_VLVCO2RH,
-    DUCOBOX_NODE_TYPE_VLVRH,
-    DUCOBOX_VENTILATION_MODES,
 )
-from .coordinator import DucoBoxCoordinator, DucoBoxOptionsCoordinator
-from .entity import DucoBoxEntity
+from .coordinator import (
+    DucoBoxConfigEntry,
+    DucoBoxCoordinator,
+    DucoBoxOptionsCoordinator,
+)
+from .descriptions import (
+    AGGREGATE_SENSORS,
+    MEMORY_USAGE_SENSOR,
+    SUPPRESSED_WRITES_SENSOR,
+    DucoBoxAggregateSensorEntityDescription,
+    DucoBoxFilteredSensorEntityDescription,
+    DucoBoxSensorEntityDescription,
+)
+from .entity import DucoBoxEntity, DucoBoxOptionsEntity
+from .memory import async_get_memory_report
 from .models import DucoBoxNode
 
-
-@dataclass(frozen=True, kw_only=True)
-class DucoBoxSensorEntityDescription(SensorEntityDescription):
-    """Describes a DucoBox sensor entity."""
-
-    value_fn: Callable[[DucoBoxNode], StateType | datetime]
-    options_fn: Callable[[DucoBoxOptionsCoordinator, int], list[str]] | None = None
-
-
-VENTILATION_SENSORS: list[DucoBoxSensorEntityDescription] = [
-    DucoBoxSensorEntityDescription(
-        key="time_state_remain",
-        translation_key="time_state_remain",
-        native_unit_of_measurement=UnitOfTime.SECONDS,
-        device_class=SensorDeviceClass.DURATION,
-        suggested_display_precision=0,
-        value_fn=lambda data: (
-            value
-            if (value := data.time_state_remain) is not None and value > 0
-            else None
-        ),
-    ),
-    DucoBoxSensorEntityDescription(
-        key="time_state_end",
-        translation_key="time_state_end",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda data: (
-            datetime.fromtimestamp(value, tz=UTC)
-            if (value := data.time_state_end) is not None and value > 0
-            else None
-        ),
-    ),
-    DucoBoxSensorEntityDescription(
-        key="mode",
-        translation_key="mode",
-        device_class=SensorDeviceClass.ENUM,
-        options=DUCOBOX_VENTILATION_MODES,
-        value_fn=lambda data: data.mode,
-    ),
-    DucoBoxSensorEntityDescription(
-        key="state",
-        translation_key="state",
-        device_class=SensorDeviceClass.ENUM,
-        options_fn=lambda coordinator, node_id: coordinator.data.get(node_id, []),
-        value_fn=lambda data: data.state,
-    ),
-    DucoBoxSensorEntityDescription(
-        key="flow_lvl_tgt",
-        translation_key="flow_lvl_tgt",
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.flow_lvl_tgt,
-    ),
-]
-
-CO2_SENSORS: list[DucoBoxSensorEntityDescription] = [
-    DucoBoxSensorEntityDescription(
-        key="co2",
-        translation_key="co2",
-        native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
-        device_class=SensorDeviceClass.CO2,
-        state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.co2,
-    ),
-    DucoBoxSensorEntityDescription(
-        key="iaq_co2",
-        translation_key="iaq_co2",
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.iaq_co2,
-    ),
-]
-
-RH_SENSORS: list[DucoBoxSensorEntityDescription] = [
-    DucoBoxSensorEntityDescription(
-        key="rh",
-        translation_key="rh",
-        native_unit_of_measurement=PERCENTAGE,
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.rh,
-    ),
-    DucoBoxSensorEntityDescription(
-        key="iaq_rh",
-        translation_key="iaq_rh",
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.iaq_rh,
-    ),
-]
-
-NETWORKTYPE_SENSORS: list[DucoBoxSensorEntityDescription] = [
-    DucoBoxSensorEntityDescription(
-        key="network_type",
-        translation_key="network_type",
-        entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.network_type,
-    )
-]
-
-SENSORS_BY_NODE_TYPE: dict[str, list[DucoBoxSensorEntityDescription]] = {
-    DUCOBOX_NODE_TYPE_BOX: [*VENTILATION_SENSORS, *NETWORKTYPE_SENSORS],
-    DUCOBOX_NODE_TYPE_BSRH: [*RH_SENSORS, *NETWORKTYPE_SENSORS],
-    DUCOBOX_NODE_TYPE_UCBAT: [*NETWORKTYPE_SENSORS],
-    DUCOBOX_NODE_TYPE_UCCO2: [*CO2_SENSORS, *NETWORKTYPE_SENSORS],
-    DUCOBOX_NODE_TYPE_VLV: [*VENTILATION_SENSORS, *NETWORKTYPE_SENSORS],
-    DUCOBOX_NODE_TYPE_VLVCO2: [
-        *VENTILATION_SENSORS,
-        *CO2_SENSORS,
-        *NETWORKTYPE_SENSORS,
-    ],
-    DUCOBOX_NODE_TYPE_VLVCO2RH: [
-        *VENTILATION_SENSORS,
-        *CO2_SENSORS,
-        *RH_SENSORS,
-        *NETWORKTYPE_SENSORS,
-    ],
-    DUCOBOX_NODE_TYPE_VLVRH: [
-        *VENTILATION_SENSORS,
-        *RH_SENSORS,
-        *NETWORKTYPE_SENSORS,
-    ],
-}
+MEMORY_UPDATE_INTERVAL = timedelta(minutes=5)
 
 
 async def async_setup_entry(
@@ -173,14 +54,156 @@ async def async_setup_entry(
     coordinator = entry.runtime_data.coordinator
     options_coordinator = entry.runtime_data.options_coordinator
 
-    async_add_entities(
-        DucoBoxSensorEntity(coordinator, options_coordinator, node, sensor_description)
+    entities: list[SensorEntity] = [
+        (
+            DucoBoxCountdownSensorEntity
+            if sensor_description.countdown_end_fn is not None
+            else DucoBoxSensorEntity
+        )(coordinator, options_coordinator, node, sensor_description)
+        for node, sensor_description in entry.runtime_data.entity_index.sensors
+    ]
+
+    entities.extend(
+        DucoBoxAggregateSensorEntity(coordinator, node, sensor_description)
         for node in coordinator.data.values()
-        for sensor_description in SENSORS_BY_NODE_TYPE.get(node.node_type, [])
+        if node.node_type == DUCOBOX_NODE_TYPE_BOX
+        for sensor_description in AGGREGATE_SENSORS
+        if coordinator.aggregates.count(sensor_description.field)
     )
 
+    if entry.options.get(CONF_MEMORY_ACCOUNTING, DEFAULT_MEMORY_ACCOUNTING):
+        entities.extend(
+            DucoBoxMemorySensorEntity(coordinator, node, MEMORY_USAGE_SENSOR)
+            for node in coordinator.data.values()
+            if node.node_type == DUCOBOX_NODE_TYPE_BOX
+        )
+
+    # Added last, so it counts the writes suppressed in the same update.
+    if entry.options.get(
+        CONF_DEADBAND_FILTERING, DEFAULT_DEADBAND_FILTERING
+    ) or entry.options.get(CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL):
+        entities.extend(
+            DucoBoxSuppressedWritesSensorEntity(
+                coordinator, node, SUPPRESSED_WRITES_SENSOR
+            )
+            for node in coordinator.data.values()
+            if node.node_type == DUCOBOX_NODE_TYPE_BOX
+        )
+
+    async_add_entities(entities)
+
+
+class DucoBoxFilteredSensorEntity(DucoBoxEntity, SensorEntity):
+    """
+    DucoBox sensor entity that skips writing insignificant state changes.
+
+    A measurement with a deadband is only written after a coordinator update
+    if it changed by more than its deadband since the last written state, and
+    the minimum publish interval has passed. It is written regardless when it
+    becomes (un)available or unknown, or when the heartbeat interval passed.
+
+    The coordinator does not notify the entities when the data did not change,
+    so a timer writes a change held back by the minimum publish interval once
+    it passed, and the state at the heartbeat interval.
+    """
+
+    entity_description: DucoBoxFilteredSensorEntityDescription
+
+    _written_value: StateType | datetime = None
+    _written_available: bool | None = None
+    _written_at: float = 0.0
+    _unsub_publish: CALLBACK_TYPE | None = None
+    _publish_at: float | None = None
+
+    @callback
+    def _async_setup_filter(self) -> None:
+        """Set up filtering from the description and the config entry options."""
+        options = self.coordinator.config_entry.options
+        deadband_filtering = options.get(
+            CONF_DEADBAND_FILTERING, DEFAULT_DEADBAND_FILTERING
+        )
+        self._min_publish_interval: float = options.get(
+            CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL
+        )
+        self._heartbeat_interval: float = options.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        )
+
+        self._deadband: float | None = None
+        if deadband_filtering and self.entity_description.deadband is not None:
+            option, default = self.entity_description.deadband
+            self._deadband = options.get(option, default)
+        self._filtered = self.entity_description.deadband is not None and bool(
+            deadband_filtering or self._min_publish_interval
+        )
+
+    @callback
+    def _async_skip_write(self) -> bool:
+        """Return True if the measurement did not change significantly."""
+        value = self._attr_native_value
+        written_value = self._written_value
+        if (
+            not self._filtered
+            or not isinstance(value, int | float)
+            or not isinstance(written_value, int | float)
+            or self.available != self._written_available
+        ):
+            return False
+
+        elapsed = monotonic() - self._written_at
+        if elapsed >= self._heartbeat_interval:
+            return False
+
+        if self._deadband is not None and abs(value - written_value) <= self._deadband:
+            self._async_schedule_publish(self._written_at + self._heartbeat_interval)
+            return True
+        if elapsed < self._min_publish_interval:
+            self._async_schedule_publish(self._written_at + self._min_publish_interval)
+            return True
+        return False
+
+    @callback
+    def _async_schedule_publish(self, publish_at: float) -> None:
+        """Write the state at a monotonic time, unless it is written before."""
+        if self._unsub_publish is not None:
+            if publish_at == self._publish_at:
+                return
+            self._unsub_publish()
+        self._publish_at = publish_at
+        self._unsub_publish = async_call_later(
+            self.hass, publish_at - monotonic(), self._async_publish
+        )
+
+    @callback
+    def _async_cancel_publish(self) -> None:
+        """Cancel the scheduled write."""
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+
+    @callback
+    def _async_publish(self, _now: datetime) -> None:
+        """Write the state held back until now."""
+        self._unsub_publish = None
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the scheduled write when the entity is removed."""
+        await super().async_will_remove_from_hass()
+        self._async_cancel_publish()
 
-class DucoBoxSensorEntity(DucoBoxEntity, SensorEntity):
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember it for filtering later updates."""
+        self._written_value = self._attr_native_value
+        self._written_available = self.available
+        self._written_at = monotonic()
+        super().async_write_ha_state()
+        if self._filtered:
+            self._async_schedule_publish(self._written_at + self._heartbeat_interval)
+
+
+class DucoBoxSensorEntity(DucoBoxOptionsEntity, DucoBoxFilteredSensorEntity):
     """DucoBox sensor entity."""
 
     entity_description: DucoBoxSensorEntityDescription
@@ -193,27 +216,229 @@ class DucoBoxSensorEntity(DucoBoxEntity, SensorEntity):
         sensor_description: DucoBoxSensorEntityDescription,
     ) -> None:
         """Initialize DucoBox sensor entity."""
-        super().__init__(coordinator, node)
+        super().__init__(
+            coordinator,
+            options_coordinator if sensor_description.options_fn is not None else None,
+            node,
+        )
 
-        self._node_id = node.node_id
-        self._options_coordinator = options_coordinator
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{node.node_id}_"
             f"{sensor_description.key}"
         )
         self.entity_description = sensor_description
 
-    @property
-    def options(self) -> list[str] | None:
-        """Return the list of available options."""
-        if self.entity_description.options_fn is not None:
-            return self.entity_description.options_fn(
+        self._async_update_attrs(node)
+        self._async_update_options()
+        self._async_setup_filter()
+
+    @callback
+    def _async_update_attrs(self, node: DucoBoxNode) -> None:
+        """Compute the value reported by the DucoBox sensor from the node."""
+        self._attr_native_value = self.coordinator.async_get_node_value(
+            node, self.entity_description.value_fn
+        )
+
+    @callback
+    def _async_update_options(self) -> None:
+        """Compute the list of available options."""
+        if (
+            self._options_coordinator is not None
+            and self.entity_description.options_fn is not None
+        ):
+            self._attr_options = self.entity_description.options_fn(
                 self._options_coordinator, self._node_id
             )
-        return self.entity_description.options
 
-    @property
-    def native_value(self) -> StateType | datetime:
-        """Return the value reported by the DucoBox sensor."""
-        node = self.coordinator.data[self._node_id]
-        return self.entity_description.value_fn(node)
+
+class DucoBoxCountdownSensorEntity(DucoBoxSensorEntity):
+    """
+    DucoBox sensor entity that counts down between coordinator updates.
+
+    The remaining time is computed locally from the end timestamp reported by
+    the board, corrected for the offset between the board clock and the local
+    clock, so the countdown stays smooth without polling the board.
+    """
+
+    _unsub_countdown: CALLBACK_TYPE | None = None
+    _countdown_interval: int | None = None
+    _reported_value: StateType | datetime = None
+    _countdown_end: int | None = None
+
+    @callback
+    def _async_update_attrs(self, node: DucoBoxNode) -> None:
+        """Compute the remaining time and its end from the node."""
+        self._reported_value = self.coordinator.async_get_node_value(
+            node, self.entity_description.value_fn
+        )
+        if self.entity_description.countdown_end_fn is not None:
+            self._countdown_end = self.coordinator.async_get_node_value(
+                node, self.entity_description.countdown_end_fn
+            )
+        self._attr_native_value = self._count_down()
+
+    def _count_down(self) -> StateType | datetime:
+        """Return the remaining time, counted down from the last update."""
+        offset = self.coordinator.board_clock_offset
+        if (
+            self._reported_value is None
+            or offset is None
+            or self._countdown_end is None
+        ):
+            return self._reported_value
+
+        remaining = round(self._countdown_end - dt_util.utcnow().timestamp() - offset)
+        return remaining if remaining > 0 else None
+
+    async def async_added_to_hass(self) -> None:
+        """Start counting down when the entity is added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.config_entry.add_update_listener(
+                self._async_update_options_listener
+            )
+        )
+        self._async_update_countdown()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop counting down when the entity is removed."""
+        await super().async_will_remove_from_hass()
+        self._async_stop_countdown()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Re-sync the countdown with the latest coordinator data."""
+        super()._handle_coordinator_update()
+        self._async_update_countdown()
+
+    @callback
+    def _async_update_countdown(self) -> None:
+        """Start or stop the countdown depending on the remaining time."""
+        if not self.available or self.native_value is None:
+            self._async_stop_countdown()
+        elif self._unsub_countdown is None:
+            self._countdown_interval = self.coordinator.config_entry.options.get(
+                CONF_COUNTDOWN_INTERVAL, DEFAULT_COUNTDOWN_INTERVAL
+            )
+            self._unsub_countdown = async_track_time_interval(
+                self.hass,
+                self._async_countdown_tick,
+                timedelta(seconds=self._countdown_interval),
+            )
+
+    @callback
+    def _async_stop_countdown(self) -> None:
+        """Stop the countdown."""
+        if self._unsub_countdown is not None:
+            self._unsub_countdown()
+            self._unsub_countdown = None
+
+    async def _async_update_options_listener(
+        self, _hass: HomeAssistant, entry: DucoBoxConfigEntry
+    ) -> None:
+        """Restart a running countdown when the countdown interval changed."""
+        interval = entry.options.get(
+            CONF_COUNTDOWN_INTERVAL, DEFAULT_COUNTDOWN_INTERVAL
+        )
+        if self._unsub_countdown is not None and interval != self._countdown_interval:
+            self._async_stop_countdown()
+            self._async_update_countdown()
+
+    @callback
+    def _async_countdown_tick(self, _now: datetime) -> None:
+        """Write the counted down state."""
+        self._attr_native_value = self._count_down()
+        self._async_update_countdown()
+        self.async_write_ha_state()
+
+
+class DucoBoxAggregateSensorEntity(DucoBoxFilteredSensorEntity):
+    """DucoBox sensor entity reporting a whole-house aggregate on the box."""
+
+    entity_description: DucoBoxAggregateSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DucoBoxCoordinator,
+        node: DucoBoxNode,
+        sensor_description: DucoBoxAggregateSensorEntityDescription,
+    ) -> None:
+        """Initialize DucoBox aggregate sensor entity."""
+        super().__init__(coordinator, node)
+
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{node.node_id}_"
+            f"{sensor_description.key}"
+        )
+        self.entity_description = sensor_description
+
+        self._async_update_attrs(node)
+        self._async_setup_filter()
+
+    @callback
+    def _async_update_attrs(self, node: DucoBoxNode) -> None:  # noqa: ARG002
+        """Compute the aggregate from the coordinator."""
+        self._attr_native_value = self.entity_description.value_fn(
+            self.coordinator.aggregates
+        )
+
+
+class DucoBoxMemorySensorEntity(DucoBoxEntity, SensorEntity):
+    """DucoBox sensor entity reporting the memory held by the integration."""
+
+    def __init__(
+        self,
+        coordinator: DucoBoxCoordinator,
+        node: DucoBoxNode,
+        sensor_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize DucoBox memory sensor entity."""
+        super().__init__(coordinator, node)
+
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{node.node_id}_"
+            f"{sensor_description.key}"
+        )
+        self.entity_description = sensor_description
+
+    async def async_added_to_hass(self) -> None:
+        """Start accounting the memory when the entity is added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_update_memory, MEMORY_UPDATE_INTERVAL
+            )
+        )
+        self.hass.async_create_task(self._async_update_memory())
+
+    async def _async_update_memory(self, _now: datetime | None = None) -> None:
+        """Account the memory held by the coordinators and entities."""
+        report = await async_get_memory_report(self.hass, self.coordinator.config_entry)
+        self._attr_native_value = report["total"]
+        self.async_write_ha_state()
+
+
+class DucoBoxSuppressedWritesSensorEntity(DucoBoxEntity, SensorEntity):
+    """DucoBox sensor entity counting the state writes skipped by filtering."""
+
+    def __init__(
+        self,
+        coordinator: DucoBoxCoordinator,
+        node: DucoBoxNode,
+        sensor_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize DucoBox suppressed writes sensor entity."""
+        super().__init__(coordinator, node)
+
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{node.node_id}_"
+            f"{sensor_description.key}"
+        )
+        self.entity_description = sensor_description
+
+        self._async_update_attrs(node)
+
+    @callback
+    def _async_update_attrs(self, node: DucoBoxNode) -> None:  # noqa: ARG002
+        """Read the number of suppressed writes from the coordinator."""
+        self._attr_native_value = self.coordinator.suppressed_writes
@@ -0,0 +1,223 @@
+"""Services for the DucoBox integration."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import voluptuous as vol
+from aiohttp import ClientError
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .api import DucoConnectivityBoardApiError
+from .archive import archive_directory, export_csv
+from .const import DOMAIN
+from .coordinator import DucoBoxConfigEntry
+from .memory import DucoBoxAllocationSnapshots
+from .profiler import DucoBoxProfiler
+from .recording import DucoBoxRecorder, save_exchanges
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CYCLES = "cycles"
+ATTR_DURATION = "duration"
+ATTR_END_DATE = "end_date"
+ATTR_START_DATE = "start_date"
+ATTR_STOP = "stop"
+
+SERVICE_PROFILE = "profile"
+SERVICE_MEMORY_SNAPSHOT = "memory_snapshot"
+SERVICE_RECORD = "record"
+SERVICE_EXPORT_ARCHIVE = "export_archive"
+
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+SERVICE_MEMORY_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_STOP, default=False): cv.boolean,
+    }
+)
+
+SERVICE_RECORD_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=300): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=86400)
+        ),
+    }
+)
+
+SERVICE_EXPORT_ARCHIVE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+_DATA_PROFILER: HassKey[DucoBoxProfiler] = HassKey(f"{DOMAIN}_profiler")
+_DATA_SNAPSHOTS: HassKey[DucoBoxAllocationSnapshots] = HassKey(
+    f"{DOMAIN}_allocation_snapshots"
+)
+
+
+def _async_get_entry(hass: HomeAssistant, entry_id: str) -> DucoBoxConfigEntry:
+    """Get a loaded DucoBox config entry."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        msg = f"DucoBox config entry {entry_id} is not loaded"
+        raise ServiceValidationError(msg)
+    return entry
+
+
+async def _async_profile(call: ServiceCall) -> None:
+    """Profile the next update cycles of a DucoBox."""
+    hass = call.hass
+    entry = _async_get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+    profiler = hass.data.get(_DATA_PROFILER)
+    if profiler is not None and profiler.active:
+        msg = "A DucoBox profile is already running"
+        raise ServiceValidationError(msg)
+
+    filename = f"ducobox_profile_{dt_util.now():%Y%m%d_%H%M%S}.txt"
+    profiler = DucoBoxProfiler(
+        hass,
+        entry.runtime_data.coordinator,
+        call.data[ATTR_CYCLES],
+        Path(hass.config.path(filename)),
+    )
+    hass.data[_DATA_PROFILER] = profiler
+    profiler.async_start()
+
+
+@callback
+def async_stop_profile(hass: HomeAssistant, entry: DucoBoxConfigEntry) -> None:
+    """Stop profiling the update cycles of a DucoBox that is unloaded."""
+    profiler = hass.data.get(_DATA_PROFILER)
+    if profiler is not None and profiler.coordinator is entry.runtime_data.coordinator:
+        profiler.async_stop()
+
+
+async def _async_memory_snapshot(call: ServiceCall) -> None:
+    """Take an allocation snapshot and compare it with the previous one."""
+    hass = call.hass
+    snapshots = hass.data.setdefault(_DATA_SNAPSHOTS, DucoBoxAllocationSnapshots())
+
+    filename = f"ducobox_memory_{dt_util.now():%Y%m%d_%H%M%S}.txt"
+    path = Path(hass.config.path(filename))
+
+    if await hass.async_add_executor_job(
+        lambda: snapshots.take_and_compare(path, stop=call.data[ATTR_STOP])
+    ):
+        _LOGGER.info("Allocation differences written to %s", path)
+    else:
+        _LOGGER.info("Allocation snapshot taken, call again to compare")
+
+
+async def _async_record(call: ServiceCall) -> None:
+    """Record the exchanges with a DucoBox into a fixture file."""
+    hass = call.hass
+    entry = _async_get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    api = entry.runtime_data.coordinator.api
+
+    recorder = DucoBoxRecorder()
+    try:
+        api.start_recording(recorder)
+    except DucoConnectivityBoardApiError as err:
+        raise ServiceValidationError(str(err)) from err
+
+    # Record the requests that are only made during setup as well, so the
+    # fixture can be replayed on its own.
+    try:
+        await api.async_get_box_info()
+        await api.async_probe_capabilities()
+        await api.async_get_ventilation_state_options()
+    except (ClientError, DucoConnectivityBoardApiError) as err:
+        api.stop_recording()
+        msg = f"Failed to start recording: {err}"
+        raise HomeAssistantError(msg) from err
+
+    filename = f"ducobox_recording_{dt_util.now():%Y%m%d_%H%M%S}.jsonl.gz"
+    path = Path(hass.config.path(filename))
+
+    async def _async_save() -> None:
+        await hass.async_add_executor_job(save_exchanges, path, recorder.exchanges)
+        _LOGGER.info("%s exchanges recorded to %s", len(recorder.exchanges), path)
+
+    @callback
+    def _async_finish(_now: datetime | None = None) -> None:
+        if api.stop_recording() is recorder:
+            hass.async_create_task(_async_save(), f"{DOMAIN} save recording")
+
+    entry.async_on_unload(
+        async_call_later(hass, call.data[ATTR_DURATION], _async_finish)
+    )
+    entry.async_on_unload(_async_finish)
+
+
+async def _async_export_archive(call: ServiceCall) -> None:
+    """Export the archived telemetry of a DucoBox to a CSV file."""
+    hass = call.hass
+    entry = _async_get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    coordinator = entry.runtime_data.coordinator
+
+    start = call.data[ATTR_START_DATE]
+    end = call.data.get(ATTR_END_DATE, start)
+    if end < start:
+        msg = "The end date must not be before the start date"
+        raise ServiceValidationError(msg)
+
+    # Write the rows that are still buffered, so the export is complete.
+    if coordinator.archive is not None:
+        await coordinator.archive.async_flush()
+
+    serial_number = coordinator.box_info.serial_number
+    filename = f"ducobox_archive_{serial_number}_{start}_{end}.csv"
+    path = Path(hass.config.path(filename))
+    count = await hass.async_add_executor_job(
+        export_csv, archive_directory(hass, serial_number), start, end, path
+    )
+    _LOGGER.info("%s archived rows exported to %s", count, path)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the DucoBox services."""
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=SERVICE_PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MEMORY_SNAPSHOT,
+        _async_memory_snapshot,
+        schema=SERVICE_MEMORY_SNAPSHOT_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RECORD, _async_record, schema=SERVICE_RECORD_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_ARCHIVE,
+        _async_export_archive,
+        schema=SERVICE_EXPORT_ARCHIVE_SCHEMA,
+    )
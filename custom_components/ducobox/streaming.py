@@ -0,0 +1,137 @@
+"""Incremental parsing of Duco Connectivity Board 2.0 node responses."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any
+
+_NODES_ARRAY = re.compile(r'"Nodes"\s*:\s*\[')
+# The strings, which may contain brackets, and the brackets of a JSON value. A
+# string that is not terminated yet extends to the end of the text.
+_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[{}\[\]]', re.DOTALL)
+_WHITESPACE = " \t\n\r"
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    """Return the position of the next character that is not whitespace."""
+    while position < len(text) and text[position] in _WHITESPACE:
+        position += 1
+    return position
+
+
+def _value_end(text: str, position: int) -> int | None:
+    """Return the end of the object or array at a position, or None if incomplete."""
+    depth = 0
+    for token in _TOKENS.finditer(text, position):
+        if token[0] in "{[":
+            depth += 1
+        elif token[0] in "}]":
+            depth -= 1
+            if not depth:
+                return token.end()
+    return None
+
+
+class DucoBoxNodeStreamParser:
+    """
+    Parse the node objects of an /info/nodes response body while it is received.
+
+    Every node object is decoded as soon as it is complete, and only the part of
+    the body after the last complete node object is kept, so the memory held is
+    bounded by the largest node instead of the whole body.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_nodes = False
+        # The characters that may follow in the nodes array, besides whitespace.
+        self._expected = "{]"
+        self._done = False
+        self._closed_body = False
+
+    def feed(self, chunk: bytes) -> list[dict[str, Any]]:
+        """
+        Add a chunk of the body and return the node objects it completed.
+
+        Raises:
+            ValueError: If the body is not valid UTF-8 or the nodes are invalid.
+
+        """
+        text = self._text_decoder.decode(chunk)
+        if self._done:
+            self._feed_trailer(text)
+            return []
+
+        self._buffer += text
+        if not self._in_nodes:
+            match = _NODES_ARRAY.search(self._buffer)
+            if match is None:
+                return []
+            self._buffer = self._buffer[match.end() :]
+            self._in_nodes = True
+
+        buffer = self._buffer
+        nodes: list[dict[str, Any]] = []
+        position = 0
+        while (position := _skip_whitespace(buffer, position)) < len(buffer):
+            if (char := buffer[position]) not in self._expected:
+                msg = f"Unexpected {char!r} in the nodes"
+                raise ValueError(msg)
+            if char == "]":
+                self._done = True
+                self._buffer = ""
+                self._feed_trailer(buffer[position + 1 :])
+                return nodes
+            if char == ",":
+                self._expected = "{"
+                position += 1
+                continue
+            try:
+                node, position = self._json_decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # A complete node object that cannot be decoded is invalid.
+                if _value_end(buffer, position) is not None:
+                    raise
+                # The node object is not complete yet.
+                break
+            nodes.append(node)
+            self._expected = ",]"
+
+        self._buffer = buffer[position:]
+        return nodes
+
+    def _feed_trailer(self, text: str) -> None:
+        """Check the part of the body after the nodes, without keeping it."""
+        for char in text:
+            if char in _WHITESPACE:
+                continue
+            if char != "}" or self._closed_body:
+                msg = f"Unexpected {char!r} after the nodes"
+                raise ValueError(msg)
+            self._closed_body = True
+
+    def close(self) -> None:
+        """
+        Check that the body was complete.
+
+        Raises:
+            ValueError: If the body ended within the nodes, or is not valid JSON.
+
+        """
+        text = self._text_decoder.decode(b"", final=True)
+        if self._done:
+            self._feed_trailer(text)
+            if not self._closed_body:
+                msg = "Incomplete response after the nodes"
+                raise ValueError(msg)
+            return
+        if self._in_nodes:
+            msg = "Incomplete or invalid node in response"
+            raise ValueError(msg)
+        # A body without nodes is held completely, so it can be validated.
+        json.loads(self._buffer + text)
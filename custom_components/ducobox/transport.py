@@ -0,0 +1,61 @@
+"""Transport selection for the DucoBox integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import DucoBoxHttpTransport, DucoBoxTransport, DucoConnectivityBoardApi
+from .const import (
+    CONF_FIXTURE,
+    CONF_REPLAY_SPEED,
+    CONF_TRANSPORT,
+    TRANSPORT_REPLAY,
+)
+from .recording import DucoBoxReplayTransport
+from .watchdog import DucoBoxBlockingWatchdog
+
+
+@callback
+def async_create_api(
+    hass: HomeAssistant,
+    data: Mapping[str, Any],
+    *,
+    watchdog: DucoBoxBlockingWatchdog | None = None,
+    executor_decode_threshold: int | None = None,
+) -> DucoConnectivityBoardApi:
+    """
+    Create an API client using the transport configured for a board.
+
+    The replay transport is not offered in the config flow, it is meant for
+    config entries set up by performance tests from a recorded fixture.
+
+    Args:
+        hass: The Home Assistant instance.
+        data: The config entry data with the host and transport of the board.
+        watchdog: The watchdog measuring the synchronous decoding and parsing.
+        executor_decode_threshold: The size in bytes above which HTTP node
+            responses are decoded and parsed in an executor.
+
+    """
+    transport: DucoBoxTransport
+    if data.get(CONF_TRANSPORT) == TRANSPORT_REPLAY:
+        transport = DucoBoxReplayTransport(
+            Path(data[CONF_FIXTURE]),
+            speed=data.get(CONF_REPLAY_SPEED, 1.0),
+            watchdog=watchdog,
+            executor_decode_threshold=executor_decode_threshold,
+        )
+    else:
+        transport = DucoBoxHttpTransport(
+            data[CONF_HOST],
+            async_get_clientsession(hass),
+            watchdog=watchdog,
+            executor_decode_threshold=executor_decode_threshold,
+        )
+    return DucoConnectivityBoardApi(transport)
@@ -0,0 +1,207 @@
+"""Local HTTP view serving the latest DucoBox data of a config entry."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.util import dt as dt_util
+
+from .api import BOX_PARAMETERS
+from .const import DOMAIN, DUCOBOX_NODE_TYPE_BOX
+from .coordinator import DucoBoxConfigEntry
+from .models import DucoBoxNode
+
+# The module and parameter of the /info/nodes response of every node field.
+NODE_PARAMETER_FIELDS: tuple[tuple[str, str, str], ...] = (
+    ("General", "Type", "node_type"),
+    ("General", "Parent", "parent_node_id"),
+    ("General", "Name", "name"),
+    ("General", "NetworkType", "network_type"),
+    ("Ventilation", "State", "state"),
+    ("Ventilation", "TimeStateRemain", "time_state_remain"),
+    ("Ventilation", "TimeStateEnd", "time_state_end"),
+    ("Ventilation", "Mode", "mode"),
+    ("Ventilation", "FlowLvlTgt", "flow_lvl_tgt"),
+    ("Sensor", "Rh", "rh"),
+    ("Sensor", "IaqRh", "iaq_rh"),
+    ("Sensor", "Co2", "co2"),
+    ("Sensor", "IaqCo2", "iaq_co2"),
+)
+
+
+def render_node(node: DucoBoxNode) -> dict[str, Any]:
+    """Render a node as a node object of an /info/nodes response."""
+    data: dict[str, Any] = {"Node": node.node_id}
+    for module, parameter, field in NODE_PARAMETER_FIELDS:
+        if (value := getattr(node, field)) is not None:
+            data.setdefault(module, {})[parameter] = {"Val": value}
+    return data
+
+
+def render_box_parameters(node: DucoBoxNode) -> dict[str, Any]:
+    """Render the box-level parameters of the box node as an /info response."""
+    data: dict[str, Any] = {}
+    for param in BOX_PARAMETERS:
+        if (value := getattr(node, param.field)) is None:
+            continue
+        if param.scale != 1:
+            value = round(value / param.scale)
+        module, submodule, parameter = param.keys
+        data.setdefault(module, {}).setdefault(submodule, {})[parameter] = {
+            "Val": value
+        }
+    return data
+
+
+@dataclass(slots=True)
+class _RenderedData:
+    """The rendered body of the data of a config entry, and its validators."""
+
+    nodes: dict[int, DucoBoxNode]
+    options: dict[int, list[str]]
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+class DucoBoxNodesView(HomeAssistantView):
+    """
+    Serve the latest nodes, box information and options of a DucoBox.
+
+    The response is rendered from the data of the coordinators, so consumers
+    share the polls of the integration instead of polling the board. It is
+    rendered once per update of the data, and a conditional request for data
+    that did not change is answered with 304 Not Modified.
+    """
+
+    url = "/api/ducobox/{entry_id}/info/nodes"
+    name = "api:ducobox:info:nodes"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._rendered: dict[str, _RenderedData] = {}
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the latest data of the DucoBox of a config entry."""
+        hass = request.app[KEY_HASS]
+        entry: DucoBoxConfigEntry | None = hass.config_entries.async_get_entry(entry_id)
+        if (
+            entry is None
+            or entry.domain != DOMAIN
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            self._rendered.pop(entry_id, None)
+            return self.json_message(
+                f"DucoBox config entry {entry_id} is not loaded", HTTPStatus.NOT_FOUND
+            )
+
+        rendered = self._render(entry)
+        coordinator = entry.runtime_data.coordinator
+        headers = {
+            "ETag": rendered.etag,
+            "Last-Modified": format_datetime(rendered.last_modified, usegmt=True),
+            "X-DucoBox-Last-Update-Success": str(
+                coordinator.last_update_success
+            ).lower(),
+        }
+        # The data is as old as the last poll of the board, and is refreshed
+        # by the next poll.
+        if coordinator.last_updated is not None:
+            age = max((dt_util.utcnow() - coordinator.last_updated).total_seconds(), 0)
+            interval = (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval is not None
+                else 0
+            )
+            headers["Age"] = str(int(age))
+            headers["Cache-Control"] = f"private, max-age={int(max(interval - age, 0))}"
+        else:
+            headers["Cache-Control"] = "private, no-cache"
+
+        if _is_not_modified(request, rendered):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        return web.Response(
+            body=rendered.body, content_type="application/json", headers=headers
+        )
+
+    def _render(self, entry: DucoBoxConfigEntry) -> _RenderedData:
+        """Render the data of a config entry, unless it did not change."""
+        coordinator = entry.runtime_data.coordinator
+        options_coordinator = entry.runtime_data.options_coordinator
+        rendered = self._rendered.get(entry.entry_id)
+        if (
+            rendered is not None
+            and rendered.nodes is coordinator.data
+            and rendered.options is options_coordinator.data
+        ):
+            return rendered
+
+        box_node = next(
+            (
+                node
+                for node in coordinator.data.values()
+                if node.node_type == DUCOBOX_NODE_TYPE_BOX
+            ),
+            None,
+        )
+        box_info = coordinator.box_info
+        body = json.dumps(
+            {
+                "Nodes": [render_node(node) for node in coordinator.data.values()],
+                "Info": render_box_parameters(box_node) if box_node else {},
+                "Box": {
+                    "Model": box_info.model,
+                    "SerialNumber": box_info.serial_number,
+                    "MacAddress": box_info.mac_address,
+                    "FirmwareVersion": box_info.firmware_version,
+                },
+                "VentilationStateOptions": {
+                    str(node_id): list(options)
+                    for node_id, options in options_coordinator.data.items()
+                },
+            },
+            separators=(",", ":"),
+        ).encode()
+
+        if rendered is None or rendered.body != body:
+            rendered = _RenderedData(
+                nodes=coordinator.data,
+                options=options_coordinator.data,
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                last_modified=(coordinator.last_updated or dt_util.utcnow()).replace(
+                    microsecond=0
+                ),
+            )
+        else:
+            rendered.nodes = coordinator.data
+            rendered.options = options_coordinator.data
+        self._rendered[entry.entry_id] = rendered
+        return rendered
+
+
+def _is_not_modified(request: web.Request, rendered: _RenderedData) -> bool:
+    """Return True if the client already has the rendered data."""
+    if (if_none_match := request.headers.get("If-None-Match")) is not None:
+        return if_none_match.strip() == "*" or rendered.etag in {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+
+    if (if_modified_since := request.headers.get("If-Modified-Since")) is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return since.tzinfo is not None and rendered.last_modified <= since
+
+    return False
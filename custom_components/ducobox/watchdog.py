@@ -0,0 +1,121 @@
+"""Event loop blocking watchdog for the DucoBox integration."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+_LOGGER = logging.getLogger(__name__)
+
+# The stages of the update cycle of the current context, if any.
+_STAGES: ContextVar[dict[str, float] | None] = ContextVar(
+    "ducobox_stages", default=None
+)
+# The profile of the stages measured in the current context, if any.
+_PROFILE: ContextVar[cProfile.Profile | None] = ContextVar(
+    "ducobox_profile", default=None
+)
+
+
+@contextmanager
+def profile_stages(profile: cProfile.Profile) -> Iterator[None]:
+    """
+    Profile the stages measured in the current context.
+
+    Only the synchronous stages are profiled, so the profile does not include
+    the other work the event loop runs while the context awaits.
+    """
+    token = _PROFILE.set(profile)
+    try:
+        yield
+    finally:
+        _PROFILE.reset(token)
+
+
+class DucoBoxBlockingWatchdog:
+    """
+    Measure the synchronous time spent on the event loop per update cycle.
+
+    The stages of a cycle are accumulated in a context of its own, so the
+    cycles of the coordinators sharing an API, and the requests of services
+    outside any cycle, are not charged to each other.
+    """
+
+    def __init__(self, budget: float | None = None) -> None:
+        """
+        Initialize the watchdog.
+
+        Args:
+            budget: The synchronous time in seconds an update cycle may spend on
+                the event loop before a warning is logged, or None to never warn.
+
+        """
+        self.budget = budget
+        # The stages of the last cycle of every name.
+        self.last_cycles: dict[str, dict[str, float]] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Measure the time spent in a stage of the current update cycle."""
+        # A nested stage is profiled as part of the outer one.
+        token = None
+        if (profile := _PROFILE.get()) is not None:
+            token = _PROFILE.set(None)
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler, e.g. of Home Assistant, is running.
+                profile = None
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            if token is not None:
+                _PROFILE.reset(token)
+            if (stages := _STAGES.get()) is not None:
+                stages[stage] = stages.get(stage, 0.0) + elapsed
+
+    @contextmanager
+    def cycle(self, name: str) -> Iterator[dict[str, float]]:
+        """
+        Measure an update cycle run in the current context.
+
+        Yields:
+            The time spent in every stage of the cycle, which is complete once
+            the cycle finished.
+
+        """
+        stages: dict[str, float] = {}
+        token = _STAGES.set(stages)
+        try:
+            yield stages
+        finally:
+            _STAGES.reset(token)
+            self._finish_cycle(name, stages)
+
+    def _finish_cycle(self, name: str, stages: dict[str, float]) -> None:
+        """Finish an update cycle, warning if it exceeded the budget."""
+        self.last_cycles[name] = stages
+
+        total = sum(stages.values())
+        if self.budget is None or total <= self.budget:
+            return
+
+        _LOGGER.warning(
+            "%s blocked the event loop for %.1f ms, exceeding the budget of "
+            "%.1f ms (%s)",
+            name,
+            total * 1000,
+            self.budget * 1000,
+            ", ".join(
+                f"{stage}: {elapsed * 1000:.1f} ms" for stage, elapsed in stages.items()
+            ),
+        )
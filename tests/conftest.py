@@ -0,0 +1,71 @@
+"""Fixtures running the integration in a bare Home Assistant against a simulator."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.ducobox.const import DOMAIN
+from tools.simulator import SimulatedBoard, SimulatedNode
+from tools.soak import async_start_hass
+
+type SetupEntry = Callable[..., Awaitable[ConfigEntry]]
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path: Path) -> AsyncIterator[HomeAssistant]:
+    """Start a bare Home Assistant."""
+    hass = await async_start_hass(tmp_path)
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest.fixture
+def board() -> SimulatedBoard:
+    """Return a simulated board with a few nodes."""
+    return SimulatedBoard("SIM00000001", 5)
+
+
+@pytest.fixture
+def steady_board(
+    board: SimulatedBoard, monkeypatch: pytest.MonkeyPatch
+) -> SimulatedBoard:
+    """Return the simulated board, with sensor values that only change when set."""
+    monkeypatch.setattr(SimulatedNode, "step", lambda _node: None)
+    return board
+
+
+@pytest_asyncio.fixture
+async def setup_entry(
+    hass: HomeAssistant, board: SimulatedBoard
+) -> AsyncIterator[SetupEntry]:
+    """Serve the simulated board and return a function adding a config entry."""
+    host = await board.async_start()
+
+    async def setup(options: dict[str, Any] | None = None) -> ConfigEntry:
+        entry = ConfigEntry(
+            data={CONF_HOST: host},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options=options or {},
+            source=SOURCE_USER,
+            subentries_data=None,
+            title=board.serial_number,
+            unique_id=board.serial_number,
+            version=1,
+        )
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        return entry
+
+    yield setup
+    await board.async_stop()
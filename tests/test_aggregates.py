@@ -0,0 +1,101 @@
+"""Tests of the whole-house aggregates."""
+
+from __future__ import annotations
+
+import random
+from statistics import fmean
+
+import pytest
+
+from custom_components.ducobox.aggregates import (
+    MAXIMUM_FIELDS,
+    MEAN_FIELDS,
+    DucoBoxAggregates,
+)
+from custom_components.ducobox.models import DucoBoxNode
+
+
+def _random_node(rng: random.Random, node_id: int) -> DucoBoxNode:
+    # Few distinct values, so maximums are often shared by several nodes.
+    def value() -> int | None:
+        return rng.choice([None, *range(5)])
+
+    return DucoBoxNode(node_id, "VLV", 1, co2=value(), flow_lvl_tgt=value(), rh=value())
+
+
+def _recompute(nodes: dict[int, DucoBoxNode]) -> dict[str, int | float | None]:
+    expected: dict[str, int | float | None] = {}
+    for field in MAXIMUM_FIELDS:
+        values = [
+            v for node in nodes.values() if (v := getattr(node, field)) is not None
+        ]
+        expected[f"max_{field}"] = max(values, default=None)
+    for field in MEAN_FIELDS:
+        values = [
+            v for node in nodes.values() if (v := getattr(node, field)) is not None
+        ]
+        expected[f"mean_{field}"] = fmean(values) if values else None
+    return expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_update_matches_recompute(seed: int) -> None:
+    """Test that incremental updates match a full recompute of the aggregates."""
+    rng = random.Random(seed)
+    aggregates = DucoBoxAggregates()
+    nodes: dict[int, DucoBoxNode] = {}
+
+    for _ in range(200):
+        changed = [
+            _random_node(rng, node_id)
+            for node_id in rng.sample(range(2, 20), rng.randint(0, 6))
+        ]
+        removed = {
+            node_id
+            for node_id in rng.sample(range(2, 20), rng.randint(0, 3))
+            if node_id not in {node.node_id for node in changed}
+        }
+        # The box itself is not part of the aggregates.
+        if rng.random() < 0.2:
+            changed.append(DucoBoxNode(1, "BOX", 0, co2=100, flow_lvl_tgt=100, rh=100))
+
+        aggregates.update(changed, removed)
+        nodes.update(
+            (node.node_id, node) for node in changed if node.node_type != "BOX"
+        )
+        for node_id in removed:
+            nodes.pop(node_id, None)
+
+        expected = _recompute(nodes)
+        assert aggregates.as_dict() == pytest.approx(expected)
+        for field in (*MAXIMUM_FIELDS, *MEAN_FIELDS):
+            assert aggregates.count(field) == sum(
+                getattr(node, field) is not None for node in nodes.values()
+            )
+
+
+def test_maximum_after_change_and_removal() -> None:
+    """Test that the maximum falls back to the next value only when it is gone."""
+    aggregates = DucoBoxAggregates()
+    aggregates.update(
+        [
+            DucoBoxNode(2, "VLV", 1, co2=900),
+            DucoBoxNode(3, "VLV", 1, co2=900),
+            DucoBoxNode(4, "VLV", 1, co2=600),
+        ]
+    )
+    assert aggregates.maximum("co2") == 900
+
+    # Another node still reports the maximum.
+    aggregates.update([DucoBoxNode(2, "VLV", 1, co2=500)])
+    assert aggregates.maximum("co2") == 900
+
+    aggregates.update([], removed=[3])
+    assert aggregates.maximum("co2") == 600
+
+    aggregates.update([DucoBoxNode(4, "VLV", 1, co2=None)])
+    assert aggregates.maximum("co2") == 500
+
+    aggregates.update([], removed=[2, 4])
+    assert aggregates.maximum("co2") is None
+    assert aggregates.count("co2") == 0
@@ -0,0 +1,105 @@
+"""Tests of the Duco Connectivity Board API client."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientSession, web
+
+from custom_components.ducobox.api import (
+    DucoBoxHttpTransport,
+    DucoConnectivityBoardApi,
+    DucoConnectivityBoardApiError,
+)
+from tools.simulator import SimulatedBoard
+
+type Handler = Callable[[SimulatedBoard, web.Request], Awaitable[web.Response]]
+
+
+async def _invalid_json(_board: SimulatedBoard, _request: web.Request) -> web.Response:
+    return web.Response(body=b'{"General": ', content_type="application/json")
+
+
+async def _server_error(_board: SimulatedBoard, _request: web.Request) -> web.Response:
+    return web.Response(status=500)
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[ClientSession]:
+    """Return a client session."""
+    async with ClientSession() as session:
+        yield session
+
+
+async def _async_start(
+    board: SimulatedBoard, monkeypatch: pytest.MonkeyPatch, path: str, handler: Handler
+) -> str:
+    """Serve the board, answering a path with another handler."""
+    monkeypatch.setattr(
+        SimulatedBoard,
+        {"/info": "_handle_info", "/info/nodes": "_handle_nodes"}[path],
+        handler,
+    )
+    return await board.async_start()
+
+
+@pytest.mark.parametrize("handler", [_invalid_json, _server_error])
+@pytest.mark.asyncio
+async def test_box_parameters_failure(
+    board: SimulatedBoard,
+    session: ClientSession,
+    monkeypatch: pytest.MonkeyPatch,
+    handler: Handler,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that the nodes are fetched when the box parameters cannot be."""
+    host = await _async_start(board, monkeypatch, "/info", handler)
+    api = DucoConnectivityBoardApi(DucoBoxHttpTransport(host, session))
+    try:
+        nodes = await api.async_get_nodes()
+    finally:
+        await board.async_stop()
+
+    assert [node.node_id for node in nodes] == [node.node_id for node in board.nodes]
+    assert nodes[0].node_type == "BOX"
+    assert nodes[0].temp_sup is None
+    assert nodes[0].flow_lvl_tgt is not None
+    assert "Failed to fetch the box parameters" in caplog.text
+
+
+@pytest.mark.parametrize("executor_decode_threshold", [None, 0])
+@pytest.mark.asyncio
+async def test_invalid_nodes(
+    board: SimulatedBoard,
+    session: ClientSession,
+    monkeypatch: pytest.MonkeyPatch,
+    executor_decode_threshold: int | None,
+) -> None:
+    """Test that an invalid nodes response raises an API error."""
+    host = await _async_start(board, monkeypatch, "/info/nodes", _invalid_json)
+    api = DucoConnectivityBoardApi(
+        DucoBoxHttpTransport(
+            host, session, executor_decode_threshold=executor_decode_threshold
+        )
+    )
+    try:
+        with pytest.raises(DucoConnectivityBoardApiError):
+            await api.async_get_nodes()
+    finally:
+        await board.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_invalid_box_info(
+    board: SimulatedBoard, session: ClientSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an invalid box information response raises an API error."""
+    host = await _async_start(board, monkeypatch, "/info", _invalid_json)
+    api = DucoConnectivityBoardApi(DucoBoxHttpTransport(host, session))
+    try:
+        with pytest.raises(DucoConnectivityBoardApiError):
+            await api.async_get_box_info()
+    finally:
+        await board.async_stop()
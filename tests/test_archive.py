@@ -0,0 +1,170 @@
+"""Tests of the DucoBox telemetry archive."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from custom_components.ducobox.archive import (
+    ArchiveRow,
+    append_rows,
+    archive_path,
+    encode_block,
+    iter_blocks,
+    iter_rows,
+)
+
+START = datetime(2025, 1, 1, 12, tzinfo=UTC)
+
+
+def _rows(count: int, states: int = 3) -> list[ArchiveRow]:
+    return [
+        (
+            START + timedelta(seconds=10 * index, milliseconds=index % 7),
+            index % 5 + 1,
+            400 + index,
+            None if index % 3 else 50,
+            None if index % 4 else index % 100,
+            None if index % 2 else f"STATE{index // 2 % states}",
+        )
+        for index in range(count)
+    ]
+
+
+def _decode(path: Path) -> list[ArchiveRow]:
+    return [
+        row
+        for block in iter_blocks(path)
+        for row in zip(
+            block["time"],
+            block["node_id"],
+            block["co2"],
+            block["rh"],
+            block["flow_lvl_tgt"],
+            block["state"],
+            strict=True,
+        )
+    ]
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Test that the rows are decoded as they were encoded."""
+    rows = _rows(100)
+    path = tmp_path / "block.dca"
+    path.write_bytes(encode_block(rows))
+
+    assert _decode(path) == rows
+
+
+def test_round_trip_times(tmp_path: Path) -> None:
+    """Test that times going back and far apart survive the delta encoding."""
+    rows: list[ArchiveRow] = [
+        (START, 1, 400, 50, 10, "AUTO"),
+        (START - timedelta(milliseconds=1), 1, 400, 50, 10, "AUTO"),
+        (START + timedelta(days=1, milliseconds=999), 1, 400, 50, 10, "AUTO"),
+        (START + timedelta(days=1, milliseconds=999), 2, 400, 50, 10, "AUTO"),
+    ]
+    path = tmp_path / "block.dca"
+    path.write_bytes(encode_block(rows))
+
+    assert _decode(path) == rows
+
+
+def test_round_trip_missing(tmp_path: Path) -> None:
+    """Test that missing values and states are decoded as None."""
+    rows: list[ArchiveRow] = [
+        (START, 1, None, None, None, None),
+        (START, 2, 0, 0, 0, "AUTO"),
+        (START, 3, None, 100, None, None),
+    ]
+    path = tmp_path / "block.dca"
+    path.write_bytes(encode_block(rows))
+
+    assert _decode(path) == rows
+
+
+def test_round_trip_requested_columns(tmp_path: Path) -> None:
+    """Test that only the requested columns are decoded."""
+    rows = _rows(20)
+    path = tmp_path / "block.dca"
+    path.write_bytes(encode_block(rows) * 2)
+
+    blocks = list(iter_blocks(path, ("co2", "state")))
+
+    assert [set(block) for block in blocks] == [{"co2", "state"}] * 2
+    assert blocks[1]["co2"] == [row[2] for row in rows]
+    assert blocks[1]["state"] == [row[5] for row in rows]
+
+
+def test_state_limit() -> None:
+    """Test that a block holds at most 255 distinct states."""
+    encode_block(_rows(2 * 255, states=255))
+
+    with pytest.raises(ValueError, match="255"):
+        encode_block(_rows(2 * 256, states=256))
+
+
+def test_append_splits_states(tmp_path: Path) -> None:
+    """Test that rows with more distinct states are split into more blocks."""
+    rows = _rows(2 * 600, states=600)
+    append_rows(tmp_path, rows)
+
+    path = archive_path(tmp_path, START.date())
+    assert len(list(iter_blocks(path))) == 3
+    assert list(iter_rows(tmp_path, START.date(), START.date())) == rows
+
+
+def test_append_days(tmp_path: Path) -> None:
+    """Test that rows are appended to the files of their days."""
+    rows = _rows(10_000)
+    lengths: dict[Path, int] = {}
+    append_rows(tmp_path, rows[:5000], lengths)
+    append_rows(tmp_path, rows[5000:], lengths)
+
+    days = {row[0].date() for row in rows}
+    assert len(days) == 2
+    assert set(lengths) == {archive_path(tmp_path, day) for day in days}
+    assert all(path.stat().st_size == length for path, length in lengths.items())
+    assert list(iter_rows(tmp_path, min(days), max(days))) == rows
+
+
+def test_append_overwrites_incomplete_block(tmp_path: Path) -> None:
+    """Test that an incomplete block is ignored and overwritten."""
+    rows = _rows(20)
+    append_rows(tmp_path, rows[:10])
+    path = archive_path(tmp_path, START.date())
+    with path.open("ab") as file:
+        file.write(encode_block(rows)[:-1])
+
+    assert _decode(path) == rows[:10]
+
+    append_rows(tmp_path, rows[10:])
+
+    assert _decode(path) == rows
+
+
+@pytest.mark.parametrize("known", [True, False])
+def test_append_replaced_file(tmp_path: Path, *, known: bool) -> None:
+    """Test that a file that was replaced since the last write is scanned again."""
+    rows = _rows(30)
+    lengths: dict[Path, int] = {}
+    append_rows(tmp_path, rows[:10], lengths)
+    path = archive_path(tmp_path, START.date())
+    path.unlink()
+    if not known:
+        lengths.clear()
+
+    append_rows(tmp_path, rows[10:20], lengths)
+    append_rows(tmp_path, rows[20:], lengths)
+
+    assert _decode(path) == rows[10:]
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    """Test that an empty file has no blocks."""
+    path = tmp_path / "empty.dca"
+    path.touch()
+
+    assert list(iter_blocks(path)) == []
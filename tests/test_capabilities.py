@@ -0,0 +1,133 @@
+"""Tests of the persisted capabilities of Duco Connectivity Boards."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from dataclasses import replace
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientSession, web
+from homeassistant.core import HomeAssistant
+
+from custom_components.ducobox import capabilities
+from custom_components.ducobox.api import (
+    DucoBoxHttpTransport,
+    DucoConnectivityBoardApi,
+)
+from custom_components.ducobox.capabilities import DucoBoxCapabilityStore
+from custom_components.ducobox.models import DucoBoxCapabilities
+from tools.simulator import SimulatedBoard
+
+
+@pytest_asyncio.fixture
+async def api(board: SimulatedBoard) -> AsyncIterator[DucoConnectivityBoardApi]:
+    """Serve the simulated board and return an API client for it."""
+    host = await board.async_start()
+    async with ClientSession() as session:
+        yield DucoConnectivityBoardApi(DucoBoxHttpTransport(host, session))
+    await board.async_stop()
+
+
+@pytest.fixture
+def probes(monkeypatch: pytest.MonkeyPatch) -> list[DucoBoxCapabilities | None]:
+    """Record the capabilities probed from the boards."""
+    probed: list[DucoBoxCapabilities | None] = []
+    async_probe_capabilities = DucoConnectivityBoardApi.async_probe_capabilities
+
+    async def _async_probe_capabilities(
+        api: DucoConnectivityBoardApi,
+    ) -> DucoBoxCapabilities | None:
+        probed.append(await async_probe_capabilities(api))
+        return probed[-1]
+
+    monkeypatch.setattr(
+        DucoConnectivityBoardApi, "async_probe_capabilities", _async_probe_capabilities
+    )
+    return probed
+
+
+@pytest.mark.asyncio
+async def test_capabilities_stored(
+    hass: HomeAssistant,
+    api: DucoConnectivityBoardApi,
+    probes: list[DucoBoxCapabilities | None],
+) -> None:
+    """Test that a board is only probed once, also after a restart."""
+    box_info = await api.async_get_box_info()
+
+    stored = await DucoBoxCapabilityStore(hass).async_get(api, box_info)
+    assert stored is not None
+    assert stored.node_parameter_filter
+    assert "TempSup" in stored.box_parameters
+
+    # Another store loads the capabilities from storage.
+    assert await DucoBoxCapabilityStore(hass).async_get(api, box_info) == stored
+    assert probes == [stored]
+
+
+@pytest.mark.asyncio
+async def test_capabilities_key(
+    hass: HomeAssistant,
+    api: DucoConnectivityBoardApi,
+    probes: list[DucoBoxCapabilities | None],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a firmware update or other parameters probe the board again."""
+    box_info = await api.async_get_box_info()
+    store = DucoBoxCapabilityStore(hass)
+
+    await store.async_get(api, box_info)
+    updated = replace(box_info, firmware_version="18005.0.0.0")
+    await store.async_get(api, updated)
+    assert len(probes) == 2
+
+    monkeypatch.setattr(capabilities, "_PARAMETERS_HASH", "0123456789ab")
+    await store.async_get(api, updated)
+    assert len(probes) == 3
+
+    # Only the capabilities of the current firmware and parameters are kept.
+    await DucoBoxCapabilityStore(hass).async_get(api, updated)
+    await DucoBoxCapabilityStore(hass).async_get(api, box_info)
+    assert len(probes) == 4
+
+
+@pytest.mark.asyncio
+async def test_box_parameters_probe_failure(
+    hass: HomeAssistant,
+    board: SimulatedBoard,
+    monkeypatch: pytest.MonkeyPatch,
+    probes: list[DucoBoxCapabilities | None],
+) -> None:
+    """Test that a board failing the box parameters is not probed again."""
+    handle_info = SimulatedBoard._handle_info  # noqa: SLF001
+    failed: list[str] = []
+
+    async def _handle_info(board: SimulatedBoard, request: web.Request) -> web.Response:
+        if "TempSup" in (parameter := request.query.get("parameter", "")):
+            failed.append(parameter)
+            return web.Response(status=500)
+        return await handle_info(board, request)
+
+    monkeypatch.setattr(SimulatedBoard, "_handle_info", _handle_info)
+    host = await board.async_start()
+    try:
+        async with ClientSession() as session:
+            api = DucoConnectivityBoardApi(DucoBoxHttpTransport(host, session))
+            box_info = await api.async_get_box_info()
+
+            stored = await DucoBoxCapabilityStore(hass).async_get(api, box_info)
+            assert stored is not None
+            assert stored.box_parameters == ()
+            assert stored.node_parameter_filter
+
+            api.set_capabilities(stored)
+            nodes = await api.async_get_nodes()
+            assert await DucoBoxCapabilityStore(hass).async_get(api, box_info) == stored
+    finally:
+        await board.async_stop()
+
+    assert probes == [stored]
+    # Only the probe requested the box parameters.
+    assert len(failed) == 1
+    assert nodes[0].temp_sup is None
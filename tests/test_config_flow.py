@@ -0,0 +1,114 @@
+"""Tests of the DucoBox config flow."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from ipaddress import IPv4Network
+
+import pytest
+from homeassistant.config_entries import SOURCE_USER, ConfigFlow
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.data_entry_flow import (
+    EVENT_DATA_ENTRY_FLOW_PROGRESSED,
+    FlowResultType,
+)
+
+from custom_components.ducobox import config_flow
+from custom_components.ducobox.const import DOMAIN
+from custom_components.ducobox.models import DucoBoxInfo
+
+BOX_INFO = DucoBoxInfo(
+    model="Energy Premium", serial_number="SIM00000001", mac_address="00:00:00:00:00:01"
+)
+
+
+@callback
+def async_capture_events(hass: HomeAssistant, event_type: str) -> list[Event]:
+    """Record the events of a type that are fired."""
+    events: list[Event] = []
+    hass.bus.async_listen(event_type, events.append)
+    return events
+
+
+async def _async_start_scan(hass: HomeAssistant) -> str:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "scan"}
+    )
+    assert result["step_id"] == "scan"
+    return result["flow_id"]
+
+
+@pytest.mark.asyncio
+async def test_scan_network_too_large(hass: HomeAssistant) -> None:
+    """Test that a network of more than 1024 addresses is not scanned."""
+    flow_id = await _async_start_scan(hass)
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {config_flow.CONF_NETWORK: "10.0.0.0/21"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "network_too_large"}
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {config_flow.CONF_NETWORK: "10.0.0"}
+    )
+    assert result["errors"] == {"base": "invalid_network"}
+
+
+@pytest.mark.skipif(
+    not hasattr(ConfigFlow, "async_update_progress"),
+    reason="The scan progress needs the progress updates of Home Assistant 2025.10",
+)
+@pytest.mark.asyncio
+async def test_scan_network_streams_boards(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the boards found are shown while the scan continues."""
+    found = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def _async_scan_network(
+        _hass: HomeAssistant, network: IPv4Network
+    ) -> AsyncIterator[tuple[str, DucoBoxInfo | None]]:
+        hosts = [str(host) for host in network.hosts()]
+        # The probes complete after the progress is shown.
+        await asyncio.sleep(0)
+        yield hosts[0], None
+        yield hosts[1], BOX_INFO
+        found.set()
+        await resume.wait()
+        for host in hosts[2:]:
+            yield host, None
+
+    monkeypatch.setattr(config_flow, "async_scan_network", _async_scan_network)
+    flow_id = await _async_start_scan(hass)
+    progressed = async_capture_events(hass, EVENT_DATA_ENTRY_FLOW_PROGRESSED)
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {config_flow.CONF_NETWORK: "10.0.0.0/29"}
+    )
+    assert result["type"] is FlowResultType.SHOW_PROGRESS
+    assert result["description_placeholders"] == {
+        "network": "10.0.0.0/29",
+        "boards": "-",
+    }
+    await found.wait()
+
+    # The frontend loads the flow again when it is told it progressed.
+    assert [event.data["flow_id"] for event in progressed] == [flow_id]
+    result = await hass.config_entries.flow.async_configure(flow_id)
+    assert result["type"] is FlowResultType.SHOW_PROGRESS
+    assert result["description_placeholders"] == {
+        "network": "10.0.0.0/29",
+        "boards": "10.0.0.2",
+    }
+
+    resume.set()
+    await hass.async_block_till_done()
+    result = await hass.config_entries.flow.async_configure(flow_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "scan_results"
@@ -0,0 +1,53 @@
+"""Tests of the DucoBox coordinators."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.ducobox.coordinator import _estimate_board_clock_offset
+from custom_components.ducobox.models import DucoBoxNode
+
+RECEIVED = 1_750_000_000.0
+
+
+def _node(node_id: int, end: int | None, remain: int | None) -> DucoBoxNode:
+    return DucoBoxNode(node_id, "VLV", 1, time_state_end=end, time_state_remain=remain)
+
+
+@pytest.mark.parametrize("skew", [-3600, -2, 0, 2, 3600])
+def test_board_clock_offset(skew: int) -> None:
+    """Test that the offset of a skewed board clock is estimated."""
+    nodes = [
+        _node(2, round(RECEIVED) + skew + 900, 900),
+        _node(3, round(RECEIVED) + skew + 60, 60),
+    ]
+
+    offset = _estimate_board_clock_offset(nodes, RECEIVED)
+
+    assert offset == pytest.approx(skew, abs=1)
+
+
+def test_board_clock_offset_median() -> None:
+    """Test that a node reporting an inconsistent end does not skew the offset."""
+    nodes = [
+        _node(2, round(RECEIVED) + 10 + 900, 900),
+        _node(3, round(RECEIVED) + 10 + 60, 60),
+        _node(4, round(RECEIVED) + 5000, 60),
+    ]
+
+    assert _estimate_board_clock_offset(nodes, RECEIVED) == pytest.approx(10, abs=1)
+
+
+def test_board_clock_offset_no_countdown() -> None:
+    """Test that nodes without a running countdown do not tell the offset."""
+    nodes = [
+        # A state without an end, and an ended state reporting its old end.
+        _node(2, 0, 0),
+        _node(3, round(RECEIVED) - 100, 0),
+        _node(4, None, None),
+    ]
+
+    assert _estimate_board_clock_offset(nodes, RECEIVED) is None
+    assert _estimate_board_clock_offset(
+        [*nodes, _node(5, round(RECEIVED) + 30, 30)], RECEIVED
+    ) == pytest.approx(0, abs=1)
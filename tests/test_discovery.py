@@ -0,0 +1,152 @@
+"""Tests of the DucoBox discovery helpers."""
+
+from __future__ import annotations
+
+import asyncio
+from ipaddress import IPv4Network
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.ducobox import discovery
+from custom_components.ducobox.api import (
+    DucoConnectivityBoardApi,
+    DucoConnectivityBoardApiError,
+)
+from custom_components.ducobox.discovery import (
+    PROBE_CACHE_TTL,
+    DucoBoxProbeCache,
+    async_get_probe_cache,
+    async_scan_network,
+)
+from custom_components.ducobox.models import DucoBoxInfo
+
+BOX_INFO = DucoBoxInfo(
+    model="Energy Premium", serial_number="SIM00000001", mac_address="00:00:00:00:00:01"
+)
+
+
+class _Clock:
+    """A monotonic clock that only advances when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace the clock of the probe cache."""
+    clock = _Clock()
+    monkeypatch.setattr(discovery, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def probes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace the probe of a board, and return the probed hosts."""
+    probed: list[str] = []
+
+    async def _async_get_box_info(_cache: DucoBoxProbeCache, host: str) -> DucoBoxInfo:
+        probed.append(host)
+        await asyncio.sleep(0)
+        return BOX_INFO
+
+    monkeypatch.setattr(DucoBoxProbeCache, "_async_get_box_info", _async_get_box_info)
+    return probed
+
+
+@pytest.mark.asyncio
+async def test_probe_cache_ttl(
+    hass: HomeAssistant, clock: _Clock, probes: list[str]
+) -> None:
+    """Test that a probe is cached until it expires."""
+    cache = async_get_probe_cache(hass)
+    assert async_get_probe_cache(hass) is cache
+
+    assert await cache.async_probe("10.0.0.2", {"a": "1"}) == BOX_INFO
+    clock.now += PROBE_CACHE_TTL - 1
+    assert await cache.async_probe("10.0.0.2", {"a": "1"}) == BOX_INFO
+    assert probes == ["10.0.0.2"]
+
+    # A changed announcement is probed again.
+    await cache.async_probe("10.0.0.2", {"a": "2"})
+    assert probes == ["10.0.0.2"] * 2
+
+    clock.now += 1
+    await cache.async_probe("10.0.0.2", {"a": "1"})
+    assert probes == ["10.0.0.2"] * 3
+
+
+@pytest.mark.asyncio
+async def test_probe_cache_concurrent(
+    hass: HomeAssistant, clock: _Clock, probes: list[str]
+) -> None:
+    """Test that concurrent probes of a host share a single request."""
+    cache = DucoBoxProbeCache(hass)
+
+    results = await asyncio.gather(
+        cache.async_probe("10.0.0.2", {"a": "1"}),
+        cache.async_probe("10.0.0.2", {"a": "2"}),
+        cache.async_probe("10.0.0.3", {"a": "1"}),
+    )
+
+    assert results == [BOX_INFO] * 3
+    assert sorted(probes) == ["10.0.0.2", "10.0.0.3"]
+    # Both announcements of the first host are cached now.
+    clock.now += 1
+    await cache.async_probe("10.0.0.2", {"a": "2"})
+    assert sorted(probes) == ["10.0.0.2", "10.0.0.3"]
+
+
+@pytest.mark.asyncio
+async def test_probe_cache_cancelled(hass: HomeAssistant, probes: list[str]) -> None:
+    """Test that a cancelled caller does not cancel the probe shared with others."""
+    cache = DucoBoxProbeCache(hass)
+
+    first = asyncio.create_task(cache.async_probe("10.0.0.2", {}))
+    second = asyncio.create_task(cache.async_probe("10.0.0.2", {"a": "1"}))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == BOX_INFO
+    assert first.cancelled()
+    assert probes == ["10.0.0.2"]
+
+
+@pytest.mark.asyncio
+async def test_scan_network(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a scan probes every host with bounded concurrency."""
+    monkeypatch.setattr(discovery, "SCAN_CONCURRENCY", 4)
+    active = 0
+    max_active = 0
+
+    async def _async_get_box_info(api: DucoConnectivityBoardApi) -> DucoBoxInfo:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        try:
+            await asyncio.sleep(0.001)
+        finally:
+            active -= 1
+        if api.transport._base_url == "http://10.0.0.7":  # noqa: SLF001
+            return BOX_INFO
+        raise DucoConnectivityBoardApiError
+
+    monkeypatch.setattr(
+        DucoConnectivityBoardApi, "async_get_box_info", _async_get_box_info
+    )
+
+    results = [
+        result async for result in async_scan_network(hass, IPv4Network("10.0.0.0/27"))
+    ]
+
+    assert sorted(host for host, _ in results) == sorted(
+        f"10.0.0.{index}" for index in range(1, 31)
+    )
+    assert [host for host, box_info in results if box_info is not None] == ["10.0.0.7"]
+    assert max_active == 4
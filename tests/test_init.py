@@ -0,0 +1,64 @@
+"""Tests of the setup and unload of DucoBox config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+import custom_components.ducobox as integration
+from custom_components.ducobox.const import CONF_LONG_TERM_STATISTICS
+from custom_components.ducobox.long_term_statistics import DucoBoxStatisticsBuffer
+
+from .conftest import SetupEntry
+
+SNAPSHOT_TTL = 0.1
+
+
+@pytest.fixture
+def flushes(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> list[bool]:
+    """Enable the statistics buffer, and return the partial flag of every flush."""
+    flushed: list[bool] = []
+
+    def _async_flush(
+        _buffer: DucoBoxStatisticsBuffer, *, partial: bool = False
+    ) -> None:
+        flushed.append(partial)
+
+    hass.config.components.add("recorder")
+    monkeypatch.setattr(DucoBoxStatisticsBuffer, "async_flush", _async_flush)
+    monkeypatch.setattr(integration, "UPDATE_INTERVAL", timedelta(seconds=SNAPSHOT_TTL))
+    return flushed
+
+
+@pytest.mark.asyncio
+async def test_snapshot_expires(
+    hass: HomeAssistant, setup_entry: SetupEntry, flushes: list[bool]
+) -> None:
+    """Test that a snapshot that is not restored is discarded and flushed."""
+    entry = await setup_entry({CONF_LONG_TERM_STATISTICS: True})
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    snapshots = hass.data[integration._DATA_RELOAD_SNAPSHOTS]  # noqa: SLF001
+    assert entry.entry_id in snapshots
+
+    await asyncio.sleep(SNAPSHOT_TTL * 2)
+    assert entry.entry_id not in snapshots
+    assert flushes == [True]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_restored(
+    hass: HomeAssistant, setup_entry: SetupEntry, flushes: list[bool]
+) -> None:
+    """Test that a restored snapshot keeps its statistics buffer when it expires."""
+    entry = await setup_entry({CONF_LONG_TERM_STATISTICS: True})
+    statistics = entry.runtime_data.coordinator.statistics
+    assert statistics is not None
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    assert entry.runtime_data.coordinator.statistics is statistics
+
+    await asyncio.sleep(SNAPSHOT_TTL * 2)
+    assert flushes == []
@@ -0,0 +1,93 @@
+"""Tests of the Modbus TCP transport."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+
+import pytest
+
+from custom_components.ducobox.api import DucoConnectivityBoardApiError
+from custom_components.ducobox.modbus import (
+    MAX_READ_REGISTERS,
+    NODE_REGISTER_BLOCK,
+    NODE_REGISTER_COUNT,
+    READ_INPUT_REGISTERS,
+    DucoBoxModbusTransport,
+    plan_reads,
+)
+
+
+@pytest.mark.parametrize(
+    ("addresses", "count", "reads"),
+    [
+        ([], 12, []),
+        ([100], 12, [(100, 12)]),
+        # Adjacent and unsorted blocks are read at once.
+        ([112, 100, 124], 12, [(100, 36)]),
+        # Gaps between blocks are read along.
+        ([100, 200], 12, [(100, 112)]),
+        # A read ends before it exceeds the maximum register count.
+        ([100, 100 + MAX_READ_REGISTERS - 12], 12, [(100, MAX_READ_REGISTERS)]),
+        ([100, 100 + MAX_READ_REGISTERS - 11], 12, [(100, 12), (214, 12)]),
+    ],
+)
+def test_plan_reads(
+    addresses: list[int], count: int, reads: list[tuple[int, int]]
+) -> None:
+    """Test that the register blocks are coalesced into contiguous reads."""
+    assert plan_reads(addresses, count) == reads
+
+
+def test_plan_reads_nodes() -> None:
+    """Test that the reads cover every node block within the maximum size."""
+    addresses = [NODE_REGISTER_BLOCK * node for node in (1, 2, 3, 5, 8, 13, 40)]
+
+    reads = plan_reads(addresses, NODE_REGISTER_COUNT)
+
+    assert all(count <= MAX_READ_REGISTERS for _start, count in reads)
+    assert all(
+        any(
+            start <= address and address + NODE_REGISTER_COUNT <= start + count
+            for start, count in reads
+        )
+        for address in addresses
+    )
+
+
+@pytest.mark.parametrize(
+    "pdu",
+    [
+        b"",
+        bytes([READ_INPUT_REGISTERS]),
+        bytes([READ_INPUT_REGISTERS | 0x80]),
+        bytes([READ_INPUT_REGISTERS, 32]) + bytes(8),
+        bytes([READ_INPUT_REGISTERS + 1, 2, 0, 0]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_malformed_response(pdu: bytes) -> None:
+    """Test that an empty, short or mismatched response is rejected."""
+
+    async def _handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        transaction_id, _, length, unit_id = struct.unpack(
+            ">HHHB", await reader.readexactly(7)
+        )
+        await reader.readexactly(length - 1)
+        writer.write(
+            struct.pack(">HHHB", transaction_id, 0, len(pdu) + 1, unit_id) + pdu
+        )
+        await writer.drain()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = DucoBoxModbusTransport("127.0.0.1", port, timeout=5)
+    try:
+        with pytest.raises(DucoConnectivityBoardApiError):
+            await transport.async_get_box_info()
+    finally:
+        await transport.async_close()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,163 @@
+"""Tests of the phase-aligned poll scheduling."""
+
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from custom_components.ducobox.models import DucoBoxNode
+from custom_components.ducobox.scheduling import (
+    MIN_PERIOD,
+    POLL_MARGIN,
+    DucoBoxPollScheduler,
+    _count,
+    _fit,
+    _limit,
+)
+
+PERIOD = 30.0
+
+
+@pytest.mark.parametrize(
+    ("interval", "expected"),
+    [
+        # The update is one period after the update within the first interval.
+        (((10, 11), 1), (9, 11)),
+        (((10, 11), 2), (5, 5.5)),
+        (((-11, -10), -1), (10, 12)),
+        # The same update in overlapping intervals does not limit the period.
+        (((0.5, 2), 0), (5, 600)),
+        (((2, 3), 0), None),
+        (((1000, 1001), 1), None),
+    ],
+)
+def test_limit(
+    interval: tuple[tuple[float, float], int], expected: tuple[float, float] | None
+) -> None:
+    """Test the range of periods left by counting an interval."""
+    assert _limit([((0, 1), 0)], interval, 5, 600) == expected
+
+
+def test_count() -> None:
+    """Test that an interval is counted in every way that leaves a period."""
+    branch = (5.0, 600.0, [((0.0, 1.0), 0)])
+
+    assert _count(branch, (10.0, 11.0), (0.0, 1.0)) == [
+        (9.0, 11.0, [((0.0, 1.0), 0), ((10.0, 11.0), 1)]),
+        (5.0, 5.5, [((0.0, 1.0), 0), ((10.0, 11.0), 2)]),
+    ]
+
+
+def test_count_long_interval() -> None:
+    """Test that an interval does not count for the periods it is longer than."""
+    branch = (5.0, 20.0, [((0.0, 1.0), 0)])
+
+    assert _count(branch, (30.0, 60.0), (0.0, 1.0)) == [branch]
+    branches = _count(branch, (30.0, 40.0), (0.0, 1.0))
+    assert branches[0] == (5.0, 10.0, [((0.0, 1.0), 0)])
+    assert all(low >= 10 for low, _high, _counted in branches[1:])
+
+
+def test_fit() -> None:
+    """Test that the period and phase are fitted to irregular intervals."""
+    rng = random.Random(0)
+    changes = []
+    start = 0.0
+    while len(changes) < 8:
+        end = start + rng.uniform(10, 25)
+        if math.floor((end - 7) / PERIOD) != math.floor((start - 7) / PERIOD):
+            changes.append((start, end))
+        start = end
+
+    cadences = _fit(changes, min(changes, key=lambda change: change[1] - change[0]))
+
+    assert all(cadence.period >= MIN_PERIOD for cadence in cadences)
+    assert any(
+        abs(cadence.period - PERIOD) <= cadence.spread
+        and cadence.earliest <= 7 + PERIOD * math.floor((cadence.latest - 7) / PERIOD)
+        for cadence in cadences
+    )
+
+
+def _simulate(
+    scheduler: DucoBoxPollScheduler, phases: dict[int, float], period: float, polls: int
+) -> list[float]:
+    """Poll a board updating every node on its phase, and return the freshness."""
+    random.seed(0)
+
+    def nodes(now: float) -> dict[int, DucoBoxNode]:
+        return {
+            node_id: DucoBoxNode(
+                node_id, "VLVCO2", 1, co2=400 + math.floor((now - phase) / period)
+            )
+            for node_id, phase in phases.items()
+        }
+
+    now = 1000.0
+    previous = nodes(now)
+    freshness = []
+    for _ in range(polls):
+        current = nodes(now)
+        scheduler.record(
+            now,
+            previous,
+            [node for node in current.values() if node != previous[node.node_id]],
+        )
+        previous = current
+        freshness.append(min((now - phase) % period for phase in phases.values()))
+        now += scheduler.next_interval(now)
+    return freshness
+
+
+def _periods(scheduler: DucoBoxPollScheduler) -> dict[str, float]:
+    fields = scheduler.as_dict()["fields"]
+    assert isinstance(fields, dict)
+    return {key: field["period"] for key, field in fields.items()}
+
+
+@pytest.mark.parametrize("period", [30, 45, 60])
+def test_next_interval_converges(period: float) -> None:
+    """Test that the polls align with the updates of a periodic board."""
+    scheduler = DucoBoxPollScheduler(30, 60)
+    scheduler.set_adaptive(True)
+
+    freshness = _simulate(scheduler, {2: 7.0}, period, 300)
+
+    assert _periods(scheduler) == {"2 co2": pytest.approx(period, abs=1)}
+    # Apart from the probes, the later polls are just after an update.
+    assert sorted(freshness[-100:])[75] <= POLL_MARGIN + 1
+
+
+def test_next_interval_converges_nodes() -> None:
+    """Test that the updates of nodes with different phases are learned apart."""
+    scheduler = DucoBoxPollScheduler(30, 60)
+    scheduler.set_adaptive(True)
+
+    freshness = _simulate(scheduler, {2: 7.0, 3: 22.0}, PERIOD, 800)
+
+    assert _periods(scheduler) == {
+        "2 co2": pytest.approx(PERIOD, abs=1),
+        "3 co2": pytest.approx(PERIOD, abs=1),
+    }
+    # Most later polls are just after an update of either node.
+    assert sorted(freshness[-100:])[50] <= POLL_MARGIN + 2
+
+
+def test_removed_nodes() -> None:
+    """Test that the histories of a removed node are forgotten."""
+    scheduler = DucoBoxPollScheduler(30, 60)
+    scheduler.set_adaptive(True)
+    previous = {
+        node_id: DucoBoxNode(node_id, "VLVCO2", 1, co2=400, rh=50) for node_id in (2, 3)
+    }
+    changed = [DucoBoxNode(node_id, "VLVCO2", 1, co2=410, rh=50) for node_id in (2, 3)]
+    scheduler.record(0, {}, [])
+    scheduler.record(30, previous, changed)
+
+    assert set(scheduler._fields) == {(2, "co2"), (3, "co2")}
+
+    scheduler.record(60, previous, [], [3])
+
+    assert set(scheduler._fields) == {(2, "co2")}
@@ -0,0 +1,162 @@
+"""Tests of the DucoBox sensor entities."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_component import EntityComponent
+
+from custom_components.ducobox.const import (
+    CONF_CO2_DEADBAND,
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_DEADBAND_FILTERING,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_MIN_PUBLISH_INTERVAL,
+)
+from custom_components.ducobox.sensor import DucoBoxCountdownSensorEntity
+from tools.simulator import SimulatedBoard
+
+from .conftest import SetupEntry
+
+REMAINING_TIME = "sensor.box_1_ventilation_state_remaining_time"
+CO2 = "sensor.ucco2_4_co2"
+CO2_NODE_ID = 4
+
+
+def _entity(hass: HomeAssistant, entity_id: str) -> Any:
+    component: EntityComponent[Any] = hass.data["entity_components"][SENSOR_DOMAIN]
+    return component.get_entity(entity_id)
+
+
+async def _async_set_co2(hass: HomeAssistant, board: SimulatedBoard, co2: int) -> None:
+    """Change the CO2 of the node and poll the board."""
+    board.nodes[CO2_NODE_ID - 1].co2 = co2
+    await _entity(hass, CO2).coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_short_term_statistics(
+    hass: HomeAssistant, setup_entry: SetupEntry
+) -> None:
+    """Test that the recorder compiles 5-minute statistics of CO2 and humidity."""
+    await setup_entry()
+    entity_ids = [
+        state.entity_id
+        for state in hass.states.async_all(SENSOR_DOMAIN)
+        if state.entity_id.endswith(("_co2", "_relative_humidity"))
+    ]
+    assert CO2 in entity_ids
+    assert any(entity_id.endswith("_relative_humidity") for entity_id in entity_ids)
+    for entity_id in entity_ids:
+        assert hass.states.get(entity_id).attributes["state_class"] == "measurement"
+
+
+@pytest.mark.asyncio
+async def test_deadband(
+    hass: HomeAssistant, steady_board: SimulatedBoard, setup_entry: SetupEntry
+) -> None:
+    """Test that a change within the deadband is not written."""
+    steady_board.nodes[CO2_NODE_ID - 1].co2 = 800
+    await setup_entry({CONF_DEADBAND_FILTERING: True, CONF_CO2_DEADBAND: 20})
+    assert hass.states.get(CO2).state == "800"
+
+    await _async_set_co2(hass, steady_board, 820)
+    assert hass.states.get(CO2).state == "800"
+
+    # The deadband is measured from the written state, not the last poll.
+    await _async_set_co2(hass, steady_board, 821)
+    assert hass.states.get(CO2).state == "821"
+    assert _entity(hass, CO2).coordinator.suppressed_writes >= 1
+
+
+@pytest.mark.asyncio
+async def test_min_publish_interval(
+    hass: HomeAssistant, steady_board: SimulatedBoard, setup_entry: SetupEntry
+) -> None:
+    """Test that a change within the minimum interval is written once it passed."""
+    steady_board.nodes[CO2_NODE_ID - 1].co2 = 800
+    await setup_entry({CONF_DEADBAND_FILTERING: False, CONF_MIN_PUBLISH_INTERVAL: 0.3})
+
+    await _async_set_co2(hass, steady_board, 900)
+    assert hass.states.get(CO2).state == "800"
+
+    # Written without another poll.
+    await asyncio.sleep(0.4)
+    assert hass.states.get(CO2).state == "900"
+
+
+@pytest.mark.asyncio
+async def test_heartbeat(
+    hass: HomeAssistant, steady_board: SimulatedBoard, setup_entry: SetupEntry
+) -> None:
+    """Test that the state is written at the heartbeat interval without polls."""
+    steady_board.nodes[CO2_NODE_ID - 1].co2 = 800
+    await setup_entry(
+        {
+            CONF_DEADBAND_FILTERING: True,
+            CONF_CO2_DEADBAND: 20,
+            CONF_HEARTBEAT_INTERVAL: 0.3,
+        }
+    )
+    reported = hass.states.get(CO2).last_reported
+
+    await _async_set_co2(hass, steady_board, 810)
+    assert hass.states.get(CO2).state == "800"
+
+    await asyncio.sleep(0.4)
+    state = hass.states.get(CO2)
+    assert state.state == "810"
+    assert state.last_reported > reported
+
+    # An unchanged state is reported again as well.
+    reported = state.last_reported
+    await asyncio.sleep(0.4)
+    assert hass.states.get(CO2).last_reported > reported
+
+
+@pytest.mark.asyncio
+async def test_countdown(
+    hass: HomeAssistant, board: SimulatedBoard, setup_entry: SetupEntry
+) -> None:
+    """Test that a timed ventilation state is counted down between polls."""
+    board.apply_action(1, "SetVentilationState", "MAN1")
+    await setup_entry()
+
+    entity = _entity(hass, REMAINING_TIME)
+    assert isinstance(entity, DucoBoxCountdownSensorEntity)
+    assert 895 <= int(hass.states.get(REMAINING_TIME).state) <= 900
+    assert entity._unsub_countdown is not None  # noqa: SLF001
+
+    board.apply_action(1, "SetVentilationState", "AUTO")
+    await entity.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(REMAINING_TIME).state == "unknown"
+    assert entity._unsub_countdown is None  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_countdown_interval_applied_live(
+    hass: HomeAssistant, board: SimulatedBoard, setup_entry: SetupEntry
+) -> None:
+    """Test that a changed countdown interval restarts a running countdown."""
+    board.apply_action(1, "SetVentilationState", "MAN1")
+    entry = await setup_entry()
+    entity = _entity(hass, REMAINING_TIME)
+    unsub = entity._unsub_countdown  # noqa: SLF001
+    assert entity._countdown_interval == 1  # noqa: SLF001
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_COUNTDOWN_INTERVAL: 10}
+    )
+    await hass.async_block_till_done()
+
+    # The entity is not set up again, but counts down at the new interval.
+    assert _entity(hass, REMAINING_TIME) is entity
+    assert entity._countdown_interval == 10  # noqa: SLF001
+    assert entity._unsub_countdown not in (None, unsub)  # noqa: SLF001
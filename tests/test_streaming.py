@@ -0,0 +1,119 @@
+"""Tests of the incremental parsing of node responses."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from custom_components.ducobox.streaming import DucoBoxNodeStreamParser
+
+NODES: list[dict[str, Any]] = [
+    {"Node": 1, "General": {"Type": {"Val": "BOX"}, "Name": {"Val": "Box [main]"}}},
+    {"Node": 2, "General": {"Name": {"Val": 'Chambre "à coucher" {€}'}}},
+    {"Node": 3, "Sensor": {"Co2": {"Val": 612}, "Rh": {"Val": 45.5}}, "Empty": []},
+    {"Node": 4, "General": {"Name": {"Val": 'Back\\slash \\"]}'}}},
+]
+BODY = json.dumps({"Nodes": NODES}, ensure_ascii=False, indent=1).encode()
+
+
+def _parse(chunks: list[bytes]) -> list[dict[str, Any]]:
+    parser = DucoBoxNodeStreamParser()
+    nodes = [node for chunk in chunks for node in parser.feed(chunk)]
+    parser.close()
+    return nodes
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(BODY)])
+def test_chunks(size: int) -> None:
+    """Test that the nodes are parsed at every chunk boundary."""
+    chunks = [BODY[start : start + size] for start in range(0, len(BODY), size)]
+
+    assert _parse(chunks) == NODES
+
+
+def test_every_split() -> None:
+    """Test that the nodes are parsed when split anywhere, within strings too."""
+    for split in range(len(BODY) + 1):
+        assert _parse([BODY[:split], BODY[split:]]) == NODES
+
+
+def test_split_multibyte_character() -> None:
+    """Test that a character split across chunks is decoded once complete."""
+    body = json.dumps({"Nodes": [{"Name": "€"}]}, ensure_ascii=False).encode()
+    split = body.index("€".encode()) + 1
+    parser = DucoBoxNodeStreamParser()
+
+    assert parser.feed(body[:split]) == []
+    assert parser.feed(body[split:]) == [{"Name": "€"}]
+    parser.close()
+
+
+def test_nodes_as_completed() -> None:
+    """Test that every node is returned as soon as it is complete."""
+    parser = DucoBoxNodeStreamParser()
+
+    assert parser.feed(b'{"Nodes": [{"Node": 1}, {"Node"') == [{"Node": 1}]
+    assert parser.feed(b": 2}") == [{"Node": 2}]
+    assert parser.feed(b"]}") == []
+    parser.close()
+
+
+def test_no_nodes() -> None:
+    """Test that an empty nodes array and a body without nodes are accepted."""
+    assert _parse([b'{"Nodes": [ ]}']) == []
+    assert _parse([b'{"Code": 0}']) == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"Nodes": [{"Node": 1} {"Node": 2}]}',
+        b'{"Nodes": [{"Node": 1},, {"Node": 2}]}',
+        b'{"Nodes": [{"Node": 1},]}',
+        b'{"Nodes": [1]}',
+        b'{"Nodes": [{"Node": 1 2}]}',
+        b'{"Nodes": [{"Node": tru}]}',
+        b'{"Nodes": [{"Node": 1}]]',
+        b'{"Nodes": [{"Node": 1}]}}',
+        b'{"Nodes": [{"Node": 1}], "Extra": 1}',
+        b'{"Nodes": [{"Node": "\xff"}]}',
+    ],
+)
+def test_malformed(body: bytes) -> None:
+    """Test that malformed nodes raise as soon as they are received."""
+    parser = DucoBoxNodeStreamParser()
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        parser.feed(body)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"Nodes": [{"Node": 1}',
+        b'{"Nodes": [{"Node": "1}]}',
+        b'{"Nodes": [{"Node": 1}]',
+        b'{"Nodes": [{"Node": "\xe2\x82',
+        b'{"Code": ',
+    ],
+)
+def test_incomplete(body: bytes) -> None:
+    """Test that an incomplete body raises when it is closed."""
+    parser = DucoBoxNodeStreamParser()
+    parser.feed(body)
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        parser.close()
+
+
+def test_trailer_not_buffered() -> None:
+    """Test that the body after the nodes is not kept."""
+    parser = DucoBoxNodeStreamParser()
+    parser.feed(b'{"Nodes": []')
+    parser.feed(b" " * 100_000)
+    parser.feed(b"}\n")
+
+    assert not parser._buffer  # noqa: SLF001
+    parser.close()
@@ -0,0 +1,160 @@
+"""Tests of the local HTTP view serving the DucoBox data."""
+
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from homeassistant.components.http import KEY_HASS
+from homeassistant.core import HomeAssistant
+
+from custom_components.ducobox.view import DucoBoxNodesView
+from tools.simulator import SimulatedBoard
+
+from .conftest import SetupEntry
+
+CO2_NODE_ID = 4
+
+
+async def _async_get(
+    hass: HomeAssistant,
+    view: DucoBoxNodesView,
+    entry_id: str,
+    headers: dict[str, str] | None = None,
+) -> web.Response:
+    """Request the data of a config entry from the view."""
+    app = web.Application()
+    app[KEY_HASS] = hass
+    request = make_mocked_request(
+        "GET", f"/api/ducobox/{entry_id}/info/nodes", headers=headers, app=app
+    )
+    return await view.get(request, entry_id)
+
+
+@pytest.mark.asyncio
+async def test_etag_stable(
+    hass: HomeAssistant, steady_board: SimulatedBoard, setup_entry: SetupEntry
+) -> None:
+    """Test that the ETag only changes when the data changes."""
+    entry = await setup_entry()
+    view = DucoBoxNodesView()
+    coordinator = entry.runtime_data.coordinator
+
+    response = await _async_get(hass, view, entry.entry_id)
+    assert response.status == HTTPStatus.OK
+    etag = response.headers["ETag"]
+    body = json.loads(response.body)
+    assert body["Box"]["SerialNumber"] == steady_board.serial_number
+    assert [node["Node"] for node in body["Nodes"]] == list(coordinator.data)
+
+    # A poll returning the same data keeps the ETag.
+    await coordinator.async_refresh()
+    response = await _async_get(hass, view, entry.entry_id)
+    assert response.headers["ETag"] == etag
+
+    steady_board.nodes[CO2_NODE_ID - 1].co2 += 100
+    await coordinator.async_refresh()
+    response = await _async_get(hass, view, entry.entry_id)
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "status"),
+    [
+        ("{etag}", HTTPStatus.NOT_MODIFIED),
+        ("W/{etag}", HTTPStatus.NOT_MODIFIED),
+        ('"other", {etag}', HTTPStatus.NOT_MODIFIED),
+        ("*", HTTPStatus.NOT_MODIFIED),
+        ('"other"', HTTPStatus.OK),
+        ('W/"other"', HTTPStatus.OK),
+    ],
+)
+@pytest.mark.usefixtures("steady_board")
+@pytest.mark.asyncio
+async def test_if_none_match(
+    hass: HomeAssistant,
+    setup_entry: SetupEntry,
+    if_none_match: str,
+    status: HTTPStatus,
+) -> None:
+    """Test that a request for the current ETag is answered without the data."""
+    entry = await setup_entry()
+    view = DucoBoxNodesView()
+    etag = (await _async_get(hass, view, entry.entry_id)).headers["ETag"]
+
+    response = await _async_get(
+        hass, view, entry.entry_id, {"If-None-Match": if_none_match.format(etag=etag)}
+    )
+    assert response.status == status
+    assert response.headers["ETag"] == etag
+    assert bool(response.body) == (status == HTTPStatus.OK)
+
+
+@pytest.mark.parametrize(
+    ("offset", "status"),
+    [
+        (timedelta(0), HTTPStatus.NOT_MODIFIED),
+        (timedelta(hours=1), HTTPStatus.NOT_MODIFIED),
+        (-timedelta(seconds=1), HTTPStatus.OK),
+    ],
+)
+@pytest.mark.usefixtures("steady_board")
+@pytest.mark.asyncio
+async def test_if_modified_since(
+    hass: HomeAssistant,
+    setup_entry: SetupEntry,
+    offset: timedelta,
+    status: HTTPStatus,
+) -> None:
+    """Test that a request for data that is not newer is answered without it."""
+    entry = await setup_entry()
+    view = DucoBoxNodesView()
+    response = await _async_get(hass, view, entry.entry_id)
+    last_modified = parsedate_to_datetime(response.headers["Last-Modified"])
+
+    since = format_datetime(last_modified + offset, usegmt=True)
+    response = await _async_get(
+        hass, view, entry.entry_id, {"If-Modified-Since": since}
+    )
+    assert response.status == status
+
+    # The ETag takes precedence over the modification time.
+    response = await _async_get(
+        hass,
+        view,
+        entry.entry_id,
+        {"If-Modified-Since": since, "If-None-Match": '"other"'},
+    )
+    assert response.status == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_invalid_if_modified_since(
+    hass: HomeAssistant, setup_entry: SetupEntry
+) -> None:
+    """Test that an invalid modification time is ignored."""
+    entry = await setup_entry()
+    response = await _async_get(
+        hass, DucoBoxNodesView(), entry.entry_id, {"If-Modified-Since": "yesterday"}
+    )
+    assert response.status == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_not_loaded(hass: HomeAssistant, setup_entry: SetupEntry) -> None:
+    """Test that an unknown or unloaded config entry is not found."""
+    entry = await setup_entry()
+    view = DucoBoxNodesView()
+
+    response = await _async_get(hass, view, "unknown")
+    assert response.status == HTTPStatus.NOT_FOUND
+
+    assert (await _async_get(hass, view, entry.entry_id)).status == HTTPStatus.OK
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    response = await _async_get(hass, view, entry.entry_id)
+    assert response.status == HTTPStatus.NOT_FOUND
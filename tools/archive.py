@@ -0,0 +1,129 @@
+"""
+Read and write benchmark of the DucoBox telemetry archive.
+
+Writes the telemetry of simulated nodes at poll resolution to an archive in
+blocks as the integration does, and reports the write throughput, the size on
+disk per row, and the time to scan all columns or a single column.
+
+Usage:
+    python3 -m tools.archive --nodes 200 --days 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from custom_components.ducobox.archive import (
+    ARCHIVE_SUFFIX,
+    FLUSH_INTERVAL,
+    ArchiveRow,
+    append_rows,
+    iter_blocks,
+)
+
+from .simulator import VENTILATION_STATES
+
+POLL_INTERVAL = timedelta(seconds=30)
+
+
+def simulate_rows(nodes: int, days: int, seed: int) -> list[list[ArchiveRow]]:
+    """Simulate the rows of every flush of a number of days."""
+    rng = random.Random(seed)
+    co2 = [rng.randint(400, 1200) for _ in range(nodes)]
+    rh = [rng.randint(30, 70) for _ in range(nodes)]
+    flow_lvl_tgt = [rng.randint(0, 100) for _ in range(nodes)]
+    states = [rng.choice(VENTILATION_STATES) for _ in range(nodes)]
+
+    polls_per_flush = FLUSH_INTERVAL // POLL_INTERVAL
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    flushes: list[list[ArchiveRow]] = []
+    rows: list[ArchiveRow] = []
+    for poll in range(days * (timedelta(days=1) // POLL_INTERVAL)):
+        now = start + poll * POLL_INTERVAL
+        for node in range(nodes):
+            co2[node] = max(400, co2[node] + rng.randint(-10, 10))
+            rh[node] = min(100, max(0, rh[node] + rng.randint(-1, 1)))
+            if rng.random() < 0.001:  # noqa: PLR2004
+                states[node] = rng.choice(VENTILATION_STATES)
+            rows.append(
+                (now, node + 1, co2[node], rh[node], flow_lvl_tgt[node], states[node])
+            )
+        if (poll + 1) % polls_per_flush == 0:
+            flushes.append(rows)
+            rows = []
+    if rows:
+        flushes.append(rows)
+    return flushes
+
+
+def bench(nodes: int, days: int, seed: int) -> dict[str, Any]:
+    """Write and scan a simulated archive and report the cost."""
+    flushes = simulate_rows(nodes, days, seed)
+    rows = sum(len(flush) for flush in flushes)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(tmp_dir)
+
+        lengths: dict[Path, int] = {}
+        start = time.perf_counter()
+        for flush in flushes:
+            append_rows(directory, flush, lengths)
+        write_seconds = time.perf_counter() - start
+
+        paths = sorted(directory.glob(f"*{ARCHIVE_SUFFIX}"))
+        size = sum(path.stat().st_size for path in paths)
+
+        start = time.perf_counter()
+        scanned = sum(
+            len(block["time"]) for path in paths for block in iter_blocks(path)
+        )
+        scan_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        maximum = max(
+            (
+                value
+                for path in paths
+                for block in iter_blocks(path, ("co2",))
+                for value in block["co2"]
+                if value is not None
+            ),
+            default=None,
+        )
+        column_scan_seconds = time.perf_counter() - start
+
+    assert scanned == rows  # noqa: S101
+    return {
+        "config": {"nodes": nodes, "days": days, "seed": seed},
+        "rows": rows,
+        "blocks": len(flushes),
+        "bytes_per_row": round(size / rows, 2),
+        "write_rows_per_second": round(rows / write_seconds),
+        "scan_rows_per_second": round(rows / scan_seconds),
+        "co2_scan_rows_per_second": round(rows / column_scan_seconds),
+        "max_co2": maximum,
+    }
+
+
+def main() -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(bench(args.nodes, args.days, args.seed), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
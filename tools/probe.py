@@ -0,0 +1,246 @@
+"""
+Command-line probe and latency profiler for a Duco Connectivity Board 2.0.
+
+Polls the endpoints of a board the way the integration does, without Home
+Assistant, and reports the latency percentiles, payload sizes, decoding and
+parsing time and error rate per endpoint, to size the poll interval of a site.
+Optionally sends SetVentilationState commands and measures how long the board
+takes to report each new state.
+
+Usage:
+    python3 -m tools.probe 192.168.1.10 --polls 60 --interval 5
+    python3 -m tools.probe 192.168.1.10 --set 2:MAN1 --set 2:AUTO
+    python3 -m tools.probe --simulate 200 --polls 20 --interval 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
+from typing import Any
+
+from aiohttp import ClientError, ClientSession
+
+from custom_components.ducobox.api import (
+    DucoBoxHttpTransport,
+    DucoConnectivityBoardApi,
+    DucoConnectivityBoardApiError,
+)
+from custom_components.ducobox.recording import DucoBoxRecorder
+
+from .simulator import SimulatedBoard
+from .soak import percentiles
+
+_ERRORS = (ClientError, DucoConnectivityBoardApiError, TimeoutError)
+
+
+class EndpointStats:
+    """The measurements of the polls of an endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the measurements."""
+        self.latency: list[float] = []
+        self.payload_bytes: list[float] = []
+        self.decode: list[float] = []
+        self.parse: list[float] = []
+        self.errors: dict[str, int] = {}
+
+    def report(self) -> dict[str, Any]:
+        """Return the report of the endpoint."""
+        polls = len(self.latency) + sum(self.errors.values())
+        return {
+            "polls": polls,
+            "error_rate": round(sum(self.errors.values()) / polls, 3) if polls else 0,
+            "errors": self.errors,
+            "latency_ms": percentiles(self.latency),
+            "payload_bytes": percentiles(self.payload_bytes),
+            "decode_ms": percentiles(self.decode),
+            "parse_ms": percentiles(self.parse),
+        }
+
+
+async def async_poll(
+    api: DucoConnectivityBoardApi,
+    recorder: DucoBoxRecorder,
+    stats: EndpointStats,
+    request: Callable[[], Awaitable[object]],
+) -> None:
+    """Poll an endpoint once and add the measurements to its statistics."""
+    exchanges = len(recorder.exchanges)
+    start = time.perf_counter()
+    try:
+        with api.watchdog.cycle("probe") as stages:
+            await request()
+    except _ERRORS as err:
+        stats.errors[type(err).__name__] = stats.errors.get(type(err).__name__, 0) + 1
+        return
+
+    stats.latency.append((time.perf_counter() - start) * 1000)
+    stats.payload_bytes.append(
+        sum(len(exchange.body) for exchange in recorder.exchanges[exchanges:])
+    )
+    stats.decode.append(stages.get("decode", 0.0) * 1000)
+    stats.parse.append(stages.get("parse", 0.0) * 1000)
+
+
+async def async_confirm(
+    api: DucoConnectivityBoardApi,
+    node_id: int,
+    state: str,
+    *,
+    confirm_timeout: float,
+    interval: float,
+) -> dict[str, Any]:
+    """Set the ventilation state of a node and time until the board reports it."""
+    result: dict[str, Any] = {"node": node_id, "state": state}
+    start = time.perf_counter()
+    try:
+        result["accepted"] = await api.async_set_ventilation_state(node_id, state)
+    except _ERRORS as err:
+        result["error"] = type(err).__name__
+        return result
+    result["request_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    if not result["accepted"]:
+        return result
+
+    while (elapsed := time.perf_counter() - start) < confirm_timeout:
+        try:
+            nodes = await api.async_get_nodes()
+        except _ERRORS:
+            nodes = []
+        if any(node.node_id == node_id and node.state == state for node in nodes):
+            result["confirm_seconds"] = round(time.perf_counter() - start, 3)
+            return result
+        await asyncio.sleep(min(interval, confirm_timeout - elapsed))
+
+    result["confirm_seconds"] = None
+    return result
+
+
+async def async_probe(  # noqa: PLR0913
+    host: str | None,
+    simulate: int,
+    *,
+    polls: int,
+    interval: float,
+    commands: list[tuple[int, str]],
+    confirm_timeout: float,
+) -> dict[str, Any]:
+    """Probe a board (or a simulated board) and return the report."""
+    board = None
+    if host is None:
+        board = SimulatedBoard("SIM00000000", simulate)
+        host = await board.async_start()
+
+    recorder = DucoBoxRecorder()
+    try:
+        async with ClientSession() as session:
+            transport = DucoBoxHttpTransport(host, session)
+            transport.recorder = recorder
+            api = DucoConnectivityBoardApi(transport)
+
+            box_info = await api.async_get_box_info()
+            capabilities = await api.async_probe_capabilities()
+            api.set_capabilities(capabilities)
+
+            endpoints: dict[str, Callable[[], Awaitable[object]]] = {
+                "info": api.async_get_box_info,
+                "nodes": api.async_get_nodes,
+                "actions": api.async_get_ventilation_state_options,
+            }
+            stats = {name: EndpointStats() for name in endpoints}
+            for poll in range(polls):
+                if poll:
+                    await asyncio.sleep(interval)
+                for name, request in endpoints.items():
+                    await async_poll(api, recorder, stats[name], request)
+                # Only the latest exchanges are needed to measure a poll.
+                recorder.exchanges.clear()
+
+            confirmations = [
+                await async_confirm(
+                    api,
+                    node_id,
+                    state,
+                    confirm_timeout=confirm_timeout,
+                    interval=min(interval, 1),
+                )
+                for node_id, state in commands
+            ]
+    finally:
+        if board is not None:
+            await board.async_stop()
+
+    confirmed = [
+        result["confirm_seconds"]
+        for result in confirmations
+        if result.get("confirm_seconds") is not None
+    ]
+    return {
+        "config": {"host": host, "polls": polls, "interval": interval},
+        "box": asdict(box_info),
+        "capabilities": asdict(capabilities) if capabilities is not None else None,
+        "endpoints": {name: endpoint.report() for name, endpoint in stats.items()},
+        "commands": confirmations,
+        "confirm_seconds": percentiles(confirmed) if confirmations else None,
+    }
+
+
+def parse_command(value: str) -> tuple[int, str]:
+    """Parse a NODE:STATE command argument."""
+    node_id, separator, state = value.partition(":")
+    if not separator or not node_id.isdigit() or not state:
+        msg = f"expected NODE:STATE, got {value!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return int(node_id), state
+
+
+def main() -> int:
+    """Probe a board from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("host", nargs="?", help="host[:port] of the board to probe")
+    source.add_argument(
+        "--simulate", type=int, metavar="NODES", help="probe a simulated board"
+    )
+    parser.add_argument("--polls", type=int, default=20, help="polls per endpoint")
+    parser.add_argument("--interval", type=float, default=5, help="poll seconds")
+    parser.add_argument(
+        "--set",
+        dest="commands",
+        type=parse_command,
+        action="append",
+        default=[],
+        metavar="NODE:STATE",
+        help="set the ventilation state of a node and time its confirmation, "
+        "in the given order after polling",
+    )
+    parser.add_argument(
+        "--confirm-timeout",
+        type=float,
+        default=60,
+        help="seconds to wait for the board to report a state",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        async_probe(
+            args.host,
+            args.simulate,
+            polls=args.polls,
+            interval=args.interval,
+            commands=args.commands,
+            confirm_timeout=args.confirm_timeout,
+        )
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
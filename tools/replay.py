@@ -0,0 +1,184 @@
+"""
+Record and replay benchmark for the DucoBox integration.
+
+Records the exchanges with a board (or a simulated board) into a fixture file,
+and benchmarks the decoding, parsing, coordinator update and entity fan-out of
+a config entry replaying such a fixture in a headless Home Assistant instance,
+offline and deterministically.
+
+Usage:
+    python3 -m tools.replay record --host 192.168.1.10 --polls 20 site.jsonl.gz
+    python3 -m tools.replay record --simulate 200 --polls 20 site.jsonl.gz
+    python3 -m tools.replay bench site.jsonl.gz --cycles 50 --speed 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from aiohttp import ClientSession
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import CONF_HOST
+
+from custom_components.ducobox.api import DucoBoxHttpTransport
+from custom_components.ducobox.const import (
+    CONF_FIXTURE,
+    CONF_REPLAY_SPEED,
+    CONF_TRANSPORT,
+    DOMAIN,
+    TRANSPORT_REPLAY,
+)
+from custom_components.ducobox.recording import (
+    DucoBoxExchange,
+    DucoBoxRecorder,
+    save_exchanges,
+)
+
+from .simulator import SimulatedBoard
+from .soak import async_start_hass, percentiles
+from .startup import INTEGRATION_MODULE, measure_import_seconds
+
+
+async def async_record(
+    host: str | None, simulate: int, polls: int, interval: float
+) -> list[DucoBoxExchange]:
+    """Record the exchanges of the requests the integration makes."""
+    board = None
+    if host is None:
+        board = SimulatedBoard("SIM00000000", simulate)
+        host = await board.async_start()
+
+    recorder = DucoBoxRecorder()
+    try:
+        async with ClientSession() as session:
+            transport = DucoBoxHttpTransport(host, session)
+            transport.recorder = recorder
+
+            await transport.async_get_box_info()
+            transport.set_capabilities(await transport.async_probe_capabilities())
+            await transport.async_get_ventilation_state_options()
+            for poll in range(polls):
+                if poll:
+                    await asyncio.sleep(interval)
+                await transport.async_get_nodes()
+    finally:
+        if board is not None:
+            await board.async_stop()
+
+    return recorder.exchanges
+
+
+async def async_bench(path: Path, cycles: int, speed: float) -> dict[str, Any]:
+    """Replay a fixture through a config entry and report the cost per stage."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hass = await async_start_hass(Path(tmp_dir))
+
+        entry = ConfigEntry(
+            data={
+                CONF_HOST: path.name,
+                CONF_TRANSPORT: TRANSPORT_REPLAY,
+                CONF_FIXTURE: str(path),
+                CONF_REPLAY_SPEED: speed,
+            },
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source=SOURCE_USER,
+            subentries_data=None,
+            title=path.name,
+            unique_id=None,
+            version=1,
+        )
+
+        setup_start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        setup_seconds = time.perf_counter() - setup_start
+
+        coordinator = entry.runtime_data.coordinator
+        stages: dict[str, list[float]] = {}
+        cycle_seconds: list[float] = []
+
+        for _ in range(cycles):
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            cycle_seconds.append(time.perf_counter() - start)
+            last_cycle = coordinator.api.watchdog.last_cycles[coordinator.name]
+            for stage, elapsed in last_cycle.items():
+                stages.setdefault(stage, []).append(elapsed)
+
+        entity_count = len(hass.states.async_entity_ids())
+        platforms = [
+            str(platform) for platform in entry.runtime_data.entity_index.platforms
+        ]
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop()
+
+    return {
+        "config": {"fixture": path.name, "cycles": cycles, "speed": speed},
+        "entities": entity_count,
+        "nodes": len(coordinator.data or {}),
+        "platforms": platforms,
+        "setup_seconds": round(setup_seconds, 3),
+        "cycle_ms": percentiles([elapsed * 1000 for elapsed in cycle_seconds]),
+        "stage_ms": {
+            stage: percentiles([elapsed * 1000 for elapsed in samples])
+            for stage, samples in stages.items()
+        },
+    }
+
+
+def main() -> int:
+    """Record or replay from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="record a fixture")
+    source = record.add_mutually_exclusive_group(required=True)
+    source.add_argument("--host", help="host[:port] of the board to record")
+    source.add_argument(
+        "--simulate", type=int, metavar="NODES", help="record a simulated board"
+    )
+    record.add_argument("--polls", type=int, default=10)
+    record.add_argument("--interval", type=float, default=5, help="poll seconds")
+    record.add_argument("fixture", type=Path)
+
+    bench = subparsers.add_parser("bench", help="benchmark replaying a fixture")
+    bench.add_argument("fixture", type=Path)
+    bench.add_argument("--cycles", type=int, default=50)
+    bench.add_argument(
+        "--speed",
+        type=float,
+        default=0,
+        help="speed-up of the recorded timing, 0 for no delay",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        exchanges = asyncio.run(
+            async_record(args.host, args.simulate, args.polls, args.interval)
+        )
+        save_exchanges(args.fixture, exchanges)
+        print(f"Recorded {len(exchanges)} exchanges to {args.fixture}")
+        return 0
+
+    import_seconds = measure_import_seconds([INTEGRATION_MODULE])[INTEGRATION_MODULE]
+    report = asyncio.run(async_bench(args.fixture.resolve(), args.cycles, args.speed))
+    report["import_seconds"] = round(import_seconds, 3)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
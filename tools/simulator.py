@@ -0,0 +1,474 @@
+"""Simulated Duco Connectivity Board 2.0 serving the local HTTP and Modbus TCP API."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import socket
+import struct
+import time
+import zlib
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.ducobox import modbus
+
+NODE_TYPES = [
+    "VLVCO2RH",
+    "VLVRH",
+    "VLVCO2",
+    "VLV",
+    "UCCO2",
+    "BSRH",
+    "UCBAT",
+]
+
+VENTILATION_STATES = [
+    "AUTO",
+    "AUT1",
+    "AUT2",
+    "AUT3",
+    "MAN1",
+    "MAN2",
+    "MAN3",
+    "EMPT",
+    "CNT1",
+    "CNT2",
+    "CNT3",
+    "MAN1x2",
+    "MAN2x2",
+    "MAN3x2",
+    "MAN1x3",
+    "MAN2x3",
+    "MAN3x3",
+]
+
+VENTILATION_NODE_TYPES = {"BOX", "VLV", "VLVCO2", "VLVCO2RH", "VLVRH"}
+CO2_NODE_TYPES = {"UCCO2", "VLVCO2", "VLVCO2RH"}
+RH_NODE_TYPES = {"BSRH", "VLVCO2RH", "VLVRH"}
+
+
+def _val(value: Any) -> dict[str, Any]:
+    return {"Val": value}
+
+
+class SimulatedNode:
+    """A simulated Duco node whose sensor values drift over time."""
+
+    def __init__(self, node_id: int, node_type: str, rng: random.Random) -> None:
+        """Initialize the simulated node."""
+        self.node_id = node_id
+        self.node_type = node_type
+        self.state = "AUTO"
+        self.time_state_end = 0
+        self.co2 = rng.randint(400, 1200)
+        self.rh = rng.randint(35, 65)
+        self.flow_lvl_tgt = rng.randint(10, 60)
+        self._rng = rng
+
+    def step(self) -> None:
+        """Let the sensor values drift like a real room would."""
+        self.co2 = min(max(self.co2 + self._rng.randint(-15, 15), 400), 2000)
+        self.rh = min(max(self.rh + self._rng.randint(-1, 1), 20), 95)
+        self.flow_lvl_tgt = min(
+            max(self.flow_lvl_tgt + self._rng.randint(-2, 2), 0), 100
+        )
+
+    def render(self, now: int) -> dict[str, Any]:
+        """Render the node in the shape of the /info/nodes endpoint."""
+        data: dict[str, Any] = {
+            "Node": self.node_id,
+            "General": {
+                "Type": _val(self.node_type),
+                "SubType": _val(1),
+                "NetworkType": _val("VIRT" if self.node_type == "BOX" else "RF"),
+                "Parent": _val(0 if self.node_type == "BOX" else 1),
+                "Asso": _val(0),
+                "Name": _val(""),
+                "Identify": _val(0),
+            },
+        }
+
+        if self.node_type in VENTILATION_NODE_TYPES:
+            remain = max(self.time_state_end - now, 0)
+            if remain == 0:
+                self.state = "AUTO"
+                self.time_state_end = 0
+            data["Ventilation"] = {
+                "State": _val(self.state),
+                "TimeStateRemain": _val(remain),
+                "TimeStateEnd": _val(self.time_state_end),
+                "Mode": _val("AUTO" if self.state.startswith("AUT") else "MANU"),
+                "FlowLvlTgt": _val(self.flow_lvl_tgt),
+            }
+
+        sensor: dict[str, Any] = {}
+        if self.node_type in CO2_NODE_TYPES:
+            sensor["Co2"] = _val(self.co2)
+            sensor["IaqCo2"] = _val(max(100 - (self.co2 - 400) // 16, 0))
+        if self.node_type in RH_NODE_TYPES:
+            sensor["Rh"] = _val(self.rh)
+            sensor["IaqRh"] = _val(max(100 - abs(self.rh - 50) * 2, 0))
+        if sensor:
+            data["Sensor"] = sensor
+
+        return data
+
+
+class SimulatedBoard:
+    """A simulated Connectivity Board with a configurable number of nodes."""
+
+    def __init__(self, serial_number: str, node_count: int, seed: int = 0) -> None:
+        """
+        Initialize the simulated board.
+
+        Args:
+            serial_number: The serial number reported by the board.
+            node_count: The number of nodes, including the box itself.
+            seed: The seed for the sensor value drift.
+
+        """
+        self.serial_number = serial_number
+        self.node_poll_times: list[float] = []
+        self._rng = random.Random(seed)
+        self._nodes = [SimulatedNode(1, "BOX", self._rng)]
+        self._nodes.extend(
+            SimulatedNode(node_id, NODE_TYPES[node_id % len(NODE_TYPES)], self._rng)
+            for node_id in range(2, node_count + 1)
+        )
+        self._nodes_by_id = {node.node_id: node for node in self._nodes}
+        self._runner: web.AppRunner | None = None
+        self._modbus_server: asyncio.Server | None = None
+
+    @property
+    def nodes(self) -> list[SimulatedNode]:
+        """Return the simulated nodes."""
+        return self._nodes
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving the board, returning the host:port to connect to."""
+        app = web.Application()
+        app.router.add_get("/info", self._handle_info)
+        app.router.add_get("/info/nodes", self._handle_nodes)
+        app.router.add_get("/action/nodes", self._handle_actions)
+        app.router.add_post("/action/nodes/{node_id}", self._handle_action)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((host, port))
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+
+        bound_host, bound_port = sock.getsockname()
+        return f"{bound_host}:{bound_port}"
+
+    async def async_start_modbus(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start serving the Modbus TCP interface, returning the port."""
+        self._modbus_server = await asyncio.start_server(
+            self._handle_modbus_client, host, port
+        )
+        return self._modbus_server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        """Stop serving the board."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._modbus_server is not None:
+            self._modbus_server.close()
+            await self._modbus_server.wait_closed()
+            self._modbus_server = None
+
+    def render_info(self, parameters: set[str] | None = None) -> dict[str, Any]:
+        """Render the /info endpoint, with only the given parameters if any."""
+        digest = f"{zlib.crc32(self.serial_number.encode()):08x}"
+        mac_address = "02:00:" + ":".join(digest[i : i + 2] for i in range(0, 8, 2))
+        box = self._nodes[0]
+        info: dict[str, dict[str, dict[str, Any]]] = {
+            "General": {
+                "Board": {
+                    "BoxName": _val("ENERGY_PREMIUM_325"),
+                    "SerialDucoBox": _val(self.serial_number),
+                    "SwVersionComm": _val("18004.10.5.0"),
+                },
+                "Lan": {
+                    "Mac": _val(mac_address),
+                },
+            },
+            "HeatRecovery": {
+                "General": {
+                    "TimeFilterRemain": _val(120),
+                },
+            },
+            "Ventilation": {
+                # Temperatures in tenths of a degree Celsius.
+                "Sensor": {
+                    "TempOda": _val(85),
+                    "TempSup": _val(185),
+                    "TempEta": _val(212),
+                    "TempEha": _val(110),
+                },
+                "Fan": {
+                    "SpeedSup": _val(600 + box.flow_lvl_tgt * 20),
+                    "SpeedEha": _val(620 + box.flow_lvl_tgt * 20),
+                },
+            },
+        }
+
+        if parameters is None:
+            return info
+
+        filtered: dict[str, Any] = {}
+        for module, submodules in info.items():
+            for submodule, values in submodules.items():
+                if selected := {
+                    key: value for key, value in values.items() if key in parameters
+                }:
+                    filtered.setdefault(module, {})[submodule] = selected
+        return filtered
+
+    def render_nodes(self, parameters: set[str] | None = None) -> dict[str, Any]:
+        """Render the /info/nodes endpoint, advancing the simulation."""
+        now = int(time.time())
+        for node in self._nodes:
+            node.step()
+        nodes = [node.render(now) for node in self._nodes]
+
+        if parameters is not None:
+            nodes = [
+                {
+                    key: {
+                        parameter: value
+                        for parameter, value in module.items()
+                        if parameter in parameters
+                    }
+                    if isinstance(module, dict)
+                    else module
+                    for key, module in node.items()
+                }
+                for node in nodes
+            ]
+        return {"Nodes": nodes}
+
+    def render_actions(self) -> dict[str, Any]:
+        """Render the /action/nodes?action=SetVentilationState endpoint."""
+        return {
+            "Nodes": [
+                {
+                    "Node": node.node_id,
+                    "Actions": [
+                        {
+                            "Action": "SetVentilationState",
+                            "ValType": "Enum",
+                            "Enum": VENTILATION_STATES,
+                        }
+                    ],
+                }
+                for node in self._nodes
+                if node.node_type in VENTILATION_NODE_TYPES
+            ]
+        }
+
+    def apply_action(self, node_id: int, action: str, value: Any) -> bool:
+        """Apply an action to a node, returning whether it succeeded."""
+        node = self._nodes_by_id.get(node_id)
+        if node is None:
+            return False
+
+        if action == "SetIdentify":
+            return True
+
+        if action != "SetVentilationState" or value not in VENTILATION_STATES:
+            return False
+
+        node.state = value
+        node.time_state_end = 0 if value == "AUTO" else int(time.time()) + 15 * 60
+        return True
+
+    def _render_system_registers(self) -> list[int]:
+        """Render the system input registers with the box information and node map."""
+        info_modules = self.render_info()
+        info = info_modules["General"]
+        registers = [modbus.NOT_AVAILABLE] * modbus.NODE_REGISTER_BLOCK
+
+        for address, count, value in (
+            (
+                modbus.BOX_NAME_REGISTER,
+                modbus.BOX_NAME_REGISTER_COUNT,
+                info["Board"]["BoxName"]["Val"],
+            ),
+            (
+                modbus.SERIAL_REGISTER,
+                modbus.SERIAL_REGISTER_COUNT,
+                info["Board"]["SerialDucoBox"]["Val"],
+            ),
+        ):
+            data = value.encode().ljust(count * 2, b"\x00")
+            registers[address : address + count] = struct.unpack(f">{count}H", data)
+
+        mac = bytes.fromhex(info["Lan"]["Mac"]["Val"].replace(":", ""))
+        registers[modbus.MAC_REGISTER : modbus.MAC_REGISTER + 3] = struct.unpack(
+            ">3H", mac
+        )
+
+        node_map = [0] * modbus.NODE_MAP_REGISTER_COUNT
+        for node in self._nodes:
+            node_map[node.node_id // 16] |= 1 << (node.node_id % 16)
+        registers[
+            modbus.NODE_MAP_REGISTER : modbus.NODE_MAP_REGISTER
+            + modbus.NODE_MAP_REGISTER_COUNT
+        ] = node_map
+
+        box_parameters = [
+            info_modules[module][submodule][parameter]["Val"]
+            for module, submodule, parameter in (
+                param.keys for param in modbus.BOX_PARAMETERS
+            )
+        ]
+        registers[
+            modbus.BOX_PARAMETER_REGISTER : modbus.BOX_PARAMETER_REGISTER
+            + len(modbus.BOX_PARAMETERS)
+        ] = [value & 0xFFFF for value in box_parameters]
+
+        return registers
+
+    def _render_node_registers(self, node: SimulatedNode, now: int) -> list[int]:
+        """Render the input registers of a node block."""
+        data = node.render(now)
+        ventilation = data.get("Ventilation", {})
+        sensor = data.get("Sensor", {})
+        node_types = {value: code for code, value in modbus.NODE_TYPES.items()}
+
+        def _code(values: list[str], value: dict[str, Any] | None) -> int:
+            if value is None:
+                return modbus.NOT_AVAILABLE
+            return values.index(value["Val"])
+
+        def _value(value: dict[str, Any] | None) -> int:
+            return modbus.NOT_AVAILABLE if value is None else value["Val"]
+
+        remain = ventilation.get("TimeStateRemain")
+        remain_value = modbus.NOT_AVAILABLE_32 if remain is None else remain["Val"]
+
+        registers = [modbus.NOT_AVAILABLE] * modbus.NODE_REGISTER_BLOCK
+        registers[: modbus.NODE_REGISTER_COUNT] = [
+            node_types[node.node_type],
+            data["General"]["Parent"]["Val"],
+            _code(modbus.NETWORK_TYPES, data["General"]["NetworkType"]),
+            _code(modbus.VENTILATION_STATES, ventilation.get("State")),
+            remain_value >> 16,
+            remain_value & 0xFFFF,
+            _code(modbus.VENTILATION_MODES, ventilation.get("Mode")),
+            _value(ventilation.get("FlowLvlTgt")),
+            _value(sensor.get("Rh")),
+            _value(sensor.get("IaqRh")),
+            _value(sensor.get("Co2")),
+            _value(sensor.get("IaqCo2")),
+        ]
+        return registers
+
+    def read_input_registers(self, address: int, count: int) -> list[int] | None:
+        """
+        Read input registers, advancing the simulation when the node map is read.
+
+        Returns None for addresses outside the system and node blocks.
+        """
+        now = int(time.time())
+        if address <= modbus.NODE_MAP_REGISTER < address + count:
+            self.node_poll_times.append(time.monotonic())
+            for node in self._nodes:
+                node.step()
+
+        blocks: dict[int, list[int]] = {}
+        registers: list[int] = []
+        for register in range(address, address + count):
+            block, offset = divmod(register, modbus.NODE_REGISTER_BLOCK)
+            if block not in blocks:
+                if block == 0:
+                    blocks[block] = self._render_system_registers()
+                elif (node := self._nodes_by_id.get(block)) is not None:
+                    blocks[block] = self._render_node_registers(node, now)
+                else:
+                    return None
+            registers.append(blocks[block][offset])
+        return registers
+
+    def write_register(self, address: int, value: int) -> bool:
+        """Write a holding register, returning whether it was accepted."""
+        node_id, offset = divmod(address, modbus.NODE_REGISTER_BLOCK)
+        if offset == modbus.NODE_VENTILATION_STATE_SETPOINT:
+            if value >= len(modbus.VENTILATION_STATES):
+                return False
+            return self.apply_action(
+                node_id, "SetVentilationState", modbus.VENTILATION_STATES[value]
+            )
+        if offset == modbus.NODE_IDENTIFY:
+            return self.apply_action(node_id, "SetIdentify", value)
+        return False
+
+    def _handle_modbus_request(self, function: int, payload: bytes) -> bytes:
+        """Handle a Modbus request PDU, returning the response PDU."""
+        address, value = struct.unpack(">HH", payload[:4])
+
+        if function == modbus.READ_INPUT_REGISTERS:
+            registers = self.read_input_registers(address, value)
+            if registers is not None and value <= modbus.MAX_READ_REGISTERS:
+                return bytes([function, value * 2]) + struct.pack(
+                    f">{value}H", *registers
+                )
+        elif function == modbus.WRITE_SINGLE_REGISTER:
+            if self.write_register(address, value):
+                return bytes([function]) + payload[:4]
+        else:
+            return bytes([function | 0x80, 1])
+
+        return bytes([function | 0x80, 2])
+
+    async def _handle_modbus_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        header = struct.Struct(">HHHB")
+        try:
+            while True:
+                transaction_id, protocol_id, length, unit_id = header.unpack(
+                    await reader.readexactly(header.size)
+                )
+                pdu = await reader.readexactly(length - 1)
+                response = self._handle_modbus_request(pdu[0], pdu[1:])
+                writer.write(
+                    header.pack(transaction_id, protocol_id, len(response) + 1, unit_id)
+                    + response
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        parameter = request.query.get("parameter")
+        parameters = set(parameter.split(",")) if parameter else None
+        return web.json_response(self.render_info(parameters))
+
+    async def _handle_nodes(self, request: web.Request) -> web.Response:
+        self.node_poll_times.append(time.monotonic())
+        parameter = request.query.get("parameter")
+        parameters = set(parameter.split(",")) if parameter else None
+        return web.json_response(self.render_nodes(parameters))
+
+    async def _handle_actions(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.render_actions())
+
+    async def _handle_action(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        success = self.apply_action(
+            int(request.match_info["node_id"]),
+            payload.get("Action"),
+            payload.get("Val"),
+        )
+        return web.json_response({"Result": "SUCCESS" if success else "FAILED"})
@@ -0,0 +1,334 @@
+"""
+Scale and soak test harness for the DucoBox integration.
+
+Sets up many DucoBox config entries in a headless Home Assistant instance, each
+against its own simulated board with hundreds of nodes, and reports event loop
+blocking, memory growth, entity write rate and poll lag over the run.
+
+Usage:
+    python3 -m tools.soak --boxes 4 --nodes 200 --duration 60 --interval 5
+    python3 -m tools.soak --transport modbus
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from homeassistant import bootstrap, loader
+from homeassistant.components import network
+from homeassistant.config_entries import SOURCE_USER, ConfigEntries
+from homeassistant.const import CONF_HOST, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+
+import custom_components.ducobox as integration
+from custom_components.ducobox.api import DucoConnectivityBoardApi
+from custom_components.ducobox.const import DOMAIN, TRANSPORT_HTTP
+from custom_components.ducobox.modbus import DucoBoxModbusTransport
+from custom_components.ducobox.watchdog import DucoBoxBlockingWatchdog
+
+from .simulator import SimulatedBoard
+
+BASELINE_PATH = Path(__file__).resolve().parent / "soak_baseline.json"
+
+# The Modbus TCP transport is not offered by the integration, so the harness
+# sets up the config entries over HTTP and then polls them over Modbus TCP.
+TRANSPORT_MODBUS = "modbus"
+
+_LOOP_PROBE_INTERVAL = 0.01
+
+# Metrics compared against the baseline; higher is worse for all of them. The
+# tails of the latency distributions vary too much between runs to compare.
+_COMPARED_METRICS = [
+    ("setup_seconds",),
+    ("loop_blocking_ms", "p50"),
+    ("loop_blocking_ms", "p95"),
+    ("memory_growth_bytes",),
+    ("poll_lag_ms", "p50"),
+]
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Return the nearest-rank p50, p95, p99 and max of the samples."""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    ordered = sorted(samples)
+
+    def rank(percentile: float) -> float:
+        index = max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)
+        return round(ordered[index], 3)
+
+    return {
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": round(ordered[-1], 3),
+    }
+
+
+async def _async_probe_loop(samples: list[tuple[float, float]]) -> None:
+    """Record how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(_LOOP_PROBE_INTERVAL)
+        samples.append((start, loop.time() - start - _LOOP_PROBE_INTERVAL))
+
+
+@contextmanager
+def _modbus_api(modbus_ports: dict[str, int]) -> Iterator[None]:
+    """Create the API of the config entries set up meanwhile over Modbus TCP."""
+    original = integration.async_create_api
+
+    @callback
+    def _async_create_api(
+        _hass: HomeAssistant,
+        data: Mapping[str, Any],
+        *,
+        watchdog: DucoBoxBlockingWatchdog | None = None,
+        **_kwargs: Any,
+    ) -> DucoConnectivityBoardApi:
+        host = data[CONF_HOST]
+        transport = DucoBoxModbusTransport(
+            host.split(":")[0], modbus_ports[host], watchdog=watchdog
+        )
+        return DucoConnectivityBoardApi(transport)
+
+    integration.async_create_api = _async_create_api
+    try:
+        yield
+    finally:
+        integration.async_create_api = original
+
+
+async def async_start_hass(config_dir: Path) -> HomeAssistant:
+    """
+    Start a bare, headless Home Assistant.
+
+    Only the core, the registries and the network adapters (needed by the
+    shared client session) are set up, so the measurements are not skewed by
+    other integrations. The integration is picked up from the custom_components
+    package of this repository.
+    """
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await loader.async_get_custom_components(hass)
+    await bootstrap.async_load_base_functionality(hass)
+    await async_setup_component(hass, "homeassistant", {})
+    await network.async_get_network(hass)
+    await hass.async_start()
+    return hass
+
+
+async def async_run(  # noqa: PLR0913
+    boxes: int,
+    nodes: int,
+    duration: float,
+    interval: float,
+    seed: int,
+    *,
+    transport: str = TRANSPORT_HTTP,
+) -> dict[str, Any]:
+    """Run the soak test and return the report."""
+    boards = [
+        SimulatedBoard(f"SIM{index:08d}", nodes, seed=seed + index)
+        for index in range(boxes)
+    ]
+    hosts = [await board.async_start() for board in boards]
+    modbus_ports = [await board.async_start_modbus() for board in boards]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hass = await async_start_hass(Path(tmp_dir))
+
+        tracemalloc.start()
+        setup_start = time.perf_counter()
+        with (
+            _modbus_api(dict(zip(hosts, modbus_ports, strict=True)))
+            if transport == TRANSPORT_MODBUS
+            else nullcontext()
+        ):
+            for host in hosts:
+                result = await hass.config_entries.flow.async_init(
+                    DOMAIN, context={"source": SOURCE_USER}
+                )
+                result = await hass.config_entries.flow.async_configure(
+                    result["flow_id"], {"next_step_id": "manual"}
+                )
+                await hass.config_entries.flow.async_configure(
+                    result["flow_id"], {CONF_HOST: host}
+                )
+            await hass.async_block_till_done()
+        setup_seconds = time.perf_counter() - setup_start
+
+        entries = hass.config_entries.async_entries(DOMAIN)
+        for entry in entries:
+            coordinator = entry.runtime_data.coordinator
+            coordinator.update_interval = timedelta(seconds=interval)
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        entity_count = len(hass.states.async_entity_ids())
+        state_writes = 0
+
+        @callback
+        def _async_count_write(_event: Event) -> None:
+            nonlocal state_writes
+            state_writes += 1
+
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_count_write)
+
+        for board in boards:
+            board.node_poll_times.clear()
+        memory_start, _ = tracemalloc.get_traced_memory()
+        loop_samples: list[tuple[float, float]] = []
+        probe = hass.async_create_background_task(
+            _async_probe_loop(loop_samples), "ducobox soak loop probe"
+        )
+
+        await asyncio.sleep(duration)
+
+        probe.cancel()
+        unsub()
+        memory_end, memory_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop()
+
+    for board in boards:
+        await board.async_stop()
+
+    # Sum the lag per poll cycle rather than taking the maximum, so the result
+    # does not depend on whether the polls of the boxes happen to coincide.
+    start = loop_samples[0][0] if loop_samples else 0.0
+    cycle_blocked: dict[int, float] = {}
+    for sample_start, lag in loop_samples:
+        cycle = int((sample_start - start) // interval)
+        cycle_blocked[cycle] = cycle_blocked.get(cycle, 0.0) + lag
+
+    poll_lags = [
+        max(later - earlier - interval, 0.0) * 1000
+        for board in boards
+        for earlier, later in zip(
+            board.node_poll_times, board.node_poll_times[1:], strict=False
+        )
+    ]
+
+    return {
+        "config": {
+            "boxes": boxes,
+            "nodes": nodes,
+            "duration": duration,
+            "interval": interval,
+            "seed": seed,
+            "transport": transport,
+        },
+        "entities": entity_count,
+        "setup_seconds": round(setup_seconds, 3),
+        "polls": sum(len(board.node_poll_times) for board in boards),
+        "loop_blocking_ms": percentiles([lag * 1000 for lag in cycle_blocked.values()]),
+        "memory_start_bytes": memory_start,
+        "memory_growth_bytes": memory_end - memory_start,
+        "memory_peak_bytes": memory_peak,
+        "entity_writes_per_second": round(state_writes / duration, 3),
+        "poll_lag_ms": percentiles(poll_lags),
+    }
+
+
+def _metric(report: dict[str, Any], path: tuple[str, ...]) -> float:
+    value: Any = report
+    for key in path:
+        value = value[key]
+    return float(value)
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return the metrics that regressed beyond the tolerance."""
+    if report["config"] != baseline["config"]:
+        return ["configuration differs from the baseline, results not comparable"]
+
+    regressions = []
+    for path in _COMPARED_METRICS:
+        current = _metric(report, path)
+        reference = _metric(baseline, path)
+        if current > max(reference, 1.0) * tolerance:
+            name = ".".join(path)
+            regressions.append(f"{name}: {current} (baseline {reference})")
+    return regressions
+
+
+def main() -> int:
+    """Run the soak test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boxes", type=int, default=4)
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--interval", type=float, default=5, help="poll seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--transport",
+        choices=[TRANSPORT_HTTP, TRANSPORT_MODBUS],
+        default=TRANSPORT_HTTP,
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="baseline report to compare against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=2.0,
+        help="allowed ratio to the baseline before a metric counts as regressed",
+    )
+    parser.add_argument(
+        "--write-baseline", action="store_true", help="store the report as baseline"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        async_run(
+            args.boxes,
+            args.nodes,
+            args.duration,
+            args.interval,
+            args.seed,
+            transport=args.transport,
+        )
+    )
+    print(json.dumps(report, indent=2))
+
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Startup benchmark for the DucoBox integration.
+
+Measures the import cost of the integration and of every platform module in a
+fresh interpreter, and the time to set up a config entry against a simulated
+board in a headless Home Assistant instance, and compares them against a
+committed baseline.
+
+Usage:
+    python3 -m tools.startup --nodes 50 --repeats 5
+    python3 -m tools.startup --write-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import CONF_HOST
+
+from custom_components.ducobox.const import DOMAIN, PLATFORMS
+
+from .simulator import SimulatedBoard
+from .soak import async_start_hass
+
+BASELINE_PATH = Path(__file__).resolve().parent / "startup_baseline.json"
+
+INTEGRATION_MODULE = f"custom_components.{DOMAIN}"
+PLATFORM_MODULES = [f"{INTEGRATION_MODULE}.{platform}" for platform in PLATFORMS]
+
+# Metrics compared against the baseline; higher is worse for all of them.
+_COMPARED_METRICS = [
+    ("import_ms", INTEGRATION_MODULE),
+    *(("import_ms", module) for module in PLATFORM_MODULES),
+    ("setup_ms",),
+]
+
+# Metrics below this are within the noise of a run, so they never regress.
+_NOISE_MS = 5.0
+
+
+def measure_import_seconds(modules: list[str]) -> dict[str, float]:
+    """
+    Measure the import time of modules, in order, in a fresh interpreter.
+
+    Every module is imported after the ones before it, so its time only
+    includes what it imports in addition to them, like a platform imported by
+    Home Assistant after the integration.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        check=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    seconds: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.strip() in modules:
+            seconds[name.strip()] = int(cumulative) / 1_000_000
+    if missing := set(modules) - seconds.keys():
+        msg = f"No import time reported for {', '.join(sorted(missing))}"
+        raise RuntimeError(msg)
+    return seconds
+
+
+async def async_measure_setup(nodes: int) -> dict[str, Any]:
+    """Set up a config entry against a simulated board and measure the time."""
+    board = SimulatedBoard("SIM00000000", nodes)
+    host = await board.async_start()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hass = await async_start_hass(Path(tmp_dir))
+        entry = ConfigEntry(
+            data={CONF_HOST: host},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source=SOURCE_USER,
+            subentries_data=None,
+            title=board.serial_number,
+            unique_id=board.serial_number,
+            version=1,
+        )
+
+        setup_start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        setup_seconds = time.perf_counter() - setup_start
+
+        result = {
+            "setup_seconds": setup_seconds,
+            "entities": len(hass.states.async_entity_ids()),
+            "platforms": [
+                str(platform) for platform in entry.runtime_data.entity_index.platforms
+            ],
+        }
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop()
+
+    await board.async_stop()
+    return result
+
+
+async def _async_measure_setups(nodes: int, count: int) -> list[dict[str, Any]]:
+    """Measure a number of setups in turn, within one event loop."""
+    return [await async_measure_setup(nodes) for _ in range(count)]
+
+
+def run(nodes: int, repeats: int) -> dict[str, Any]:
+    """Run the benchmark and return the report, with the median of the repeats."""
+    modules = [INTEGRATION_MODULE, *PLATFORM_MODULES]
+    imports = [measure_import_seconds(modules) for _ in range(repeats)]
+    # Every setup imports the integration once, so only the first one pays the
+    # import cost, which is measured separately above.
+    setups = asyncio.run(_async_measure_setups(nodes, repeats + 1))
+
+    return {
+        "config": {"nodes": nodes, "repeats": repeats},
+        "entities": setups[-1]["entities"],
+        "platforms": setups[-1]["platforms"],
+        "import_ms": {
+            module: round(statistics.median(run[module] for run in imports) * 1000, 3)
+            for module in modules
+        },
+        "setup_ms": round(
+            statistics.median(setup["setup_seconds"] for setup in setups[1:]) * 1000,
+            3,
+        ),
+    }
+
+
+def _metric(report: dict[str, Any], path: tuple[str, ...]) -> float:
+    value: Any = report
+    for key in path:
+        value = value[key]
+    return float(value)
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return the metrics that regressed beyond the tolerance."""
+    if report["config"] != baseline["config"]:
+        return ["configuration differs from the baseline, results not comparable"]
+
+    regressions = []
+    for path in _COMPARED_METRICS:
+        current = _metric(report, path)
+        reference = _metric(baseline, path)
+        if current > max(reference, _NOISE_MS) * tolerance:
+            name = ".".join(path)
+            regressions.append(f"{name}: {current} (baseline {reference})")
+    return regressions
+
+
+def main() -> int:
+    """Run the startup benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="baseline report to compare against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=2.0,
+        help="allowed ratio to the baseline before a metric counts as regressed",
+    )
+    parser.add_argument(
+        "--write-baseline", action="store_true", help="store the report as baseline"
+    )
+    args = parser.parse_args()
+
+    report = run(args.nodes, args.repeats)
+    print(json.dumps(report, indent=2))
+
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())